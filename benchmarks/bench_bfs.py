@@ -0,0 +1,48 @@
+"""
+Maze Solver - BFS Benchmark
+
+A script comparing the BFS algorithm with the vectorized NumPy BFS, on a randomly generated maze.
+
+Usage: python benchmarks/bench_bfs.py [--bounds X Y Z] [--density D] [--seed S] [--repeat N]
+
+Author: shravan@usc.edu (5451873903)
+
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from bench_queues import generate_open_maze  # noqa: E402
+from bfs import bfs  # noqa: E402
+from numpy_bfs import np, numpy_bfs  # noqa: E402
+from vector import Vector  # noqa: E402
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark of the BFS and vectorized NumPy BFS algorithms.')
+    parser.add_argument("--bounds", nargs=3, type=int, default=[200, 200, 50], help="Bounds of the generated maze.")
+    parser.add_argument("--density", type=float, default=0.7, help="Probability of a cell holding a node.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the random number generator.")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of times to run each search.")
+    args = parser.parse_args()
+
+    if np is None:
+        sys.exit("NumPy is not installed, so there is nothing to compare the BFS algorithm with.")
+
+    graph, nodes = generate_open_maze(Vector(*args.bounds), args.density, args.seed)
+    start, end = nodes[0], nodes[-1]
+    print("Bounds: {}, Nodes: {}, Start: {}, End: {}".format(graph.bounds, len(nodes), start, end))
+
+    for name, search in (("BFS", bfs), ("BFS-NUMPY", numpy_bfs)):
+        times = []
+        for _ in range(args.repeat):
+            start_time = time.perf_counter()
+            success, path, cost = search(graph, start, end)
+            times.append(time.perf_counter() - start_time)
+
+        print("{:<9} cost: {:<8} best: {:.3f}s  mean: {:.3f}s".format(
+            name, str(cost), min(times), sum(times) / len(times)))
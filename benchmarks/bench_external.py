@@ -0,0 +1,79 @@
+"""
+Maze Solver - External Memory Search Benchmark
+
+A script comparing the UCS and BFS algorithms with their external memory versions, on a randomly generated maze which
+is compiled and loaded through mmap. It reports the time taken by each search, the peak memory it allocated and how
+much of the frontier the external memory versions spilled to disk.
+
+Usage: python benchmarks/bench_external.py [--bounds X Y Z] [--density D] [--seed S] [--memory-budget MiB]
+
+Author: shravan@usc.edu (5451873903)
+
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from bench_queues import generate_open_maze  # noqa: E402
+from bfs import bfs  # noqa: E402
+from compiled_maze import load_compiled_maze, write_compiled_maze  # noqa: E402
+from external_search import external_bfs, external_ucs  # noqa: E402
+from instrumentation import collect  # noqa: E402
+from ucs import ucs  # noqa: E402
+from vector import Vector  # noqa: E402
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark of the external memory BFS and UCS algorithms.')
+    parser.add_argument("--bounds", nargs=3, type=int, default=[100, 100, 20], help="Bounds of the generated maze.")
+    parser.add_argument("--density", type=float, default=0.8, help="Probability of a cell holding a node.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the random number generator.")
+    parser.add_argument("--memory-budget", type=float, default=0.05,
+                        help="MiB of frontier the external memory algorithms hold in memory.")
+    args = parser.parse_args()
+
+    graph, nodes = generate_open_maze(Vector(*args.bounds), args.density, args.seed)
+    start, end = nodes[0], nodes[-1]
+    print("Bounds: {}, Nodes: {}, Start: {}, End: {}".format(graph.bounds, len(nodes), start, end))
+
+    descriptor, file_path = tempfile.mkstemp(suffix=".bin")
+    os.close(descriptor)
+    try:
+        write_compiled_maze(file_path, "UCS", start, end, graph)
+        del graph, nodes
+
+        memory_budget = int(args.memory_budget * (1 << 20))
+        searches = (
+            ("BFS", bfs, {}),
+            ("BFS-EXTERNAL", external_bfs, {"memory_budget": memory_budget}),
+            ("UCS", ucs, {}),
+            ("UCS-EXTERNAL", external_ucs, {"memory_budget": memory_budget})
+        )
+        for name, search, options in searches:
+            # Each search gets a graph of its own, so that it allocates its own search state, and is timed without
+            # tracing its allocations as tracing slows it down.
+            _, _, _, graph = load_compiled_maze(file_path)
+            with collect() as stats:
+                start_time = time.perf_counter()
+                success, path, cost = search(graph, start, end, **options)
+                seconds = time.perf_counter() - start_time
+
+            _, _, _, graph = load_compiled_maze(file_path)
+            tracemalloc.start()
+            search(graph, start, end, **options)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            counters = stats.searches[-1]
+            print("{:<13} cost: {:<6} time: {:7.3f}s  peak memory: {:7.2f} MiB  spilled: {} entries in {} files".format(
+                name, str(cost), seconds, peak / float(1 << 20), counters.get("spilled_entries", 0),
+                counters.get("spilled_runs", 0)))
+    finally:
+        del graph
+        os.remove(file_path)
@@ -0,0 +1,66 @@
+"""
+Maze Solver - Multi Goal Benchmark
+
+A script comparing a separate UCS and A* search to each of a set of goals with the nearest goal and all goals searches,
+which search for the whole set in a single pass, on a randomly generated open maze. It reports the nodes expanded and
+time taken by each, and checks that the costs match.
+
+Usage: python benchmarks/bench_goals.py [--bounds X Y Z] [--density D] [--goals K] [--seed S]
+
+Author: shravan@usc.edu (5451873903)
+
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from a_star import a_star  # noqa: E402
+from bench_queues import generate_open_maze  # noqa: E402
+from instrumentation import collect  # noqa: E402
+from multi_goal import all_goals_search, nearest_goal_search  # noqa: E402
+from ucs import ucs  # noqa: E402
+from vector import Vector  # noqa: E402
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark of single pass searches for a set of goals.')
+    parser.add_argument("--bounds", nargs=3, type=int, default=[100, 100, 8], help="Bounds of the generated maze.")
+    parser.add_argument("--density", type=float, default=0.8, help="Probability of a cell holding a node.")
+    parser.add_argument("--goals", type=int, default=8, help="Number of goals to search for.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the random number generator.")
+    args = parser.parse_args()
+
+    graph, nodes = generate_open_maze(Vector(*args.bounds), args.density, args.seed)
+    goals = random.Random(args.seed).sample(nodes[1:], args.goals)
+    start = nodes[0]
+    print("Bounds: {}, Nodes: {}, Start: {}, Goals: {}".format(graph.bounds, len(nodes), start, len(goals)))
+
+    for name, search, heuristic in (("UCS", ucs, False), ("A*", a_star, True)):
+        with collect() as stats:
+            start_time = time.perf_counter()
+            costs = [search(graph, start, goal)[2] for goal in goals]
+            seconds = time.perf_counter() - start_time
+        expanded = sum(counters["expanded"] for counters in stats.searches)
+        print("{:<4} {:<8} cost: {:<6} expanded: {:<8} time: {:.3f}s".format(
+            name, "separate", str(min(cost for cost in costs if cost is not None)), expanded, seconds))
+
+        with collect() as stats:
+            start_time = time.perf_counter()
+            success, path, cost = nearest_goal_search(graph, start, goals, heuristic)
+            seconds = time.perf_counter() - start_time
+        print("{:<4} {:<8} cost: {:<6} expanded: {:<8} time: {:.3f}s".format(
+            name, "nearest", str(cost), stats.searches[-1]["expanded"], seconds) +
+            ("" if cost == min(cost for cost in costs if cost is not None) else "  MISMATCH"))
+
+        with collect() as stats:
+            start_time = time.perf_counter()
+            results = all_goals_search(graph, start, goals, heuristic)
+            seconds = time.perf_counter() - start_time
+        print("{:<4} {:<8} cost: {:<6} expanded: {:<8} time: {:.3f}s".format(
+            name, "all", str(max(result[2] for result in results if result[0])), stats.searches[-1]["expanded"],
+            seconds) + ("" if [result[2] for result in results] == costs else "  MISMATCH"))
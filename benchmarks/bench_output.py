@@ -0,0 +1,83 @@
+"""
+Maze Solver - Output Benchmark
+
+A script comparing the text output format of paths with the action format, on a long synthetic path made of runs of
+random actions. It reports the time taken to write each format and their sizes, and checks that decoding the action
+format gives back the text format.
+
+Usage: python benchmarks/bench_output.py [--length N] [--run-length N] [--seed S]
+
+Author: shravan@usc.edu (5451873903)
+
+"""
+
+import argparse
+import filecmp
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from action_path import decode_action_path, write_action_path  # noqa: E402
+from graph import ACTION_OFFSETS, ACTIONS, Node, get_action_cost  # noqa: E402
+from utils import write_path  # noqa: E402
+from vector import Vector  # noqa: E402
+
+
+def generate_path(length, run_length, seed):
+    """
+    Method to generate a path of runs of random actions.
+
+    Args:
+        length(int): Number of points in the path.
+        run_length(int): Average number of times each action is repeated.
+        seed(int): Seed of the random number generator.
+
+    Returns:
+        (path): List of nodes, with the cost of reaching each node set.
+
+    """
+    rng = random.Random(seed)
+    x, y, z, cost = 0, 0, 0, 0
+    path = [Node(Vector(x, y, z), cost=cost)]
+    while len(path) < length:
+        action = rng.choice(ACTIONS)
+        dx, dy, dz = ACTION_OFFSETS[action]
+        for _ in range(min(rng.randint(1, 2 * run_length - 1), length - len(path))):
+            x, y, z, cost = x + dx, y + dy, z + dz, cost + get_action_cost(action)
+            path.append(Node(Vector(x, y, z), cost=cost))
+
+    return path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark of the text and action output formats of paths.')
+    parser.add_argument("--length", type=int, default=500000, help="Number of points in the path.")
+    parser.add_argument("--run-length", type=int, default=8, help="Average number of times each action is repeated.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the random number generator.")
+    args = parser.parse_args()
+
+    path = generate_path(args.length, args.run_length, args.seed)
+    directory = tempfile.mkdtemp()
+    text_path = os.path.join(directory, "path.txt")
+    action_path = os.path.join(directory, "path.rle")
+    decoded_path = os.path.join(directory, "decoded.txt")
+    try:
+        for name, writer, file_path in (("text", write_path, text_path), ("rle", write_action_path, action_path)):
+            start_time = time.perf_counter()
+            writer(file_path, True, path, path[-1].cost)
+            print("{:<6} write: {:.3f}s  size: {:.2f} MiB".format(
+                name, time.perf_counter() - start_time, os.path.getsize(file_path) / float(1 << 20)))
+
+        start_time = time.perf_counter()
+        decode_action_path(action_path, decoded_path)
+        print("decode to text: {:.3f}s, identical: {}".format(time.perf_counter() - start_time,
+                                                               filecmp.cmp(text_path, decoded_path, shallow=False)))
+    finally:
+        for file_path in (text_path, action_path, decoded_path):
+            if os.path.exists(file_path):
+                os.remove(file_path)
+        os.rmdir(directory)
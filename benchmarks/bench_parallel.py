@@ -0,0 +1,78 @@
+"""
+Maze Solver - Parallel Search Benchmark
+
+A script comparing the UCS and BFS algorithms with their parallel versions for an increasing number of worker
+processes, on a randomly generated open maze. It reports the time taken by each search and its speedup over the single
+process search, and checks that the costs match. The parallel searches are also run as queries of a batch answered by
+a pool of worker processes, which answer each of them in a single process.
+
+Usage: python benchmarks/bench_parallel.py [--bounds X Y Z] [--density D] [--seed S] [--workers N [N ...]]
+
+Author: shravan@usc.edu (5451873903)
+
+"""
+
+import argparse
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from batch import run_batch  # noqa: E402
+from bench_queues import generate_open_maze  # noqa: E402
+from bfs import bfs  # noqa: E402
+from instrumentation import collect  # noqa: E402
+from parallel_search import parallel_bfs, parallel_ucs  # noqa: E402
+from ucs import ucs  # noqa: E402
+from vector import Vector  # noqa: E402
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark of the parallel BFS and UCS algorithms.')
+    parser.add_argument("--bounds", nargs=3, type=int, default=[100, 100, 32], help="Bounds of the generated maze.")
+    parser.add_argument("--density", type=float, default=0.8, help="Probability of a cell holding a node.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the random number generator.")
+    parser.add_argument("--workers", nargs='+', type=int, default=[2, 4, 8, 16, 32],
+                        help="Numbers of worker processes to run the parallel searches with.")
+    parser.add_argument("--batch-workers", type=int, default=2,
+                        help="Number of worker processes of the batch running the parallel searches as queries.")
+    args = parser.parse_args()
+
+    graph, nodes = generate_open_maze(Vector(*args.bounds), args.density, args.seed)
+    start, end = nodes[0], nodes[-1]
+    print("Bounds: {}, Nodes: {}, Start: {}, End: {}, CPUs: {}".format(graph.bounds, len(nodes), start, end,
+                                                                      os.cpu_count()))
+
+    costs = {}
+    for name, search, parallel_search in (("BFS", bfs, parallel_bfs), ("UCS", ucs, parallel_ucs)):
+        start_time = time.perf_counter()
+        success, path, cost = search(graph, start, end)
+        costs[name + "-PARALLEL"] = cost
+        baseline = time.perf_counter() - start_time
+        print("{:<13} workers: {:<3} cost: {:<6} time: {:7.3f}s".format(name, 1, str(cost), baseline))
+
+        for workers in args.workers:
+            with collect() as stats:
+                start_time = time.perf_counter()
+                success, path, parallel_cost = parallel_search(graph, start, end, workers)
+                seconds = time.perf_counter() - start_time
+
+            counters = stats.searches[-1]
+            line = "{:<13} workers: {:<3} cost: {:<6} time: {:7.3f}s  speedup: {:5.2f}  rounds: {}  messages: {}"
+            print(line.format(name + "-PARALLEL", counters.get("workers", 1), str(parallel_cost), seconds,
+                              baseline / seconds, counters.get("rounds", 0), counters.get("messages", 0)) +
+                  ("" if parallel_cost == cost else "  MISMATCH"))
+
+    # Workers of a batch's pool answer parallel queries in a single process, as the pool already runs one per CPU.
+    output = io.StringIO()
+    start_time = time.perf_counter()
+    run_batch(graph, [(name, start, end) for name in sorted(costs)], output, args.batch_workers)
+    seconds = time.perf_counter() - start_time
+    for line in output.getvalue().splitlines():
+        values = line.split()
+        name, batch_cost = values[0], None if values[7] == "FAIL" else int(values[7])
+        print("{:<13} batch workers: {:<3} cost: {:<6} time: {:7.3f}s".format(name, args.batch_workers,
+                                                                          str(batch_cost), seconds) +
+              ("" if batch_cost == costs[name] else "  MISMATCH"))
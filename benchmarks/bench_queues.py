@@ -0,0 +1,73 @@
+"""
+Maze Solver - Priority Queue Benchmark
+
+A script comparing the heap and bucket priority queues on the UCS and A* algorithms, on a randomly generated maze.
+
+Usage: python benchmarks/bench_queues.py [--bounds X Y Z] [--density D] [--seed S] [--repeat N]
+
+Author: shravan@usc.edu (5451873903)
+
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from a_star import a_star  # noqa: E402
+from graph import ACTIONS  # noqa: E402
+from grid_graph import GridGraph  # noqa: E402
+from priority_queue import PRIORITY_QUEUES  # noqa: E402
+from ucs import ucs  # noqa: E402
+from vector import Vector  # noqa: E402
+
+
+def generate_open_maze(bounds, density, seed):
+    """
+    Method to generate a maze where each cell holds a node with the given probability and every node can move to all of
+    its neighbours.
+
+    Args:
+        bounds(Vector): Bounds of the maze.
+        density(float): Probability of a cell holding a node.
+        seed(int): Seed of the random number generator.
+
+    Returns:
+        (graph, nodes): Graph of the maze and the positions of its nodes.
+
+    """
+    rng = random.Random(seed)
+    graph = GridGraph(bounds)
+    nodes = [Vector(x, y, z) for z in range(bounds.z) for y in range(bounds.y) for x in range(bounds.x)
+             if rng.random() < density]
+    for node in nodes:
+        graph.add_node(node, ACTIONS)
+
+    return graph, nodes
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark of the priority queues used by the UCS and A* algorithms.')
+    parser.add_argument("--bounds", nargs=3, type=int, default=[100, 100, 10], help="Bounds of the generated maze.")
+    parser.add_argument("--density", type=float, default=0.8, help="Probability of a cell holding a node.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the random number generator.")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of times to run each search.")
+    args = parser.parse_args()
+
+    graph, nodes = generate_open_maze(Vector(*args.bounds), args.density, args.seed)
+    start, end = nodes[0], nodes[-1]
+    print("Bounds: {}, Nodes: {}, Start: {}, End: {}".format(graph.bounds, len(nodes), start, end))
+
+    for name, search in (("UCS", ucs), ("A*", a_star)):
+        for queue_name, queue_type in sorted(PRIORITY_QUEUES.items()):
+            times = []
+            for _ in range(args.repeat):
+                start_time = time.perf_counter()
+                success, path, cost = search(graph, start, end, queue_type=queue_type)
+                times.append(time.perf_counter() - start_time)
+
+            print("{:<4} {:<7} cost: {:<8} best: {:.3f}s  mean: {:.3f}s".format(
+                name, queue_name, str(cost), min(times), sum(times) / len(times)))
@@ -0,0 +1,62 @@
+"""
+Maze Solver - Graph Reduction Benchmark
+
+A script comparing the UCS and A* algorithms on a maze of corridors with the same algorithms on its reduced graph,
+where dead ends are pruned and corridors are contracted. It reports the time taken to reduce the maze, and the nodes
+expanded and time taken by each search, and checks that the costs match.
+
+Usage: python benchmarks/bench_reduction.py [--bounds X Y Z] [--density D] [--seed S]
+
+Author: shravan@usc.edu (5451873903)
+
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from a_star import a_star  # noqa: E402
+from grid_graph import GridGraph  # noqa: E402
+from instrumentation import collect  # noqa: E402
+from maze_generator import generate_corridors  # noqa: E402
+from reduced_graph import reduce_graph  # noqa: E402
+from ucs import ucs  # noqa: E402
+from vector import Vector  # noqa: E402
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark of searches on reduced graphs of mazes of corridors.')
+    parser.add_argument("--bounds", nargs=3, type=int, default=[201, 201, 5], help="Bounds of the generated maze.")
+    parser.add_argument("--density", type=float, default=0.05,
+                        help="Probability of an extra opening between two neighbouring corridors.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the random number generator.")
+    args = parser.parse_args()
+
+    nodes = generate_corridors(random.Random(args.seed), args.bounds, args.density)
+    graph = GridGraph(Vector(*args.bounds))
+    for position, actions in nodes.items():
+        graph.add_node(Vector(*position), actions)
+
+    positions = sorted(nodes, key=lambda position: (position[2], position[1], position[0]))
+    start, end = Vector(*positions[0]), Vector(*positions[-1])
+    print("Bounds: {}, Nodes: {}, Start: {}, End: {}".format(graph.bounds, len(nodes), start, end))
+
+    start_time = time.perf_counter()
+    reduced_graph = reduce_graph(graph, (start, end))
+    print("Reduced: {}  time: {:.3f}s".format(reduced_graph, time.perf_counter() - start_time))
+
+    for name, search in (("UCS", ucs), ("A*", a_star)):
+        for label, search_graph in (("full", graph), ("reduced", reduced_graph)):
+            with collect() as stats:
+                start_time = time.perf_counter()
+                success, path, cost = search(search_graph, start, end)
+                if search_graph is reduced_graph:
+                    path = reduced_graph.expand_path(path)
+                seconds = time.perf_counter() - start_time
+
+            print("{:<4} {:<8} cost: {:<6} path: {:<6} expanded: {:<7} time: {:.3f}s".format(
+                name, label, str(cost), len(path), stats.searches[-1]["expanded"], seconds))
@@ -0,0 +1,76 @@
+"""
+Maze Solver - Replanning Benchmark
+
+A script comparing replanning with LPA* against a fresh A* search after each edit of a randomly generated maze. Each
+round removes a few nodes from the current path, so that the path has to be repaired. The nodes expanded by each search
+are reported along with the time it took.
+
+Usage: python benchmarks/bench_replanning.py [--bounds X Y Z] [--density D] [--seed S] [--rounds N] [--edits E]
+
+Author: shravan@usc.edu (5451873903)
+
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from a_star import a_star  # noqa: E402
+from bench_queues import generate_open_maze  # noqa: E402
+from instrumentation import collect  # noqa: E402
+from lpa_star import LPAStar  # noqa: E402
+from vector import Vector  # noqa: E402
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark of replanning with LPA* against searching with A*.')
+    parser.add_argument("--bounds", nargs=3, type=int, default=[100, 100, 10], help="Bounds of the generated maze.")
+    parser.add_argument("--density", type=float, default=0.8, help="Probability of a cell holding a node.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the random number generator.")
+    parser.add_argument("--rounds", type=int, default=10, help="Number of rounds of edits.")
+    parser.add_argument("--edits", type=int, default=3, help="Number of nodes removed from the path in each round.")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    graph, nodes = generate_open_maze(Vector(*args.bounds), args.density, args.seed)
+    start, end = nodes[0], nodes[-1]
+    print("Bounds: {}, Nodes: {}, Start: {}, End: {}".format(graph.bounds, len(nodes), start, end))
+
+    planner = LPAStar(graph, start, end)
+    with collect() as stats:
+        start_time = time.perf_counter()
+        success, path, cost = planner.plan()
+        seconds = time.perf_counter() - start_time
+    print("Initial  cost: {:<8} LPA*: {:.3f}s ({} expanded)".format(str(cost), seconds, stats.searches[-1]["expanded"]))
+
+    lpa_times, a_star_times = [], []
+    for round_number in range(args.rounds):
+        if not success or len(path) <= 2:
+            break
+
+        edited = [node.position for node in rng.sample(path[1:-1], min(args.edits, len(path) - 2))]
+        for position in edited:
+            graph.remove_node(position)
+
+        with collect() as stats:
+            start_time = time.perf_counter()
+            planner.update(edited)
+            success, path, cost = planner.plan()
+            lpa_times.append(time.perf_counter() - start_time)
+
+            start_time = time.perf_counter()
+            _, _, a_star_cost = a_star(graph, start, end)
+            a_star_times.append(time.perf_counter() - start_time)
+
+        lpa_counters, a_star_counters = stats.searches
+        print("Round {:<3} cost: {:<8} LPA*: {:.3f}s ({} expanded)  A*: {:.3f}s ({} expanded){}".format(
+            round_number + 1, str(cost), lpa_times[-1], lpa_counters["expanded"], a_star_times[-1],
+            a_star_counters["expanded"], "" if cost == a_star_cost else "  (A* cost: {})".format(a_star_cost)))
+
+    if len(lpa_times) != 0:
+        print("Mean     LPA*: {:.3f}s  A*: {:.3f}s".format(sum(lpa_times) / len(lpa_times),
+                                                           sum(a_star_times) / len(a_star_times)))
@@ -0,0 +1,157 @@
+"""
+Maze Solver - Server Benchmark
+
+A script comparing the latency of answering queries by starting a process per query with answering them through a
+server that keeps the maze loaded. The server is started on a temporary Unix socket, and the queries are sent to it one
+at a time, waiting for each result, and then all at once, pipelined on a single connection.
+
+Usage: python benchmarks/bench_server.py maze queries [--count N] [--workers N]
+
+Author: shravan@usc.edu (5451873903)
+
+"""
+
+import argparse
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+
+# Path of the main program of the maze solver.
+MAIN = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", "main.py")
+
+
+def read_requests(file_path, count):
+    """
+    Method to read the queries to send to the server.
+
+    Args:
+        file_path(str): Path of a file with one 'algorithm sx sy sz ex ey ez' query per line.
+        count(int): Number of queries to read. The queries are repeated if the file holds fewer.
+
+    Returns:
+        (requests): List of query lines.
+
+    """
+    with open(file_path, 'r') as f:
+        lines = [line.strip() for line in f if line.strip()]
+
+    return [lines[i % len(lines)] for i in range(count)]
+
+
+def time_processes(maze_path, requests):
+    """
+    Method to answer each query in a new process.
+
+    Args:
+        maze_path(str): Path of the maze.
+        requests(list): Queries to answer.
+
+    Returns:
+        (times): Seconds taken by each query.
+
+    """
+    times = []
+    for request in requests:
+        start_time = time.perf_counter()
+        subprocess.run([sys.executable, MAIN, "batch", maze_path, "-", "-w", "1"], input=request + "\n", text=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        times.append(time.perf_counter() - start_time)
+
+    return times
+
+
+def time_server(socket_path, requests):
+    """
+    Method to send the queries to the server one at a time, waiting for each result.
+
+    Args:
+        socket_path(str): Path of the server's Unix socket.
+        requests(list): Queries to answer.
+
+    Returns:
+        (times): Seconds taken by each query.
+
+    """
+    times = []
+    with socket.socket(socket.AF_UNIX) as sock:
+        sock.connect(socket_path)
+        results = sock.makefile('r')
+        for request in requests:
+            start_time = time.perf_counter()
+            sock.sendall("maze {}\n".format(request).encode())
+            results.readline()
+            times.append(time.perf_counter() - start_time)
+
+    return times
+
+
+def time_pipelined(socket_path, requests):
+    """
+    Method to send all the queries to the server at once and read the results as they arrive.
+
+    Args:
+        socket_path(str): Path of the server's Unix socket.
+        requests(list): Queries to answer.
+
+    Returns:
+        (seconds): Seconds taken by all the queries.
+
+    """
+    with socket.socket(socket.AF_UNIX) as sock:
+        sock.connect(socket_path)
+        start_time = time.perf_counter()
+        sock.sendall("".join("maze {}\n".format(request) for request in requests).encode())
+        sock.shutdown(socket.SHUT_WR)
+        count = sum(1 for _ in sock.makefile('r'))
+        seconds = time.perf_counter() - start_time
+
+    assert count == len(requests), "Expected {} results, got {}".format(len(requests), count)
+    return seconds
+
+
+def print_times(name, times):
+    """
+    Method to print a summary of the seconds taken by each query.
+
+    Args:
+        name(str): Name of the way the queries were answered.
+        times(list): Seconds taken by each query.
+
+    """
+    times = sorted(times)
+    print("{:<10} median: {:.2f}ms  p90: {:.2f}ms  max: {:.2f}ms".format(
+        name, times[len(times) // 2] * 1000, times[int(len(times) * 0.9)] * 1000, times[-1] * 1000))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark of the latency of the solver server.')
+    parser.add_argument("maze", type=str, help="Input file of the maze, or a compiled maze.")
+    parser.add_argument("queries", type=str, help="File with one 'algorithm sx sy sz ex ey ez' query per line.")
+    parser.add_argument("--count", type=int, default=20, help="Number of queries to send. Defaults to 20.")
+    parser.add_argument("--workers", type=int, default=2, help="Number of worker processes of the server.")
+    args = parser.parse_args()
+
+    requests = read_requests(args.queries, args.count)
+    print_times("process", time_processes(args.maze, requests))
+
+    directory = tempfile.mkdtemp()
+    socket_path = os.path.join(directory, "server.sock")
+    server = subprocess.Popen([sys.executable, MAIN, "serve", "maze={}".format(args.maze), "--socket", socket_path,
+                               "-w", str(args.workers)], stdout=subprocess.PIPE, text=True)
+    try:
+        # The server prints a line once it is listening.
+        server.stdout.readline()
+        print_times("server", time_server(socket_path, requests))
+
+        seconds = time_pipelined(socket_path, requests * 10)
+        print("{:<10} {} queries in {:.3f}s, {:.2f}ms per query".format(
+            "pipelined", len(requests) * 10, seconds, seconds * 1000 / (len(requests) * 10)))
+    finally:
+        server.send_signal(signal.SIGINT)
+        server.wait()
+        os.rmdir(directory)
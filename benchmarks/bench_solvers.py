@@ -0,0 +1,215 @@
+"""
+Maze Solver - Solver Benchmark
+
+A script timing the phases of solving mazes: parsing the input file, building the graph, searching for the path and
+writing the output file. Each run is done in a fresh process so that its peak memory use is measured on its own. One
+JSON record is appended per run to a results file, along with the commit and machine it ran on, so runs can be
+compared over time.
+
+Usage: python benchmarks/bench_solvers.py maze [maze ...] [--algorithms NAME ...] [--repeat N] [--results file]
+                                          [--baseline file] [--trace-memory]
+
+Author: shravan@usc.edu (5451873903)
+
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from itertools import islice
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from algorithms import ALGORITHMS  # noqa: E402
+from grid_graph import GridGraph  # noqa: E402
+from utils import add_points, read_lines, write_path  # noqa: E402
+from vector import Vector  # noqa: E402
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+# Phases of solving a maze, in the order they run.
+PHASES = ("parse", "build", "search", "output")
+
+
+def run_solver(maze_path, algorithm, trace_memory):
+    """
+    Method to solve a maze, timing each phase.
+
+    Args:
+        maze_path(str): Path of the input file of the maze.
+        algorithm(str): Name of the algorithm to solve the maze with, or None for the maze's own algorithm.
+        trace_memory(bool): Whether to trace the peak memory allocated by each phase, which slows every phase down.
+
+    Returns:
+        (record): Map of the measurements of the run.
+
+    """
+    timings, traced = {}, {}
+    phase_start = [None]
+
+    def start_phase():
+        if trace_memory:
+            tracemalloc.start()
+        phase_start[0] = time.perf_counter()
+
+    def end_phase(phase):
+        timings[phase] = time.perf_counter() - phase_start[0]
+        if trace_memory:
+            traced[phase] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+    # The parse phase reads the header and splits the file into point lines, and the build phase writes the points
+    # into the graph.
+    start_phase()
+    with open(maze_path, 'rb') as f:
+        maze_algorithm = f.readline().decode().strip()
+        bounds = Vector.from_str(f.readline().decode().strip())
+        start = Vector.from_str(f.readline().decode().strip())
+        end = Vector.from_str(f.readline().decode().strip())
+        num_points = int(f.readline())
+        lines = list(islice(read_lines(f), num_points))
+    end_phase("parse")
+
+    start_phase()
+    graph = GridGraph(bounds)
+    add_points(graph, lines)
+    del lines
+    end_phase("build")
+
+    algorithm = maze_algorithm if algorithm is None else algorithm
+    start_phase()
+    success, path, cost = ALGORITHMS[algorithm](graph, start, end)
+    end_phase("search")
+
+    descriptor, output_path = tempfile.mkstemp(suffix=".txt")
+    os.close(descriptor)
+    try:
+        start_phase()
+        write_path(output_path, success, path, cost)
+        end_phase("output")
+    finally:
+        os.remove(output_path)
+
+    record = {
+        "maze": os.path.basename(maze_path),
+        "bounds": [bounds.x, bounds.y, bounds.z],
+        "nodes": len(graph),
+        "algorithm": algorithm,
+        "success": success,
+        "cost": cost,
+        "path_length": len(path),
+        "seconds": timings,
+        "peak_rss_bytes": get_peak_rss(),
+    }
+    if trace_memory:
+        record["peak_traced_bytes"] = traced
+
+    return record
+
+
+def get_peak_rss():
+    """
+    Method to get the peak resident memory of this process.
+
+    Returns:
+        (peak): Peak resident memory in bytes, or None if it cannot be measured on this platform.
+
+    """
+    if resource is None:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def get_commit():
+    """
+    Method to get the commit of the working tree the benchmark runs on.
+
+    Returns:
+        (commit): Hash of the commit, or None if it is not known.
+
+    """
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_baseline(file_path):
+    """
+    Method to load the best search time of each maze and algorithm from an earlier results file.
+
+    Args:
+        file_path(str): Path of the results file.
+
+    Returns:
+        (baseline): Map of (maze, algorithm) pairs to their best search time.
+
+    """
+    baseline = {}
+    with open(file_path, 'r') as f:
+        for line in f:
+            if not line.strip():
+                continue
+
+            record = json.loads(line)
+            key = (record["maze"], record["algorithm"])
+            baseline[key] = min(baseline.get(key, float('inf')), record["seconds"]["search"])
+
+    return baseline
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark of the phases of solving mazes.')
+    parser.add_argument("mazes", nargs='+', type=str, help="Input files of the mazes to solve.")
+    parser.add_argument("--algorithms", nargs='+', choices=sorted(ALGORITHMS), default=None,
+                        help="Algorithms to solve each maze with. Defaults to the algorithm in each maze's file.")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of times to solve each maze with each algorithm.")
+    parser.add_argument("--results", type=str, default="bench_results.jsonl",
+                        help="File to append one JSON record per run to. Defaults to bench_results.jsonl.")
+    parser.add_argument("--baseline", type=str, default=None,
+                        help="Earlier results file to compare the search times with.")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="Trace the peak memory allocated by each phase. This slows every phase down.")
+    args = parser.parse_args()
+
+    baseline = {} if args.baseline is None else load_baseline(args.baseline)
+    metadata = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "commit": get_commit(),
+        "python": platform.python_version(),
+        "machine": platform.platform(),
+    }
+
+    # Every run gets a fresh process, so that the peak memory of one run does not carry over to the next.
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(1, maxtasksperchild=1) as pool, open(args.results, 'a') as results:
+        for maze_path in args.mazes:
+            for algorithm in args.algorithms or [None]:
+                for repeat in range(args.repeat):
+                    record = pool.apply(run_solver, (maze_path, algorithm, args.trace_memory))
+                    record.update(metadata, repeat=repeat)
+                    results.write(json.dumps(record, sort_keys=True) + "\n")
+
+                    line = "{:<24} {:<10} cost: {:<8} {}  peak: {:.1f} MiB".format(
+                        record["maze"], record["algorithm"], str(record["cost"]),
+                        "  ".join("{}: {:.3f}s".format(phase, record["seconds"][phase]) for phase in PHASES),
+                        (record["peak_rss_bytes"] or 0) / float(1 << 20))
+
+                    previous = baseline.get((record["maze"], record["algorithm"]))
+                    if previous is not None:
+                        line += "  search vs baseline: {:.2f}x".format(record["seconds"]["search"] / previous)
+                    print(line)
@@ -0,0 +1,113 @@
+"""
+Maze Solver - Value Type Benchmark
+
+A script timing the basic operations on vectors and nodes, such as hashing them and finding their neighbours, and the
+time and memory allocated per expansion of a search over the reference node based graph, which is built out of them.
+
+Usage: python benchmarks/bench_types.py [--bounds X Y Z] [--density D] [--seed S] [--count N]
+
+Author: shravan@usc.edu (5451873903)
+
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from graph import ACTIONS, Graph, Node, get_neighbour  # noqa: E402
+from instrumentation import collect  # noqa: E402
+from ucs import ucs  # noqa: E402
+from vector import Vector  # noqa: E402
+
+
+def time_operation(name, operation, values):
+    """
+    Method to time an operation over a list of values, and print the time taken per value.
+
+    Args:
+        name(str): Name of the operation.
+        operation(function): Operation taking one value.
+        values(list): Values to run the operation on.
+
+    """
+    start_time = time.perf_counter()
+    for value in values:
+        operation(value)
+    seconds = time.perf_counter() - start_time
+    print("{:<24} {:8.1f} ns".format(name, seconds * 1e9 / len(values)))
+
+
+def generate_graph(bounds, density, seed):
+    """
+    Method to generate a reference node based graph where each cell holds a node with the given probability and every
+    node can move to all of its neighbours.
+
+    Args:
+        bounds(Vector): Bounds of the maze.
+        density(float): Probability of a cell holding a node.
+        seed(int): Seed of the random number generator.
+
+    Returns:
+        (graph, nodes): Graph of the maze and the positions of its nodes.
+
+    """
+    rng = random.Random(seed)
+    graph = Graph(bounds=bounds)
+    nodes = [Vector(x, y, z) for z in range(bounds.z) for y in range(bounds.y) for x in range(bounds.x)
+             if rng.random() < density]
+    for position in nodes:
+        graph.add_node(Node(position, ACTIONS))
+
+    return graph, nodes
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark of the vector and node value types.')
+    parser.add_argument("--bounds", nargs=3, type=int, default=[60, 60, 10], help="Bounds of the generated maze.")
+    parser.add_argument("--density", type=float, default=0.8, help="Probability of a cell holding a node.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the random number generator.")
+    parser.add_argument("--count", type=int, default=200000, help="Number of values to time each operation over.")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    vectors = [Vector(rng.randrange(1000), rng.randrange(1000), rng.randrange(1000)) for _ in range(args.count)]
+    actions = [rng.choice(ACTIONS) for _ in range(args.count)]
+
+    time_operation("hash(Vector)", hash, vectors)
+    time_operation("Vector == Vector", lambda vector: vector == vector, vectors)
+    time_operation("get_neighbour", lambda i: get_neighbour(vectors[i], actions[i]), range(args.count))
+    time_operation("Node(position, ACTIONS)", lambda vector: Node(vector, ACTIONS), vectors[:args.count // 10])
+    nodes = [Node(vector) for vector in vectors]
+    time_operation("hash(Node)", hash, nodes)
+
+    del nodes
+
+    # Memory of a node, with its neighbours map and its slot in the list.
+    tracemalloc.start()
+    nodes = [Node(vector) for vector in vectors]
+    print("{:<24} {:8.1f} bytes".format("Node memory", tracemalloc.get_traced_memory()[0] / float(len(vectors))))
+    tracemalloc.stop()
+    del nodes
+
+    graph, positions = generate_graph(Vector(*args.bounds), args.density, args.seed)
+    start, end = positions[0], positions[-1]
+    with collect() as stats:
+        start_time = time.perf_counter()
+        success, path, cost = ucs(graph, start, end)
+        seconds = time.perf_counter() - start_time
+
+    expanded = stats.searches[-1]["expanded"]
+    print("{:<24} {:8.1f} us  ({} nodes expanded, cost {})".format("UCS per expansion", seconds * 1e6 / expanded,
+                                                                    expanded, cost))
+
+    tracemalloc.start()
+    with collect() as stats:
+        ucs(graph, start, end)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print("{:<24} {:8.1f} bytes".format("UCS peak per expansion", peak / float(stats.searches[-1]["expanded"])))
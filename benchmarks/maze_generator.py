@@ -0,0 +1,228 @@
+"""
+Maze Solver - Maze Generator
+
+A script generating synthetic mazes and writing them as input files for the maze solver. Three styles of maze are
+supported:
+
+    open:      Each cell holds a node with probability density, and each action between two nodes is kept with
+               probability action density.
+    corridors: A perfect maze of one cell wide corridors carved by a randomized depth first search over every other
+               cell, with extra openings between corridors added with probability density to create loops.
+    floors:    Open floors like the open style, where nodes only move within their floor, joined by stairs moving
+               between floors with probability stairs.
+
+The start is the first node and the end is the last node of the maze, in index order, so the path crosses the maze.
+
+Usage: python benchmarks/maze_generator.py output [--style open|corridors|floors] [--bounds X Y Z] [--density D]
+                                                  [--action-density A] [--stairs S] [--seed S] [--algorithm NAME]
+
+Author: shravan@usc.edu (5451873903)
+
+"""
+
+import argparse
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from graph import ACTION_OFFSETS, ACTIONS  # noqa: E402
+
+
+# Actions which stay within a floor, and actions which move between floors.
+FLOOR_ACTIONS = tuple(action for action in ACTIONS if ACTION_OFFSETS[action][2] == 0)
+STAIR_ACTIONS = tuple(action for action in ACTIONS if ACTION_OFFSETS[action][2] != 0)
+
+# Map of position offsets to the action that moves by them.
+OFFSET_ACTIONS = dict((ACTION_OFFSETS[action], action) for action in ACTIONS)
+
+
+def generate_open(rng, bounds, density, action_density, actions=ACTIONS):
+    """
+    Method to generate an open maze, where each cell holds a node with the given probability and each action between
+    two nodes is kept with the given probability.
+
+    Args:
+        rng(Random): Random number generator.
+        bounds(tuple): Bounds of the maze.
+        density(float): Probability of a cell holding a node.
+        action_density(float): Probability of an action between two nodes being kept.
+        actions(tuple): Actions the nodes can take. Defaults to every action.
+
+    Returns:
+        (nodes): Map of the position of each node to its actions.
+
+    """
+    size_x, size_y, size_z = bounds
+    nodes = dict(((x, y, z), []) for z in range(size_z) for y in range(size_y) for x in range(size_x)
+                 if rng.random() < density)
+
+    for (x, y, z), node_actions in nodes.items():
+        for action in actions:
+            dx, dy, dz = ACTION_OFFSETS[action]
+            if (x + dx, y + dy, z + dz) in nodes and rng.random() < action_density:
+                node_actions.append(action)
+
+    return nodes
+
+
+def generate_corridors(rng, bounds, density):
+    """
+    Method to generate a maze of corridors. A randomized depth first search over the cells with even co-ordinates
+    carves a corridor to each of them, and each pair of neighbouring corridors that is not joined gets an opening
+    with the given probability.
+
+    Args:
+        rng(Random): Random number generator.
+        bounds(tuple): Bounds of the maze.
+        density(float): Probability of an extra opening between two neighbouring corridors.
+
+    Returns:
+        (nodes): Map of the position of each node to its actions.
+
+    """
+    size_x, size_y, size_z = bounds
+    steps = [(dx, dy, dz) for dx, dy, dz in ACTION_OFFSETS[1:7]]
+    nodes = {}
+
+    def carve(cell, step):
+        # Join the cell to the next cell along the step through the cell between them, in both directions.
+        for offset in range(2):
+            source = tuple(cell[axis] + step[axis] * offset for axis in range(3))
+            target = tuple(source[axis] + step[axis] for axis in range(3))
+            nodes.setdefault(source, []).append(OFFSET_ACTIONS[step])
+            nodes.setdefault(target, []).append(OFFSET_ACTIONS[tuple(-delta for delta in step)])
+
+    def get_next(cell, step):
+        next_cell = tuple(cell[axis] + 2 * step[axis] for axis in range(3))
+        if 0 <= next_cell[0] < size_x and 0 <= next_cell[1] < size_y and 0 <= next_cell[2] < size_z:
+            return next_cell
+        return None
+
+    start = (0, 0, 0)
+    nodes[start] = []
+    visited = {start}
+    stack = [start]
+    while len(stack) != 0:
+        cell = stack[-1]
+        options = [step for step in steps if get_next(cell, step) is not None and get_next(cell, step) not in visited]
+        if len(options) == 0:
+            stack.pop()
+            continue
+
+        step = rng.choice(options)
+        carve(cell, step)
+        visited.add(get_next(cell, step))
+        stack.append(get_next(cell, step))
+
+    # Open some of the walls between neighbouring corridors to create loops.
+    for cell in sorted(visited):
+        for step in steps[::2]:
+            next_cell = get_next(cell, step)
+            middle = tuple(cell[axis] + step[axis] for axis in range(3))
+            if next_cell is not None and middle not in nodes and rng.random() < density:
+                carve(cell, step)
+
+    return nodes
+
+
+def generate_floors(rng, bounds, density, action_density, stairs):
+    """
+    Method to generate a maze of open floors joined by stairs.
+
+    Args:
+        rng(Random): Random number generator.
+        bounds(tuple): Bounds of the maze.
+        density(float): Probability of a cell holding a node.
+        action_density(float): Probability of an action within a floor being kept.
+        stairs(float): Probability of an action between floors being kept.
+
+    Returns:
+        (nodes): Map of the position of each node to its actions.
+
+    """
+    nodes = generate_open(rng, bounds, density, action_density, FLOOR_ACTIONS)
+
+    for (x, y, z), node_actions in nodes.items():
+        for action in STAIR_ACTIONS:
+            dx, dy, dz = ACTION_OFFSETS[action]
+            if (x + dx, y + dy, z + dz) in nodes and rng.random() < stairs:
+                node_actions.append(action)
+
+    return nodes
+
+
+def write_maze(file_path, algorithm, bounds, nodes):
+    """
+    Method to write a maze as an input file.
+
+    Args:
+        file_path(str): Path of the input file to write.
+        algorithm(str): Name of the algorithm to solve the maze with.
+        bounds(tuple): Bounds of the maze.
+        nodes(dict): Map of the position of each node to its actions.
+
+    """
+    # Nodes are written in index order, so the start and end are the first and last nodes.
+    positions = sorted(nodes, key=lambda position: (position[2], position[1], position[0]))
+    start = positions[0] if len(positions) != 0 else (0, 0, 0)
+    end = positions[-1] if len(positions) != 0 else (0, 0, 0)
+
+    with open(file_path, 'w') as f:
+        f.write("{}\n".format(algorithm))
+        f.write("{} {} {}\n".format(*bounds))
+        f.write("{} {} {}\n".format(*start))
+        f.write("{} {} {}\n".format(*end))
+        f.write("{}\n".format(len(positions)))
+        for position in positions:
+            f.write(" ".join(str(value) for value in position + tuple(sorted(set(nodes[position])))) + "\n")
+
+
+def generate_maze(style, bounds, density, action_density, stairs, seed):
+    """
+    Method to generate a maze of a given style.
+
+    Args:
+        style(str): Style of the maze, one of "open", "corridors" or "floors".
+        bounds(tuple): Bounds of the maze.
+        density(float): Density of the maze, as described for each style.
+        action_density(float): Probability of an action between two nodes being kept, for the open and floors styles.
+        stairs(float): Probability of an action between floors being kept, for the floors style.
+        seed(int): Seed of the random number generator.
+
+    Returns:
+        (nodes): Map of the position of each node to its actions.
+
+    """
+    rng = random.Random(seed)
+    if style == "open":
+        return generate_open(rng, bounds, density, action_density)
+    if style == "corridors":
+        return generate_corridors(rng, bounds, density)
+    if style == "floors":
+        return generate_floors(rng, bounds, density, action_density, stairs)
+
+    raise ValueError("Unknown maze style {}.".format(style))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Generator of synthetic mazes for the maze solver.')
+    parser.add_argument("output", type=str, help="Output file path to write the maze to.")
+    parser.add_argument("--style", choices=("open", "corridors", "floors"), default="open",
+                        help="Style of the maze. Defaults to open.")
+    parser.add_argument("--bounds", nargs=3, type=int, default=[50, 50, 10], help="Bounds of the maze.")
+    parser.add_argument("--density", type=float, default=0.8,
+                        help="Probability of a cell holding a node, or of an extra opening for corridors.")
+    parser.add_argument("--action-density", type=float, default=1.0,
+                        help="Probability of an action between two nodes being kept.")
+    parser.add_argument("--stairs", type=float, default=0.01,
+                        help="Probability of an action between floors being kept, for the floors style.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the random number generator.")
+    parser.add_argument("--algorithm", type=str, default="A*", help="Algorithm written to the maze. Defaults to A*.")
+    args = parser.parse_args()
+
+    bounds = tuple(args.bounds)
+    maze = generate_maze(args.style, bounds, args.density, args.action_density, args.stairs, args.seed)
+    write_maze(args.output, args.algorithm, bounds, maze)
+    print("Wrote a {} maze with {} nodes to {}".format(args.style, len(maze), args.output))
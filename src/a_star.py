@@ -7,18 +7,29 @@ Author: shravan@usc.edu (5451873903)
 
 """
 
-import heapq
+from instrumentation import record_search
+from priority_queue import HeapQueue
+from search_state import get_search_state
+from utils import get_path
 from vector import line_distance
 
 
-def a_star(graph, start, end):
+def a_star(graph, start, end, state=None, queue_type=HeapQueue, landmarks=None, components=None):
     """
-    This is a function implementing the A-Star algorithm to find paths in a graph, given a start and end node.
+    This is a function implementing the A-Star algorithm to find paths in a graph, given a start and end node. When
+    landmarks are given, the heuristic is raised to the ALT lower bound wherever that is larger, and nodes which the
+    landmarks show cannot reach the end node are never queued. When the components of the graph are given, queries
+    without a path are rejected without searching, and nodes in components which cannot reach the end node are never
+    queued either.
 
     Args:
         graph(Graph): Graph to perform the pathfinding on.
         start(Vector): Position to start the search at.
         end(Vector): Position to find a path to in the graph.
+        state(SearchState): State to use for the search. Defaults to the calling thread's state for the graph.
+        queue_type(type): Priority queue class to use for the search. Defaults to HeapQueue.
+        landmarks(Landmarks): Landmarks of the graph to use for the ALT heuristic. Defaults to None.
+        components(Components): Components of the graph to prune the search with. Defaults to None.
 
     Returns:
         (success, path, cost): Whether a path was found, path from the start node to the end node in the graph and the
@@ -26,45 +37,80 @@ def a_star(graph, start, end):
 
     """
     # Get the start and end nodes from the graph.
-    start_node = graph.get_node(start)
-    end_node = graph.get_node(end)
-    start_node.heuristic = int(line_distance(start_node.position, end_node.position))
+    start_node = graph.get_index(start)
+    end_node = graph.get_index(end)
 
     if (start_node is None) or (end_node is None):
         return False, [], None
 
-    # Initialize the A* priority queue.
-    a_star_queue = [start_node]
-    heapq.heapify(a_star_queue)
-    start_node.visited = True
+    node_components, end_component = None, 0
+    if components is not None:
+        if components.is_unreachable(start_node, end_node):
+            return False, [], None
+        if not components.is_symmetric():
+            node_components, end_component = components.components, components.components[end_node]
+
+    alt_heuristic = None
+    if landmarks is not None:
+        alt_heuristic = landmarks.get_heuristic(end_node)
+        if alt_heuristic(start_node) is None:
+            return False, [], None
+
+    if state is None:
+        state = get_search_state(graph)
+
+    # Initialize the A* priority queue. Entries are (cost, node) pairs, queued with their total cost as the priority.
+    a_star_queue = queue_type()
+    a_star_queue.push(int(line_distance(start, end)), (0, start_node))
+    state.visit(start_node, 0, None)
+    expanded, pushed, popped, peak_frontier, lookups = 0, 1, 0, 1, 0
 
     # Searching the graph for the end node.
     while len(a_star_queue) != 0:
-        node = heapq.heappop(a_star_queue)
+        _, (node_cost, node) = a_star_queue.pop()
+        popped += 1
 
         if node == end_node:
             break
 
-        neighbours = graph.get_neighbours_with_costs(node)
-        for neighbour, cost in neighbours.items():
-            if not neighbour.visited:
-                # Cost of traversing each node in A* is the cost of traversing to the neighbour + cost of getting
-                # to the parent. The heuristic is the straight line distance from the neighbour to the end node.
-                neighbour.cost = cost + node.cost
-                neighbour.heuristic = int(line_distance(neighbour.position, end_node.position))
-                heapq.heappush(a_star_queue, neighbour)
-                neighbour.parent = node
-                neighbour.visited = True
+        # Skip entries for nodes that were reached more cheaply after they were queued.
+        if node_cost > state.get_cost(node):
+            continue
+
+        successors = graph.get_successors(node)
+        expanded += 1
+        lookups += len(successors)
+
+        for neighbour, cost in successors:
+            # Cost of traversing each node in A* is the cost of traversing to the neighbour + cost of getting to the
+            # parent. The heuristic is the straight line distance from the neighbour to the end node.
+            neighbour_cost = cost + node_cost
+            if not state.is_visited(neighbour) or neighbour_cost < state.get_cost(neighbour):
+                # Nodes in components numbered below the end node's component cannot lead back to it.
+                if node_components is not None and node_components[neighbour] < end_component:
+                    continue
+
+                heuristic = int(line_distance(graph.get_position(neighbour), end))
+                if alt_heuristic is not None:
+                    bound = alt_heuristic(neighbour)
+                    if bound is None:
+                        continue
+                    heuristic = max(heuristic, bound)
+
+                state.visit(neighbour, neighbour_cost, node)
+                a_star_queue.push(neighbour_cost + heuristic, (neighbour_cost, neighbour))
+                pushed += 1
+
+        # The queue holds every entry pushed and not popped yet, including outdated ones.
+        if pushed - popped > peak_frontier:
+            peak_frontier = pushed - popped
 
     # If the A* queue is empty without finding the end node, then we can't reach it.
     else:
+        record_search("A*", expanded, pushed, peak_frontier, lookups)
         return False, [], None
 
-    # Getting the path from the end node to the source by traversing the parents.
-    node = end_node
-    path = []
-    while node is not None:
-        path.insert(0, node)
-        node = node.parent
+    record_search("A*", expanded, pushed, peak_frontier, lookups)
 
-    return True, path, end_node.cost
+    # Getting the path from the end node to the source by traversing the parents.
+    return True, get_path(graph, state, end_node), state.get_cost(end_node)
@@ -0,0 +1,236 @@
+"""
+Maze Solver - Action Paths
+
+This module implements a compact output format for paths, which stores the start position and the actions taken from
+it instead of every position along the path. Runs of the same action are stored once with their length, so long
+straight stretches of a path take a single line. The format is:
+
+    RLE unit|action
+    cost
+    length
+    x y z
+    action count
+    action count
+    ...
+
+The first line says whether each step costs 1, as for the unit cost algorithms, or the cost of its action. A path which
+was not found is written as "FAIL", as in the text format. Decoding the actions gives back the path of the text format.
+
+Author: shravan@usc.edu (5451873903)
+
+"""
+
+from graph import ACTION_OFFSETS, ACTIONS, Node, get_action_cost
+from utils import WRITE_CHUNK_SIZE
+from vector import Vector
+
+
+# Marker on the first line of an action path file.
+MAGIC = "RLE"
+
+# Map of position offsets to the action that moves by them.
+OFFSET_ACTIONS = dict((ACTION_OFFSETS[action], action) for action in ACTIONS)
+
+# Cost of each action. Index 0 is unused so that the table can be indexed by the action directly.
+ACTION_COSTS = (None,) + tuple(get_action_cost(action) for action in ACTIONS)
+
+
+def get_runs(path):
+    """
+    Method to get the runs of actions taken along a path.
+
+    Args:
+        path(list): Path from the start node to the end node, with the cost of reaching each node set.
+
+    Returns:
+        (runs, unit_cost): List of [action, count] runs, and whether each step of the path costs 1 rather than the cost
+            of its action.
+
+    """
+    runs = []
+    unit_cost = action_cost = len(path) > 1
+    previous = path[0]
+    for node in path[1:]:
+        action = OFFSET_ACTIONS.get((node.position.x - previous.position.x, node.position.y - previous.position.y,
+                                     node.position.z - previous.position.z))
+        if action is None:
+            raise ValueError("There is no action from {} to {}.".format(previous.position, node.position))
+
+        step_cost = node.cost - previous.cost
+        if step_cost != 1:
+            unit_cost = False
+        if step_cost != ACTION_COSTS[action]:
+            action_cost = False
+
+        if len(runs) != 0 and runs[-1][0] == action:
+            runs[-1][1] += 1
+        else:
+            runs.append([action, 1])
+        previous = node
+
+    if len(path) > 1 and not (unit_cost or action_cost):
+        raise ValueError("The step costs of the path are neither 1 nor the costs of their actions.")
+
+    return runs, unit_cost
+
+
+def write_action_path(file_path, success, path, cost):
+    """
+    Method to write the path found by a pathfinding algorithm to an output file in the action format.
+
+    Args:
+        file_path(str): Path of the output file.
+        success(bool): Whether a path was found.
+        path(list): Path from the start node to the end node, with the cost of reaching each node set.
+        cost(int): Cost of the path.
+
+    """
+    with open(file_path, 'w') as f:
+        if not success:
+            f.write("FAIL\n")
+            return
+
+        runs, unit_cost = get_runs(path)
+        start = path[0].position
+        f.write("{} {}\n{}\n{}\n{} {} {}\n".format(MAGIC, "unit" if unit_cost else "action", cost, len(path), start.x,
+                                                  start.y, start.z))
+
+        for chunk_start in range(0, len(runs), WRITE_CHUNK_SIZE):
+            f.write("".join(["{} {}\n".format(action, count)
+                             for action, count in runs[chunk_start:chunk_start + WRITE_CHUNK_SIZE]]))
+
+
+def read_action_path(file_path):
+    """
+    Method to read a path from an output file in the action format.
+
+    Args:
+        file_path(str): Path of the output file.
+
+    Returns:
+        (success, path, cost): Whether a path was found, path from the start node to the end node and the cost of each
+            point in the path.
+
+    """
+    with open(file_path, 'r') as f:
+        header = _read_header(f, file_path)
+        if header is None:
+            return False, [], None
+
+        unit_cost, cost, length, (x, y, z) = header
+        path = [Node(Vector(x, y, z), cost=0)]
+        path_cost = 0
+        for action, count in _read_runs(f, file_path):
+            dx, dy, dz = ACTION_OFFSETS[action]
+            step_cost = 1 if unit_cost else ACTION_COSTS[action]
+            for _ in range(count):
+                x, y, z = x + dx, y + dy, z + dz
+                path_cost += step_cost
+                path.append(Node(Vector(x, y, z), cost=path_cost))
+
+    _check_totals(file_path, length, cost, len(path), path_cost)
+    return True, path, cost
+
+
+def decode_action_path(input_path, output_path):
+    """
+    Method to decode a path in the action format into the text format of write_path, streaming the points to the
+    output file without building the path.
+
+    Args:
+        input_path(str): Path of the output file in the action format.
+        output_path(str): Path of the output file to write in the text format.
+
+    """
+    with open(input_path, 'r') as f, open(output_path, 'w') as output:
+        header = _read_header(f, input_path)
+        if header is None:
+            output.write("FAIL\n")
+            return
+
+        unit_cost, cost, length, (x, y, z) = header
+        output.write("{}\n{}\n{} {} {} 0\n".format(cost, length, x, y, z))
+
+        lines = []
+        points, path_cost = 1, 0
+        for action, count in _read_runs(f, input_path):
+            dx, dy, dz = ACTION_OFFSETS[action]
+            step_cost = 1 if unit_cost else ACTION_COSTS[action]
+            for _ in range(count):
+                x, y, z = x + dx, y + dy, z + dz
+                lines.append("{} {} {} {}\n".format(x, y, z, step_cost))
+            points += count
+            path_cost += count * step_cost
+
+            if len(lines) >= WRITE_CHUNK_SIZE:
+                output.write("".join(lines))
+                lines = []
+
+        output.write("".join(lines))
+
+    _check_totals(input_path, length, cost, points, path_cost)
+
+
+def _read_header(f, file_path):
+    """
+    Method to read the header of an output file in the action format.
+
+    Args:
+        f(file): Text file to read the header from.
+        file_path(str): Path of the file, for error messages.
+
+    Returns:
+        (unit_cost, cost, length, start): Whether each step costs 1, the cost and length of the path and its start
+            position as an (x, y, z) tuple, or None if no path was found.
+
+    """
+    header = f.readline().split()
+    if header == ["FAIL"]:
+        return None
+
+    if len(header) != 2 or header[0] != MAGIC or header[1] not in ("unit", "action"):
+        raise ValueError("{} is not an action path file.".format(file_path))
+
+    cost = int(f.readline())
+    length = int(f.readline())
+    x, y, z = (int(value) for value in f.readline().split())
+    return header[1] == "unit", cost, length, (x, y, z)
+
+
+def _read_runs(f, file_path):
+    """
+    Method to read the runs of actions of an output file in the action format.
+
+    Args:
+        f(file): Text file to read the runs from, after its header.
+        file_path(str): Path of the file, for error messages.
+
+    Returns:
+        (runs): Generator of (action, count) pairs.
+
+    """
+    for line in f:
+        if not line.strip():
+            continue
+
+        action, count = (int(value) for value in line.split())
+        if action not in ACTIONS or count < 1:
+            raise ValueError("Invalid run of actions in {}: {}".format(file_path, line.strip()))
+
+        yield action, count
+
+
+def _check_totals(file_path, length, cost, points, path_cost):
+    """
+    Method to check that the runs of actions of an output file add up to the length and cost in its header.
+
+    Args:
+        file_path(str): Path of the file, for error messages.
+        length(int): Length of the path in the header.
+        cost(int): Cost of the path in the header.
+        points(int): Number of points in the decoded path.
+        path_cost(int): Cost of the decoded path.
+
+    """
+    if points != length or path_cost != cost:
+        raise ValueError("The actions in {} do not add up to its length and cost.".format(file_path))
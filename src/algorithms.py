@@ -0,0 +1,75 @@
+"""
+Maze Solver - Algorithms
+
+This module maps the algorithm names used in input files to the pathfinding algorithms implementing them.
+
+Author: shravan@usc.edu (5451873903)
+
+"""
+
+import functools
+
+from a_star import a_star
+from ara_star import ara_star, weighted_a_star
+from bfs import bfs
+from bidirectional import bidirectional_a_star, bidirectional_bfs
+from external_search import external_bfs, external_ucs
+from hierarchical import hpa_star
+from jps import jps
+from numpy_bfs import numpy_bfs
+from parallel_search import parallel_bfs, parallel_ucs
+from ucs import ucs
+
+
+# Map of algorithm names to the functions implementing them. Every function takes the graph, start and end positions
+# and returns a (success, path, cost) tuple.
+ALGORITHMS = {
+    "BFS": bfs,
+    "BFS-NUMPY": numpy_bfs,
+    "BFS-EXTERNAL": external_bfs,
+    "BFS-PARALLEL": parallel_bfs,
+    "UCS": ucs,
+    "UCS-EXTERNAL": external_ucs,
+    "UCS-PARALLEL": parallel_ucs,
+    "A*": a_star,
+    "WA*": weighted_a_star,
+    "ARA*": ara_star,
+    "BI-BFS": bidirectional_bfs,
+    "BI-A*": bidirectional_a_star,
+    "JPS": jps,
+    "HPA*": hpa_star,
+    "HPA*-EXACT": functools.partial(hpa_star, exact=True)
+}
+
+# Algorithms which take a queue_type argument selecting the priority queue they use.
+QUEUE_ALGORITHMS = ("UCS", "A*")
+
+# Algorithms which take a landmarks argument to use the ALT heuristic.
+LANDMARK_ALGORITHMS = ("A*",)
+
+# Algorithms which take a components argument to reject queries without a path and prune their search.
+COMPONENT_ALGORITHMS = ("BFS", "UCS", "A*")
+
+# Algorithms which take a weight argument for their heuristic, and find paths costing at most the weight times the
+# cheapest path.
+WEIGHTED_ALGORITHMS = ("WA*", "ARA*")
+
+# Algorithms which take a time_limit argument, after which they return the best path found so far.
+ANYTIME_ALGORITHMS = ("ARA*",)
+
+# Algorithms which take memory_budget and directory arguments, and spill their frontier to files in the directory once
+# it goes past the budget.
+EXTERNAL_ALGORITHMS = ("BFS-EXTERNAL", "UCS-EXTERNAL")
+
+# Algorithms which only use the index based interface of graphs and the costs of their edges, so they can search the
+# reduced graph of a maze.
+REDUCIBLE_ALGORITHMS = ("UCS", "A*", "WA*", "ARA*", "BI-A*")
+
+# Algorithms which take a workers argument, and split the maze between that many worker processes.
+PARALLEL_ALGORITHMS = ("BFS-PARALLEL", "UCS-PARALLEL")
+
+# Algorithms which can search for several goals in one pass, mapped to whether they use the A* heuristic.
+GOAL_ALGORITHMS = {"UCS": False, "A*": True}
+
+# Algorithms which treat every action as costing 1.
+UNIT_COST_ALGORITHMS = ("BFS", "BI-BFS", "BFS-NUMPY", "BFS-EXTERNAL", "BFS-PARALLEL")
@@ -0,0 +1,344 @@
+"""
+Maze Solver - Weighted A* and Anytime Repairing A* (ARA*) Algorithms
+
+A module implementing bounded suboptimal searches, for callers which need a path within a time budget more than they
+need the cheapest path. Weighted A* inflates the heuristic by a weight, which makes the search head for the end node far
+more greedily, and finds a path costing at most the weight times the cheapest path.
+
+ARA* runs weighted A* repeatedly with a falling weight. Each search reuses the costs found by the previous ones, and
+only expands nodes whose cost has improved since they were last expanded, so a first path is found quickly and is then
+improved until a deadline passes or the path is proven to be the cheapest.
+
+Each path comes with the suboptimality bound achieved for it: the cost of the path divided by the lowest total cost,
+without the weight, of any node that may still lead to a cheaper path. This is often much tighter than the weight.
+
+Author: shravan@usc.edu (5451873903)
+
+"""
+
+import heapq
+import time
+
+from graph import Node
+from instrumentation import record_search
+from search_state import SearchState, get_search_state
+from vector import grid_distance
+
+
+# Default weight of the heuristic for weighted A*.
+WEIGHT = 2.0
+
+# Default weight of the heuristic for the first search of ARA*, and how much it falls after each search.
+INITIAL_WEIGHT = 3.0
+WEIGHT_STEP = 0.5
+
+# Default number of seconds ARA* keeps improving its path for.
+TIME_LIMIT = 1.0
+
+# Number of nodes expanded between checks of the deadline.
+DEADLINE_INTERVAL = 256
+
+
+class ARAStar(object):
+    """
+    A class that implements an anytime planner for a path between two positions in a graph, which finds a path quickly
+    and improves it for as long as it is given.
+    """
+
+    def __init__(self, graph, start, end, weight=INITIAL_WEIGHT, step=WEIGHT_STEP, state=None):
+        """
+        Method to initialize the planner. No search is done until the path is improved.
+
+        Args:
+            graph(Graph): Graph to perform the pathfinding on. Either a Graph or a GridGraph.
+            start(Vector): Position to start the search at.
+            end(Vector): Position to find a path to in the graph.
+            weight(float): Weight of the heuristic for the first search, at least 1. Defaults to INITIAL_WEIGHT.
+            step(float): Amount the weight falls after each search. Defaults to WEIGHT_STEP.
+            state(SearchState): State to use for the searches, which is kept between them. Defaults to a new state
+                owned by the planner.
+
+        """
+        self.graph = graph
+        self.end = end
+        self.start_node = graph.get_index(start)
+        self.end_node = graph.get_index(end)
+        self.weight = max(1.0, weight)
+        self.step = step
+        self.bound = None
+        self.result = (False, [], None)
+        self.exhausted = self.start_node is None or self.end_node is None
+        self.expanded, self.pushed, self.peak_frontier, self.lookups = 0, 0, 0, 0
+        self.searches = 0
+
+        self.state = SearchState(graph.size) if state is None else state
+        self._heuristics = {}
+        self._queue = []
+        self._closed = set()
+        self._inconsistent = set()
+
+        if not self.exhausted:
+            self.state.visit(self.start_node, 0, None)
+            self._push(self.start_node, 0)
+
+    def is_done(self):
+        """
+        Method to check whether the path cannot be improved any further, because it is the cheapest path or there is
+        no path.
+
+        Returns:
+            (bool): Whether the planner is done.
+
+        """
+        return self.exhausted or self.bound == 1.0
+
+    def search(self, deadline=None):
+        """
+        Method to improve the path until the deadline passes or the path cannot be improved. The first path is always
+        searched for until it is found, even if the deadline passes first, so that there is a path to return.
+
+        Args:
+            deadline(float): Value of time.perf_counter() to stop improving the path at. Defaults to improving the
+                path until it is the cheapest path.
+
+        Returns:
+            (success, path, cost, bound): Whether a path was found, path from the start node to the end node in the
+                graph, the cost of each point in the path, and the suboptimality bound of the path.
+
+        """
+        while not self.is_done():
+            if self.bound is not None and deadline is not None and time.perf_counter() >= deadline:
+                break
+            if not self.improve(deadline if self.bound is not None else None):
+                break
+
+        success, path, cost = self.result
+        return success, path, cost, self.bound
+
+    def improve(self, deadline=None):
+        """
+        Method to run one weighted A* search with the current weight, reusing the previous searches, and lower the
+        weight for the next search once it is done.
+
+        Args:
+            deadline(float): Value of time.perf_counter() to interrupt the search at. An interrupted search carries on
+                where it left off when this is called again. Defaults to no deadline.
+
+        Returns:
+            (bool): Whether the search finished before the deadline.
+
+        """
+        state = self.state
+        queue = self._queue
+        closed = self._closed
+        end_node = self.end_node
+        end_cost = state.get_cost(end_node) if state.is_visited(end_node) else None
+        expanded = 0
+
+        while len(queue) != 0:
+            priority, node_cost, node = queue[0]
+
+            # Skip entries for nodes that were reached more cheaply, or expanded, after they were queued.
+            if node_cost != state.get_cost(node) or node in closed:
+                heapq.heappop(queue)
+                continue
+
+            # The path to the end node is within the weight of the cheapest path once no queued node can better it.
+            if end_cost is not None and end_cost <= priority:
+                break
+
+            if deadline is not None and expanded % DEADLINE_INTERVAL == 0 and time.perf_counter() >= deadline:
+                self.expanded += expanded
+                return False
+
+            heapq.heappop(queue)
+            closed.add(node)
+            expanded += 1
+
+            successors = self.graph.get_successors(node)
+            self.lookups += len(successors)
+            for neighbour, cost in successors:
+                neighbour_cost = node_cost + cost
+                if not state.is_visited(neighbour) or neighbour_cost < state.get_cost(neighbour):
+                    state.visit(neighbour, neighbour_cost, node)
+                    if neighbour == end_node:
+                        end_cost = neighbour_cost
+
+                    # Nodes already expanded in this search are expanded again by the next one.
+                    if neighbour in closed:
+                        self._inconsistent.add(neighbour)
+                    else:
+                        self._push(neighbour, neighbour_cost)
+
+        self.expanded += expanded
+        self.searches += 1
+
+        if end_cost is None:
+            # Every node reachable from the start has been expanded without reaching the end node.
+            self.exhausted = True
+            return True
+
+        self.result = self._get_result()
+        self.bound = self._get_bound(self.result[2])
+
+        # Queue every node that may still lead to a cheaper path for the next search, with the lower weight.
+        self.weight = max(1.0, self.weight - self.step)
+        nodes = set(node for _, node_cost, node in queue if node_cost == state.get_cost(node) and node not in closed)
+        nodes.update(self._inconsistent)
+        self._queue = [(self._get_priority(node, state.get_cost(node)), state.get_cost(node), node) for node in nodes]
+        heapq.heapify(self._queue)
+        self._closed = set()
+        self._inconsistent = set()
+        return True
+
+    def _push(self, node, cost):
+        """
+        Method to queue a node with its total cost, using the current weight of the heuristic.
+
+        Args:
+            node(int): Index of the node.
+            cost(int): Cost to reach the node.
+
+        """
+        heapq.heappush(self._queue, (self._get_priority(node, cost), cost, node))
+        self.pushed += 1
+        if len(self._queue) > self.peak_frontier:
+            self.peak_frontier = len(self._queue)
+
+    def _get_priority(self, node, cost):
+        """
+        Method to get the priority of a node, which is its cost plus its weighted heuristic.
+
+        Args:
+            node(int): Index of the node.
+            cost(int): Cost to reach the node.
+
+        Returns:
+            (priority): Priority of the node.
+
+        """
+        return cost + self.weight * self._get_heuristic(node)
+
+    def _get_heuristic(self, node):
+        """
+        Method to get the heuristic of a node, which is the cost of the cheapest path to the end in a maze without
+        walls. It never overestimates the cost to the end node.
+
+        Args:
+            node(int): Index of the node.
+
+        Returns:
+            (heuristic): Heuristic of the node.
+
+        """
+        heuristic = self._heuristics.get(node)
+        if heuristic is None:
+            heuristic = self._heuristics[node] = grid_distance(self.graph.get_position(node), self.end)
+        return heuristic
+
+    def _get_bound(self, cost):
+        """
+        Method to get the suboptimality bound of a path, from the lowest total cost of the nodes which may still lead
+        to a cheaper path.
+
+        Args:
+            cost(int): Cost of the path.
+
+        Returns:
+            (bound): Bound on the cost of the path divided by the cost of the cheapest path, at least 1.
+
+        """
+        state = self.state
+        lowest = min([node_cost + self._get_heuristic(node) for _, node_cost, node in self._queue
+                      if node_cost == state.get_cost(node) and node not in self._closed] +
+                     [state.get_cost(node) + self._get_heuristic(node) for node in self._inconsistent])
+
+        # The end node is still queued, so the lowest total cost is never above the cost of the path.
+        return max(1.0, min(self.weight, float(cost) / lowest)) if lowest > 0 else 1.0
+
+    def _get_result(self):
+        """
+        Method to get the path to the end node from the parents recorded by the searches. A node's parent may have been
+        reached more cheaply since the node was last expanded, so the costs are added up along the path.
+
+        Returns:
+            (success, path, cost): Whether a path was found, path from the start node to the end node in the graph and
+                the cost of each point in the path.
+
+        """
+        nodes = [self.end_node]
+        while nodes[-1] != self.start_node:
+            nodes.append(self.state.get_parent(nodes[-1]))
+        nodes.reverse()
+
+        path = [Node(self.graph.get_position(self.start_node), cost=0)]
+        for parent, node in zip(nodes, nodes[1:]):
+            cost = min(cost for neighbour, cost in self.graph.get_successors(parent) if neighbour == node)
+            path.append(Node(self.graph.get_position(node), cost=path[-1].cost + cost))
+
+        return True, path, path[-1].cost
+
+
+def weighted_a_star(graph, start, end, weight=WEIGHT):
+    """
+    This is a function implementing the weighted A* algorithm to find paths in a graph, given a start and end node.
+    The path found costs at most the weight times the cost of the cheapest path.
+
+    Args:
+        graph(Graph): Graph to perform the pathfinding on.
+        start(Vector): Position to start the search at.
+        end(Vector): Position to find a path to in the graph.
+        weight(float): Weight of the heuristic, at least 1. Defaults to WEIGHT.
+
+    Returns:
+        (success, path, cost): Whether a path was found, path from the start node to the end node in the graph and the
+            cost of each point in the path.
+
+    """
+    planner = ARAStar(graph, start, end, weight, state=get_search_state(graph))
+    if not planner.is_done():
+        planner.improve()
+
+    _record(planner, "WA*")
+    return planner.result
+
+
+def ara_star(graph, start, end, time_limit=TIME_LIMIT, weight=INITIAL_WEIGHT, step=WEIGHT_STEP):
+    """
+    This is a function implementing the ARA* algorithm to find paths in a graph, given a start and end node. A first
+    path is found with a heavily weighted heuristic, and is improved with lower weights until the time limit passes or
+    the path is proven to be the cheapest path.
+
+    Args:
+        graph(Graph): Graph to perform the pathfinding on.
+        start(Vector): Position to start the search at.
+        end(Vector): Position to find a path to in the graph.
+        time_limit(float): Number of seconds to improve the path for, or None to improve it until it is the cheapest
+            path. Defaults to TIME_LIMIT.
+        weight(float): Weight of the heuristic for the first search, at least 1. Defaults to INITIAL_WEIGHT.
+        step(float): Amount the weight falls after each search. Defaults to WEIGHT_STEP.
+
+    Returns:
+        (success, path, cost): Whether a path was found, path from the start node to the end node in the graph and the
+            cost of each point in the path.
+
+    """
+    deadline = None if time_limit is None else time.perf_counter() + time_limit
+    planner = ARAStar(graph, start, end, weight, step, get_search_state(graph))
+    planner.search(deadline)
+
+    _record(planner, "ARA*")
+    return planner.result
+
+
+def _record(planner, algorithm):
+    """
+    Method to report the counters of a planner, along with the suboptimality bound of its path.
+
+    Args:
+        planner(ARAStar): Planner to report.
+        algorithm(str): Name of the algorithm.
+
+    """
+    record_search(algorithm, planner.expanded, planner.pushed, planner.peak_frontier, planner.lookups,
+                  bound=planner.bound, searches=planner.searches)
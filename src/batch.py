@@ -0,0 +1,355 @@
+"""
+Maze Solver - Batch Queries
+
+This module implements answering many pathfinding queries against one loaded maze. The maze's cell array is placed in
+shared memory once, and a pool of worker processes answers the queries against read only views of it.
+
+Queries are read one per line in the format "algorithm sx sy sz ex ey ez", and one result line is written per query in
+the same order, in the format "algorithm sx sy sz ex ey ez cost length x y z x y z ...", or
+"algorithm sx sy sz ex ey ez FAIL" if there is no path.
+
+Author: shravan@usc.edu (5451873903)
+
+"""
+
+from array import array
+from collections import deque
+from multiprocessing import Pool, shared_memory
+
+from algorithms import ALGORITHMS, COMPONENT_ALGORITHMS, LANDMARK_ALGORITHMS, PARALLEL_ALGORITHMS
+from grid_graph import GridGraph
+from landmarks import load_landmarks
+from vector import Vector
+
+
+# Number of queries sent to a worker process at a time.
+QUERY_CHUNK_SIZE = 64
+
+# Number of processes the parallel algorithms use in a worker process of a pool. The pool already runs a search per
+# worker, so splitting each search between more processes would only oversubscribe the CPUs.
+POOL_SEARCH_WORKERS = 1
+
+# Graph, landmarks and components used by the worker processes, attached to the shared memory when the worker starts.
+_graph = None
+_landmarks = None
+_components = None
+_shared_memory = None
+
+
+def read_queries(f):
+    """
+    Method to read queries from a file. Invalid queries are passed on as their line, so that they are answered with an
+    error in their place instead of stopping the batch.
+
+    Args:
+        f(file): Text file to read the queries from.
+
+    Returns:
+        (queries): Generator of (algorithm, start, end) tuples, or of the stripped line of each invalid query.
+
+    """
+    for line in f:
+        values = line.split()
+        if len(values) == 0:
+            continue
+
+        query = parse_query(values)
+        yield line.strip() if query is None else query
+
+
+def parse_query(values):
+    """
+    Method to parse a query from the values of its line.
+
+    Args:
+        values(list): Values of the query, as strings in the format "algorithm sx sy sz ex ey ez".
+
+    Returns:
+        (query): Query as an (algorithm, start, end) tuple, or None if the values are not a valid query.
+
+    """
+    if len(values) != 7 or values[0] not in ALGORITHMS:
+        return None
+
+    try:
+        start = Vector(int(values[1]), int(values[2]), int(values[3]))
+        end = Vector(int(values[4]), int(values[5]), int(values[6]))
+    except ValueError:
+        return None
+
+    return values[0], start, end
+
+
+def run_query(graph, query, landmarks=None, cache=None, components=None, workers=None):
+    """
+    Method to answer a query and format its result.
+
+    Args:
+        graph(GridGraph): Graph to perform the pathfinding on.
+        query(tuple): Query to answer, as an (algorithm, start, end) tuple, or the line of an invalid query.
+        landmarks(Landmarks): Landmarks of the graph, used by the algorithms supporting the ALT heuristic. Defaults to
+            None.
+        cache(PathCache): Cache to answer repeated queries from. Defaults to None.
+        components(Components): Components of the graph, used by the algorithms supporting them to reject queries
+            without a path. Defaults to None.
+        workers(int): Number of worker processes the parallel algorithms split the maze between. Defaults to their
+            own default.
+
+    Returns:
+        (result): Result line for the query, or an error line for an invalid query.
+
+    """
+    if isinstance(query, str):
+        return format_error(query, "Invalid query.")
+
+    return format_result(get_prefix(query), *search(graph, query, landmarks, cache, components, workers))
+
+
+def search(graph, query, landmarks=None, cache=None, components=None, workers=None):
+    """
+    Method to answer a query.
+
+    Args:
+        graph(GridGraph): Graph to perform the pathfinding on.
+        query(tuple): Query to answer, as an (algorithm, start, end) tuple.
+        landmarks(Landmarks): Landmarks of the graph, used by the algorithms supporting the ALT heuristic. Defaults to
+            None.
+        cache(PathCache): Cache to answer repeated queries from. Defaults to None.
+        components(Components): Components of the graph, used by the algorithms supporting them to reject queries
+            without a path. Defaults to None.
+        workers(int): Number of worker processes the parallel algorithms split the maze between. Defaults to their
+            own default.
+
+    Returns:
+        (success, path, cost): Whether a path was found, path from the start node to the end node in the graph and the
+            cost of each point in the path.
+
+    """
+    algorithm, start, end = query
+    options = {}
+    if landmarks is not None and algorithm in LANDMARK_ALGORITHMS:
+        options["landmarks"] = landmarks
+    if components is not None and algorithm in COMPONENT_ALGORITHMS:
+        options["components"] = components
+    if workers is not None and algorithm in PARALLEL_ALGORITHMS:
+        options["workers"] = workers
+
+    if cache is not None:
+        return cache.search(graph, algorithm, start, end, **options)
+
+    return ALGORITHMS[algorithm](graph, start, end, **options)
+
+
+def get_prefix(query):
+    """
+    Method to get the description of a query that its result line starts with.
+
+    Args:
+        query(tuple): Query, as an (algorithm, start, end) tuple.
+
+    Returns:
+        (prefix): Description of the query.
+
+    """
+    algorithm, start, end = query
+    return "{} {} {} {} {} {} {}".format(algorithm, start.x, start.y, start.z, end.x, end.y, end.z)
+
+
+def format_result(prefix, success, path, cost):
+    """
+    Method to format the result of a query as a line of the form "prefix cost length x y z x y z ...", or
+    "prefix FAIL" if there is no path.
+
+    Args:
+        prefix(str): Description of the query the line starts with.
+        success(bool): Whether a path was found.
+        path(list): Path found for the query.
+        cost(int): Cost of the path.
+
+    Returns:
+        (result): Result line for the query.
+
+    """
+    if not success:
+        return prefix + " FAIL\n"
+
+    points = " ".join("{} {} {}".format(node.position.x, node.position.y, node.position.z) for node in path)
+    return "{} {} {} {}\n".format(prefix, cost, len(path), points)
+
+
+def format_error(request, message):
+    """
+    Method to format the line answering a request which could not be answered, of the form "request ERROR message".
+
+    Args:
+        request(str): Line of the request.
+        message(str): Reason the request could not be answered.
+
+    Returns:
+        (result): Error line for the request.
+
+    """
+    return "{} ERROR {}\n".format(request, message)
+
+
+def run_batch(graph, queries, f, workers=1, landmarks_path=None, cache=None, components=None):
+    """
+    Method to answer a batch of queries against a graph and write their results to a file.
+
+    Args:
+        graph(GridGraph): Graph to perform the pathfinding on.
+        queries(iterable): Queries to answer, as (algorithm, start, end) tuples or the lines of invalid queries.
+        f(file): Text file to write the results to.
+        workers(int): Number of worker processes to use. The queries are answered in this process if it is 1.
+            Defaults to 1.
+        landmarks_path(str): Path of the landmark file of the graph, loaded by each worker process. Defaults to None.
+        cache(PathCache): Cache to answer repeated queries from. It is only used by this process, so cached queries are
+            never sent to the workers. Defaults to None.
+        components(Components): Components of the graph, sent to each worker process. Defaults to None.
+
+    Returns:
+        (count): Number of queries answered.
+
+    """
+    count = 0
+    if workers == 1:
+        landmarks = None if landmarks_path is None else load_landmarks(landmarks_path, graph)
+        for query in queries:
+            f.write(run_query(graph, query, landmarks, cache, components))
+            count += 1
+        return count
+
+    # Copy the cell array into shared memory, which the workers attach to instead of receiving their own copy.
+    cells = memoryview(graph.cells).cast('B')
+    memory = shared_memory.SharedMemory(create=True, size=max(len(cells), 1))
+    try:
+        memory.buf[:len(cells)] = cells
+        bounds = (graph.bounds.x, graph.bounds.y, graph.bounds.z)
+
+        initargs = (memory.name, bounds, landmarks_path, components)
+        with Pool(workers, initializer=_init_worker, initargs=initargs) as pool:
+            if cache is None:
+                for result in pool.imap(_run_worker_query, queries, QUERY_CHUNK_SIZE):
+                    f.write(result)
+                    count += 1
+            else:
+                count = _run_cached_batch(pool, graph, queries, f, cache)
+    finally:
+        memory.close()
+        memory.unlink()
+
+    return count
+
+
+def _run_cached_batch(pool, graph, queries, f, cache):
+    """
+    Method to answer a batch of queries with a pool of worker processes, answering cached queries in this process and
+    sending only the rest to the workers. Results are written in the order of the queries.
+
+    Args:
+        pool(Pool): Pool of worker processes attached to the graph.
+        graph(GridGraph): Graph to perform the pathfinding on.
+        queries(iterable): Queries to answer, as (algorithm, start, end) tuples or the lines of invalid queries.
+        f(file): Text file to write the results to.
+        cache(PathCache): Cache to answer repeated queries from.
+
+    Returns:
+        (count): Number of queries answered.
+
+    """
+    # Queries waiting for their result to be written, each with a slot holding its result once it is known. The pool
+    # reads the queries to send to the workers in another thread, which appends to these queues. Queries repeated while
+    # the first copy is still being searched share its slot, so they are only searched once.
+    pending = deque()
+    searching = deque()
+    slots = {}
+
+    def get_uncached_queries():
+        for query in queries:
+            if isinstance(query, str):
+                # Invalid queries are answered with an error in their place, without searching.
+                pending.append((query, [format_error(query, "Invalid query.")]))
+                continue
+
+            result = cache.get(graph, *query)
+            slot = slots.get(query) if result is None else None
+            if slot is None:
+                slot = [result]
+                if result is None:
+                    slots[query] = slot
+                    searching.append((query, slot))
+                    pending.append((query, slot))
+                    yield query
+                    continue
+
+            pending.append((query, slot))
+
+    def write_results():
+        written = 0
+        while len(pending) != 0 and pending[0][1][0] is not None:
+            query, slot = pending.popleft()
+            f.write(slot[0] if isinstance(query, str) else format_result(get_prefix(query), *slot[0]))
+            written += 1
+        return written
+
+    count = 0
+    for result in pool.imap(_search_worker_query, get_uncached_queries(), QUERY_CHUNK_SIZE):
+        query, slot = searching.popleft()
+        cache.put(graph, query[0], query[1], query[2], result)
+        slot[0] = result
+        slots.pop(query, None)
+        count += write_results()
+
+    return count + write_results()
+
+
+def _init_worker(name, bounds, landmarks_path, components):
+    """
+    Method to attach a worker process to the shared graph.
+
+    Args:
+        name(str): Name of the shared memory block holding the cell array.
+        bounds(tuple): Bounds of the graph.
+        landmarks_path(str): Path of the landmark file of the graph, or None.
+        components(Components): Components of the graph, or None.
+
+    """
+    global _graph, _landmarks, _components, _shared_memory
+
+    _shared_memory = shared_memory.SharedMemory(name=name)
+
+    bounds = Vector(*bounds)
+    size = bounds.x * bounds.y * bounds.z
+    cells = _shared_memory.buf.toreadonly()[:size * array('I').itemsize].cast('I')
+    _graph = GridGraph(bounds, cells)
+    _landmarks = None if landmarks_path is None else load_landmarks(landmarks_path, _graph)
+    _components = components
+
+
+def _run_worker_query(query):
+    """
+    Method to answer a query in a worker process.
+
+    Args:
+        query(tuple): Query to answer, as an (algorithm, start, end) tuple.
+
+    Returns:
+        (result): Result line for the query.
+
+    """
+    return run_query(_graph, query, _landmarks, components=_components, workers=POOL_SEARCH_WORKERS)
+
+
+def _search_worker_query(query):
+    """
+    Method to answer a query in a worker process, returning the result instead of its line so that it can be cached.
+
+    Args:
+        query(tuple): Query to answer, as an (algorithm, start, end) tuple.
+
+    Returns:
+        (success, path, cost): Whether a path was found, path from the start node to the end node in the graph and the
+            cost of each point in the path.
+
+    """
+    return search(_graph, query, _landmarks, components=_components, workers=POOL_SEARCH_WORKERS)
@@ -7,16 +7,25 @@ Author: shravan@usc.edu (5451873903)
 
 """
 
+from collections import deque
 
-def bfs(graph, start, end):
+from instrumentation import record_search
+from search_state import get_search_state
+from utils import get_path
+
+
+def bfs(graph, start, end, state=None, components=None):
     """
     This is a function implementing the Breadth First Search algorithm to find paths in a graph, given a start and end
-    node.
+    node. When the components of the graph are given, queries without a path are rejected without searching, and
+    nodes which cannot reach the end node are never queued.
 
     Args:
         graph(Graph): Graph to perform the pathfinding on.
         start(Vector): Position to start the search at.
         end(Vector): Position to find a path to in the graph.
+        state(SearchState): State to use for the search. Defaults to the calling thread's state for the graph.
+        components(Components): Components of the graph to prune the search with. Defaults to None.
 
     Returns:
         (success, path, cost): Whether a path was found, path from the start node to the end node in the graph and the
@@ -24,41 +33,58 @@ def bfs(graph, start, end):
 
     """
     # Get the start and end nodes from the graph.
-    start_node = graph.get_node(start)
-    end_node = graph.get_node(end)
+    start_node = graph.get_index(start)
+    end_node = graph.get_index(end)
 
     if (start_node is None) or (end_node is None):
         return False, [], None
 
+    node_components, end_component = None, 0
+    if components is not None:
+        if components.is_unreachable(start_node, end_node):
+            return False, [], None
+        if not components.is_symmetric():
+            node_components, end_component = components.components, components.components[end_node]
+
+    if state is None:
+        state = get_search_state(graph)
+
     # Initialize the BFS queue.
-    bfs_queue = [start_node]
-    start_node.visited = True
+    bfs_queue = deque([start_node])
+    state.visit(start_node, 0, None)
+    expanded, pushed, peak_frontier, lookups = 0, 1, 1, 0
 
     # Searching the graph for the end node.
     while len(bfs_queue) != 0:
-        node = bfs_queue.pop(0)
+        node = bfs_queue.popleft()
 
         if node == end_node:
             break
 
-        neighbours = graph.get_neighbours(node)
-        for neighbour in neighbours:
-            if not neighbour.visited:
+        successors = graph.get_successors(node)
+        expanded += 1
+        lookups += len(successors)
+
+        for neighbour, _ in successors:
+            if not state.is_visited(neighbour):
+                # Nodes in components numbered below the end node's component cannot lead back to it.
+                if node_components is not None and node_components[neighbour] < end_component:
+                    continue
+
                 # Cost of traversing each node in BFS is 1.
-                neighbour.cost = node.cost + 1
+                state.visit(neighbour, state.get_cost(node) + 1, node)
                 bfs_queue.append(neighbour)
-                neighbour.parent = node
-                neighbour.visited = True
+                pushed += 1
+
+        if len(bfs_queue) > peak_frontier:
+            peak_frontier = len(bfs_queue)
 
     # If the BFS queue is empty without finding the end node, then we can't reach it.
     else:
+        record_search("BFS", expanded, pushed, peak_frontier, lookups)
         return False, [], None
 
-    # Getting the path from the end node to the source by traversing the parents.
-    node = end_node
-    path = []
-    while node is not None:
-        path.insert(0, node)
-        node = node.parent
+    record_search("BFS", expanded, pushed, peak_frontier, lookups)
 
-    return True, path, end_node.cost
+    # Getting the path from the end node to the source by traversing the parents.
+    return True, get_path(graph, state, end_node), state.get_cost(end_node)
@@ -0,0 +1,171 @@
+"""
+Maze Solver - Bidirectional Search Algorithms
+
+A module implementing bidirectional variants of the BFS and A* algorithms to solve mazes. Each searches forwards from
+the start node and backwards from the end node, and stops once the two searches meet. The backward search follows the
+actions leading into a node, as actions are not guaranteed to be reversible.
+
+Author: shravan@usc.edu (5451873903)
+
+"""
+
+import heapq
+
+from instrumentation import record_search
+from search_state import get_search_state
+from utils import get_bidirectional_path
+from vector import line_distance
+
+
+def bidirectional_bfs(graph, start, end):
+    """
+    This is a function implementing a bidirectional Breadth First Search to find paths in a graph, given a start and
+    end node. Each step expands a whole level of the smaller of the two frontiers.
+
+    Args:
+        graph(Graph): Graph to perform the pathfinding on.
+        start(Vector): Position to start the search at.
+        end(Vector): Position to find a path to in the graph.
+
+    Returns:
+        (success, path, cost): Whether a path was found, path from the start node to the end node in the graph and the
+            cost of each point in the path.
+
+    """
+    # Get the start and end nodes from the graph.
+    start_node = graph.get_index(start)
+    end_node = graph.get_index(end)
+
+    if (start_node is None) or (end_node is None):
+        return False, [], None
+
+    forward_state = get_search_state(graph, 0)
+    backward_state = get_search_state(graph, 1)
+    forward_state.visit(start_node, 0, None)
+    backward_state.visit(end_node, 0, None)
+
+    forward_frontier = [start_node]
+    backward_frontier = [end_node]
+    best_cost, meeting_node = (0, start_node) if start_node == end_node else (None, None)
+    expanded, pushed, peak_frontier, lookups = 0, 2, 2, 0
+
+    # Searching the graph until the frontiers meet. Once a level produces a meeting node, the cheapest meeting node in
+    # that level gives the shortest path, as every later level is at least one step longer.
+    while best_cost is None and len(forward_frontier) != 0 and len(backward_frontier) != 0:
+        if len(forward_frontier) <= len(backward_frontier):
+            frontier, state, other_state, get_neighbours = (forward_frontier, forward_state, backward_state,
+                                                            graph.get_successors)
+        else:
+            frontier, state, other_state, get_neighbours = (backward_frontier, backward_state, forward_state,
+                                                            graph.get_predecessors)
+
+        next_frontier = []
+        for node in frontier:
+            neighbours = get_neighbours(node)
+            lookups += len(neighbours)
+
+            for neighbour, _ in neighbours:
+                if not state.is_visited(neighbour):
+                    # Cost of traversing each node in BFS is 1.
+                    state.visit(neighbour, state.get_cost(node) + 1, node)
+                    next_frontier.append(neighbour)
+
+                    if other_state.is_visited(neighbour):
+                        cost = state.get_cost(neighbour) + other_state.get_cost(neighbour)
+                        if best_cost is None or cost < best_cost:
+                            best_cost, meeting_node = cost, neighbour
+
+        expanded += len(frontier)
+        pushed += len(next_frontier)
+        frontier[:] = next_frontier
+        peak_frontier = max(peak_frontier, len(forward_frontier) + len(backward_frontier))
+
+    record_search("BI-BFS", expanded, pushed, peak_frontier, lookups)
+
+    # If either frontier is empty without the searches meeting, then we can't reach the end node.
+    if best_cost is None:
+        return False, [], None
+
+    return True, get_bidirectional_path(graph, forward_state, backward_state, meeting_node), best_cost
+
+
+def bidirectional_a_star(graph, start, end):
+    """
+    This is a function implementing a bidirectional A-Star search to find paths in a graph, given a start and end node.
+    The forward search is guided towards the end node and the backward search towards the start node. The search stops
+    once the cheapest path found costs no more than the lowest total cost in either queue, as both heuristics are
+    consistent and every path not found yet must pass through a queued node on both sides.
+
+    Args:
+        graph(Graph): Graph to perform the pathfinding on.
+        start(Vector): Position to start the search at.
+        end(Vector): Position to find a path to in the graph.
+
+    Returns:
+        (success, path, cost): Whether a path was found, path from the start node to the end node in the graph and the
+            cost of each point in the path.
+
+    """
+    # Get the start and end nodes from the graph.
+    start_node = graph.get_index(start)
+    end_node = graph.get_index(end)
+
+    if (start_node is None) or (end_node is None):
+        return False, [], None
+
+    forward_state = get_search_state(graph, 0)
+    backward_state = get_search_state(graph, 1)
+    forward_state.visit(start_node, 0, None)
+    backward_state.visit(end_node, 0, None)
+
+    # Entries in both queues are (total cost, cost, node) tuples.
+    forward_queue = [(int(line_distance(start, end)), 0, start_node)]
+    backward_queue = [(int(line_distance(end, start)), 0, end_node)]
+    best_cost, meeting_node = (0, start_node) if start_node == end_node else (None, None)
+    expanded, pushed, peak_frontier, lookups = 0, 2, 2, 0
+
+    # Searching the graph from the side with the smaller queue, until no queued node can lead to a cheaper path.
+    while len(forward_queue) != 0 and len(backward_queue) != 0:
+        if best_cost is not None and best_cost <= max(forward_queue[0][0], backward_queue[0][0]):
+            break
+
+        if len(forward_queue) <= len(backward_queue):
+            queue, state, other_state, get_neighbours, target = (forward_queue, forward_state, backward_state,
+                                                                 graph.get_successors, end)
+        else:
+            queue, state, other_state, get_neighbours, target = (backward_queue, backward_state, forward_state,
+                                                                 graph.get_predecessors, start)
+
+        _, node_cost, node = heapq.heappop(queue)
+
+        # Skip entries for nodes that were reached more cheaply after they were queued.
+        if node_cost > state.get_cost(node):
+            continue
+
+        neighbours = get_neighbours(node)
+        expanded += 1
+        lookups += len(neighbours)
+
+        for neighbour, cost in neighbours:
+            neighbour_cost = cost + node_cost
+            if not state.is_visited(neighbour) or neighbour_cost < state.get_cost(neighbour):
+                state.visit(neighbour, neighbour_cost, node)
+                heuristic = int(line_distance(graph.get_position(neighbour), target))
+                heapq.heappush(queue, (neighbour_cost + heuristic, neighbour_cost, neighbour))
+                pushed += 1
+
+                if other_state.is_visited(neighbour):
+                    path_cost = neighbour_cost + other_state.get_cost(neighbour)
+                    if best_cost is None or path_cost < best_cost:
+                        best_cost, meeting_node = path_cost, neighbour
+
+        if len(forward_queue) + len(backward_queue) > peak_frontier:
+            peak_frontier = len(forward_queue) + len(backward_queue)
+
+    record_search("BI-A*", expanded, pushed, peak_frontier, lookups)
+
+    # If the searches never met, then we can't reach the end node.
+    if best_cost is None:
+        return False, [], None
+
+    return True, get_bidirectional_path(graph, forward_state, backward_state, meeting_node), best_cost
@@ -0,0 +1,108 @@
+"""
+Maze Solver - Compiled Maze
+
+This module implements a binary file format for mazes, which holds the parameters of the maze and the packed cell array
+of a grid graph. Compiled mazes are loaded through mmap without copying the cell array, so loading takes the same time
+regardless of the size of the maze, and solvers on the same host share the file's pages.
+
+Author: shravan@usc.edu (5451873903)
+
+"""
+
+import mmap
+import struct
+
+from grid_graph import GridGraph
+from vector import Vector
+
+
+# Magic bytes at the start of every compiled maze.
+MAGIC = b"MZSV"
+
+# Version of the compiled maze format.
+VERSION = 1
+
+# Marker written in native byte order, used to check that a compiled maze was written on a compatible machine.
+BYTE_ORDER_MARK = 0x0102
+
+# Header layout: magic, version, byte order mark, bounds, start, end and algorithm name.
+HEADER = struct.Struct("=4sHH3i3i3i16s")
+
+# Offset of the cell array in the file. This keeps the cell array aligned for the memoryview cast.
+CELLS_OFFSET = 64
+
+
+def is_compiled_maze(file_path):
+    """
+    Method to check whether a file is a compiled maze.
+
+    Args:
+        file_path(str): Path of the file to check.
+
+    Returns:
+        (bool): Whether the file is a compiled maze.
+
+    """
+    with open(file_path, 'rb') as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def write_compiled_maze(file_path, algorithm, start, end, graph):
+    """
+    Method to write a maze to a compiled maze file.
+
+    Args:
+        file_path(str): Path of the file to write.
+        algorithm(str): Algorithm to use to solve the maze.
+        start(Vector): Starting position in the maze.
+        end(Vector): Ending position in the maze.
+        graph(GridGraph): Graph of the maze.
+
+    """
+    if isinstance(end, tuple):
+        raise ValueError("Compiled mazes hold a single end position, so mazes with several goals cannot be compiled.")
+
+    bounds = graph.bounds
+    header = HEADER.pack(MAGIC, VERSION, BYTE_ORDER_MARK, bounds.x, bounds.y, bounds.z, start.x, start.y, start.z,
+                         end.x, end.y, end.z, algorithm.encode())
+
+    with open(file_path, 'wb') as f:
+        f.write(header.ljust(CELLS_OFFSET, b'\0'))
+        f.write(memoryview(graph.cells).cast('B'))
+
+
+def load_compiled_maze(file_path):
+    """
+    Method to load a compiled maze. The graph's cell array is a read only view of the memory mapped file.
+
+    Args:
+        file_path(str): Path of the compiled maze file.
+
+    Returns:
+        (algorithm, start, end, graph): Returns the algorithm to use, the starting position in the graph, the ending
+            position and the graph of the maze.
+
+    """
+    with open(file_path, 'rb') as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    values = HEADER.unpack_from(buffer)
+    magic, version, byte_order_mark = values[:3]
+    if magic != MAGIC:
+        raise ValueError("{} is not a compiled maze.".format(file_path))
+    if version != VERSION:
+        raise ValueError("{} has compiled maze version {}, expected {}.".format(file_path, version, VERSION))
+    if byte_order_mark != BYTE_ORDER_MARK:
+        raise ValueError("{} was compiled on a machine with a different byte order.".format(file_path))
+
+    bounds = Vector(*values[3:6])
+    start = Vector(*values[6:9])
+    end = Vector(*values[9:12])
+    algorithm = values[12].rstrip(b'\0').decode()
+
+    cells = memoryview(buffer)[CELLS_OFFSET:].cast('I')
+    graph = GridGraph(bounds, cells)
+    if len(cells) != graph.size:
+        raise ValueError("{} has {} cells, expected {}.".format(file_path, len(cells), graph.size))
+
+    return algorithm, start, end, graph
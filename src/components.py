@@ -0,0 +1,212 @@
+"""
+Maze Solver - Components
+
+This module implements a reachability index of a maze, used to answer queries without a path in constant time instead
+of searching everything reachable from the start. The index holds the strongly connected component of every node over
+the directed actions, and the weakly connected component, where the direction of the actions is ignored.
+
+Components are numbered in the order Tarjan's algorithm finishes them, which is a reverse topological order of the
+components: an action between two components always leads to a lower numbered component. So a node can only reach
+nodes in its own weakly connected component, and only those with a component number no higher than its own. Searches
+use this to reject queries outright, and to skip nodes whose component is numbered below the end node's, as nothing in
+them can lead back to the end. When every action can be undone, the strongly and weakly connected components are the
+same, and the index answers every query exactly.
+
+Author: shravan@usc.edu (5451873903)
+
+"""
+
+import weakref
+from array import array
+
+from grid_graph import PRESENT
+
+
+# Component number of cells without a node.
+NO_COMPONENT = (1 << (8 * array('I').itemsize)) - 1
+
+# Per graph cache of the version of the graph it was built for and its components.
+_components_cache = weakref.WeakKeyDictionary()
+
+
+class Components(object):
+    """
+    A class that holds the strongly and weakly connected components of every node of a graph.
+    """
+
+    def __init__(self, components, groups, count):
+        """
+        Method to initialize the components.
+
+        Args:
+            components(array): Strongly connected component of each cell, or NO_COMPONENT for cells without a node.
+            groups(array): Weakly connected component of each cell, or the components array if every action can be
+                undone.
+            count(int): Number of strongly connected components.
+
+        """
+        self.components = components
+        self.groups = groups
+        self.count = count
+
+    def __repr__(self):
+        """
+        Method to represent the components as a string.
+
+        Returns:
+            (str): String representation of the components.
+
+        """
+        return "Components: {}, Symmetric: {}".format(self.count, self.is_symmetric())
+
+    def is_symmetric(self):
+        """
+        Method to check whether the strongly and weakly connected components are the same, so the index answers every
+        query exactly.
+
+        Returns:
+            (bool): Whether the components are the same.
+
+        """
+        return self.groups is self.components
+
+    def is_unreachable(self, source, target):
+        """
+        Method to check whether there is certainly no path from one node to another. If this is False, there may still
+        be no path unless the nodes are in the same strongly connected component.
+
+        Args:
+            source(int): Index of the node the path starts at.
+            target(int): Index of the node the path ends at.
+
+        Returns:
+            (bool): Whether there is certainly no path.
+
+        """
+        source_component = self.components[source]
+        target_component = self.components[target]
+        if source_component == NO_COMPONENT or target_component == NO_COMPONENT:
+            return True
+
+        return source_component < target_component or self.groups[source] != self.groups[target]
+
+
+def get_components(graph):
+    """
+    Method to get the components of a graph. They are built on first use and kept until the graph is edited.
+
+    Args:
+        graph(Graph): Graph to get the components of.
+
+    Returns:
+        (components): Components of the graph.
+
+    """
+    cache = _components_cache.get(graph)
+    if cache is None or cache[0] != graph.version:
+        cache = _components_cache[graph] = (graph.version, build_components(graph))
+
+    return cache[1]
+
+
+def build_components(graph):
+    """
+    Method to find the strongly connected components of a graph with an iterative version of Tarjan's algorithm, and
+    its weakly connected components along the way. Every node found from the same root is in the root's weakly
+    connected component, so only the trees of the search joined by an action between them need a union find.
+
+    Args:
+        graph(Graph): Graph to find the components of. Either a Graph or a GridGraph.
+
+    Returns:
+        (components): Components of the graph.
+
+    """
+    size = graph.size
+    orders = array('I', bytes(array('I').itemsize * size))
+    lowlinks = array('I', bytes(array('I').itemsize * size))
+    components = array('I', [NO_COMPONENT]) * size
+    groups = array('I', [NO_COMPONENT]) * size
+    tree_parents = {}
+    stack = []
+    order = 0
+    count = 0
+
+    def find(tree):
+        # Find the root of a tree's weakly connected component, halving the path to it on the way.
+        while tree_parents[tree] != tree:
+            tree_parents[tree] = tree_parents[tree_parents[tree]]
+            tree = tree_parents[tree]
+        return tree
+
+    for root in get_nodes(graph):
+        if orders[root] != 0:
+            continue
+
+        tree_parents[root] = root
+        order += 1
+        orders[root] = lowlinks[root] = order
+        groups[root] = root
+        stack.append(root)
+        work = [(root, iter(graph.get_successors(root)))]
+
+        while len(work) != 0:
+            node, successors = work[-1]
+            for neighbour, _ in successors:
+                if orders[neighbour] == 0:
+                    order += 1
+                    orders[neighbour] = lowlinks[neighbour] = order
+                    groups[neighbour] = root
+                    stack.append(neighbour)
+                    work.append((neighbour, iter(graph.get_successors(neighbour))))
+                    break
+
+                if components[neighbour] == NO_COMPONENT:
+                    # Visited nodes without a component are still on the stack.
+                    if orders[neighbour] < lowlinks[node]:
+                        lowlinks[node] = orders[neighbour]
+                elif groups[neighbour] != root:
+                    # The action joins this tree to the weakly connected component of an earlier tree.
+                    tree_parents[find(root)] = find(groups[neighbour])
+
+            else:
+                work.pop()
+                if len(work) != 0 and lowlinks[node] < lowlinks[work[-1][0]]:
+                    lowlinks[work[-1][0]] = lowlinks[node]
+
+                # The node is the root of a component, which holds every node above it on the stack.
+                if lowlinks[node] == orders[node]:
+                    while True:
+                        member = stack.pop()
+                        components[member] = count
+                        if member == node:
+                            break
+                    count += 1
+
+    # Every strongly connected component lies within a weakly connected component, so if there are as many of each,
+    # they are the same.
+    if sum(1 for tree in tree_parents if find(tree) == tree) == count:
+        return Components(components, components, count)
+
+    for node in get_nodes(graph):
+        groups[node] = find(groups[node])
+
+    return Components(components, groups, count)
+
+
+def get_nodes(graph):
+    """
+    Method to get the index of every node of a graph.
+
+    Args:
+        graph(Graph): Graph to get the nodes of. Either a Graph or a GridGraph.
+
+    Returns:
+        (nodes): Iterator over the indices of the nodes.
+
+    """
+    cells = getattr(graph, "cells", None)
+    if cells is not None:
+        return (index for index in range(graph.size) if cells[index] & PRESENT)
+
+    return sorted(graph.get_index(node.position) for node in graph.nodes.values())
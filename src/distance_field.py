@@ -0,0 +1,316 @@
+"""
+Maze Solver - Distance Fields
+
+This module implements single source distance fields. One full search from a source node records the cost of the
+cheapest path to every node along with the action each node was reached with, so the path to any number of targets is
+found by walking the actions back from the target, without searching again. Fields can be saved to a file and memory
+mapped back in later. A field file records a hash of the maze it was built for, so a file built before the maze was
+edited, or for another maze, is rejected rather than giving paths through nodes which are not there.
+
+Author: shravan@usc.edu (5451873903)
+
+"""
+
+import heapq
+import mmap
+import struct
+from array import array
+from collections import deque
+
+from graph import ACTION_OFFSETS, ACTIONS, Node, index_to_position, position_to_index
+from path_cache import get_graph_hash
+from vector import Vector
+
+
+# Magic bytes at the start of every distance field file.
+MAGIC = b"MZDF"
+
+# Version of the distance field file format.
+VERSION = 2
+
+# Marker written in native byte order, used to check that a distance field file was written on a compatible machine.
+BYTE_ORDER_MARK = 0x0102
+
+# Header layout: magic, version, byte order mark, source index, whether costs are unit costs, bounds of the maze and
+# hash of its contents.
+HEADER = struct.Struct("=4sHHIB3x3i16s")
+
+# Distance stored for nodes which cannot be reached.
+UNREACHABLE = (1 << (8 * array('I').itemsize)) - 1
+
+
+class DistanceField(object):
+    """
+    A class that holds the cost of the cheapest path from a source node to every node of a maze, along with the action
+    each node is reached with on that path.
+    """
+
+    def __init__(self, source, bounds, distances, parent_actions, unit_cost=False):
+        """
+        Method to initialize the distance field.
+
+        Args:
+            source(int): Index of the source node.
+            bounds(Vector): Bounds of the maze.
+            distances(array): Cost of the cheapest path to each cell, or UNREACHABLE if there is no path.
+            parent_actions(bytearray): Action each cell is reached with, or 0 for the source and unreached cells.
+            unit_cost(bool): Whether every action costs 1, like in BFS. Defaults to False.
+
+        """
+        self.source = source
+        self.bounds = bounds
+        self.distances = distances
+        self.parent_actions = parent_actions
+        self.unit_cost = unit_cost
+        self.offsets = tuple(None if offset is None else position_to_index(Vector(*offset), bounds)
+                             for offset in ACTION_OFFSETS)
+
+    def __repr__(self):
+        """
+        Method to represent a distance field as a string.
+
+        Returns:
+            (str): String representation of a distance field.
+
+        """
+        return "Source: {}, Bounds: {}, Reached: {}".format(
+            index_to_position(self.source, self.bounds), self.bounds,
+            sum(1 for distance in self.distances if distance != UNREACHABLE))
+
+    def get_cost(self, target):
+        """
+        Method to get the cost of the cheapest path from the source to a position.
+
+        Args:
+            target(Vector): Position to get the cost for.
+
+        Returns:
+            (cost): Cost of the cheapest path, or None if the position cannot be reached.
+
+        """
+        if not self._is_valid(target):
+            return None
+
+        distance = self.distances[position_to_index(target, self.bounds)]
+        return None if distance == UNREACHABLE else distance
+
+    def get_path(self, target):
+        """
+        Method to get the cheapest path from the source to a position, in time proportional to the length of the path.
+
+        Args:
+            target(Vector): Position to find a path to.
+
+        Returns:
+            (success, path, cost): Whether a path was found, path from the source node to the target node and the cost
+                of each point in the path.
+
+        """
+        cost = self.get_cost(target)
+        if cost is None:
+            return False, [], None
+
+        # Getting the path from the target node to the source by undoing the action each node was reached with.
+        path = []
+        index = position_to_index(target, self.bounds)
+        while index != self.source:
+            path.append(Node(index_to_position(index, self.bounds), cost=self.distances[index]))
+            index -= self.offsets[self.parent_actions[index]]
+        path.append(Node(index_to_position(index, self.bounds), cost=0))
+
+        path.reverse()
+        return True, path, cost
+
+    def _is_valid(self, position):
+        """
+        Method to check if a position is within the bounds of the maze.
+
+        Args:
+            position(Vector): Position to check.
+
+        Returns:
+            (is_valid): Whether the position is valid or not.
+
+        """
+        return 0 <= position.x < self.bounds.x and 0 <= position.y < self.bounds.y and 0 <= position.z < self.bounds.z
+
+
+def build_distance_field(graph, source, unit_cost=False):
+    """
+    Method to build the distance field of a source position, with Dijkstra's algorithm or with BFS if every action
+    costs 1.
+
+    Args:
+        graph(Graph): Graph to build the distance field in.
+        source(Vector): Position of the source node.
+        unit_cost(bool): Whether every action costs 1, like in BFS. Defaults to False.
+
+    Returns:
+        (field): Distance field of the source, or None if there is no node at the source position.
+
+    """
+    source_node = graph.get_index(source)
+    if source_node is None:
+        return None
+
+    bounds = graph.bounds
+    distances = array('I', [UNREACHABLE]) * graph.size
+    parent_actions = bytearray(graph.size)
+    field = DistanceField(source_node, bounds, distances, parent_actions, unit_cost)
+    actions = _get_offset_actions(field.offsets)
+
+    distances[source_node] = 0
+    if unit_cost:
+        queue = deque([source_node])
+        while len(queue) != 0:
+            node = queue.popleft()
+            node_cost = distances[node] + 1
+            for neighbour, _ in graph.get_successors(node):
+                if distances[neighbour] == UNREACHABLE:
+                    distances[neighbour] = node_cost
+                    parent_actions[neighbour] = _get_action(bounds, actions, node, neighbour)
+                    queue.append(neighbour)
+        return field
+
+    queue = [(0, source_node)]
+    while len(queue) != 0:
+        node_cost, node = heapq.heappop(queue)
+        if node_cost > distances[node]:
+            continue
+
+        for neighbour, cost in graph.get_successors(node):
+            neighbour_cost = node_cost + cost
+            if neighbour_cost < distances[neighbour]:
+                distances[neighbour] = neighbour_cost
+                parent_actions[neighbour] = _get_action(bounds, actions, node, neighbour)
+                heapq.heappush(queue, (neighbour_cost, neighbour))
+
+    return field
+
+
+def read_targets(f):
+    """
+    Method to read target positions from a file.
+
+    Args:
+        f(file): Text file to read the targets from, with one "x y z" position per line.
+
+    Returns:
+        (targets): Generator of the target positions.
+
+    """
+    for line_number, line in enumerate(f, 1):
+        values = line.split()
+        if len(values) == 0:
+            continue
+
+        if len(values) != 3:
+            raise ValueError("Invalid target on line {}: {}".format(line_number, line.strip()))
+
+        yield Vector(int(values[0]), int(values[1]), int(values[2]))
+
+
+def write_distance_field(file_path, field, graph):
+    """
+    Method to write a distance field to a file.
+
+    Args:
+        file_path(str): Path of the file to write.
+        field(DistanceField): Distance field to write.
+        graph(Graph): Graph of the maze the distance field belongs to.
+
+    """
+    bounds = field.bounds
+    with open(file_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, BYTE_ORDER_MARK, field.source, field.unit_cost,
+                            bounds.x, bounds.y, bounds.z, bytes.fromhex(get_graph_hash(graph))))
+        f.write(memoryview(field.distances).cast('B'))
+        f.write(field.parent_actions)
+
+
+def load_distance_field(file_path, graph, source=None, unit_cost=None):
+    """
+    Method to load a distance field. The distances and actions are read only views of the memory mapped file.
+
+    Args:
+        file_path(str): Path of the distance field file.
+        graph(Graph): Graph of the maze the distance field belongs to.
+        source(Vector): Position the distance field must have been built from. Defaults to not checking the source.
+        unit_cost(bool): Whether the distance field must have been built with every action costing 1, or with the
+            cost of each action. Defaults to not checking the costs.
+
+    Returns:
+        (field): Distance field of the maze.
+
+    """
+    with open(file_path, 'rb') as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    (magic, version, byte_order_mark, source_node, field_unit_cost, size_x, size_y, size_z,
+     graph_hash) = HEADER.unpack_from(buffer)
+    if magic != MAGIC:
+        raise ValueError("{} is not a distance field file.".format(file_path))
+    if version != VERSION:
+        raise ValueError("{} has distance field version {}, expected {}.".format(file_path, version, VERSION))
+    if byte_order_mark != BYTE_ORDER_MARK:
+        raise ValueError("{} was written on a machine with a different byte order.".format(file_path))
+    if (size_x, size_y, size_z) != (graph.bounds.x, graph.bounds.y, graph.bounds.z):
+        raise ValueError("{} belongs to a maze with different bounds.".format(file_path))
+    if graph_hash != bytes.fromhex(get_graph_hash(graph)):
+        raise ValueError("{} was built for different maze contents, and must be built again.".format(file_path))
+    if source is not None and source_node != position_to_index(source, graph.bounds):
+        raise ValueError("{} was built from {}, not from {}.".format(
+            file_path, index_to_position(source_node, graph.bounds), source))
+    if unit_cost is not None and bool(field_unit_cost) != unit_cost:
+        raise ValueError("{} was built with {} costs, not with {} costs.".format(
+            file_path, "unit" if field_unit_cost else "action", "unit" if unit_cost else "action"))
+
+    view = memoryview(buffer)
+    distances_end = HEADER.size + graph.size * array('I').itemsize
+    distances = view[HEADER.size:distances_end].cast('I')
+    parent_actions = view[distances_end:distances_end + graph.size]
+    return DistanceField(source_node, graph.bounds, distances, parent_actions, bool(field_unit_cost))
+
+
+def _get_offset_actions(offsets):
+    """
+    Method to map each index offset to the actions moving by that offset. In mazes at least 3 cells wide along the x
+    and y axes, every action has its own offset.
+
+    Args:
+        offsets(tuple): Index offset of each action.
+
+    Returns:
+        (actions): Map of offsets to the tuple of actions moving by the offset.
+
+    """
+    actions = {}
+    for action in ACTIONS:
+        actions[offsets[action]] = actions.get(offsets[action], ()) + (action,)
+
+    return actions
+
+
+def _get_action(bounds, actions, node, neighbour):
+    """
+    Method to get the action moving from a node to its neighbour.
+
+    Args:
+        bounds(Vector): Bounds of the maze.
+        actions(dict): Map of offsets to the actions moving by the offset.
+        node(int): Index of the node.
+        neighbour(int): Index of the neighbour.
+
+    Returns:
+        (action): Action moving from the node to the neighbour.
+
+    """
+    candidates = actions[neighbour - node]
+    if len(candidates) == 1:
+        return candidates[0]
+
+    # Narrow mazes have several actions with the same offset, so the positions tell them apart.
+    position = index_to_position(node, bounds)
+    neighbour_position = index_to_position(neighbour, bounds)
+    offset = (neighbour_position.x - position.x, neighbour_position.y - position.y, neighbour_position.z - position.z)
+    return ACTION_OFFSETS.index(offset)
@@ -0,0 +1,422 @@
+"""
+Maze Solver - External Memory Search
+
+A module implementing BFS and UCS for mazes too large to search in memory. The cell array is read through the grid
+graph, which for a compiled maze is a memory mapped view of the file, so only the pages the search touches are loaded.
+
+Each cell's search state is the action it was reached with, packed into 5 bits of a memory mapped file, instead of a
+cost and parent per cell. A cell is visited once its action is set, and the path is recovered by reading the actions
+back from the end node and undoing them.
+
+The frontier is a set of buckets of cells, one per cost, processed in order of cost. Buckets are held in memory as
+packed integers until the frontier goes past a memory budget, and are then sorted and spilled to temporary files. A
+bucket is expanded by merging its sorted files, which also drops the duplicate entries for a cell pushed more than once.
+
+Author: shravan@usc.edu (5451873903)
+
+"""
+
+import heapq
+import mmap
+import os
+import shutil
+import tempfile
+from array import array
+
+from bfs import bfs
+from graph import ACTIONS, Node, get_action_cost
+from grid_graph import PRESENT, GridGraph
+from instrumentation import phase, record_search
+from ucs import ucs
+
+
+# Default number of bytes of frontier entries held in memory before they are spilled to disk.
+MEMORY_BUDGET = 64 << 20
+
+# Number of bits of the parent action of each cell, and the mask of those bits.
+ACTION_BITS = 5
+ACTION_MASK = (1 << ACTION_BITS) - 1
+
+# Parent action code marking the start node, which has no parent. Codes 1 to 18 are actions and 0 is unvisited.
+START_ACTION = ACTION_MASK
+
+# Number of frontier entries read from a spilled bucket at a time.
+READ_CHUNK_SIZE = 1 << 13
+
+# Number of files a bucket is spilled to before they are merged into one, which bounds the number of files open at once.
+MERGE_FAN_IN = 64
+
+
+class ParentActions(object):
+    """
+    A class that implements a bit packed array of the action each cell was reached with, stored in a memory mapped
+    file so that it takes 5 bits of disk per cell rather than memory.
+    """
+
+    def __init__(self, file_path, size):
+        """
+        Method to initialize the array. The file is created empty, which marks every cell as unvisited.
+
+        Args:
+            file_path(str): Path of the file to store the array in.
+            size(int): Number of cells in the array.
+
+        """
+        # The extra byte lets every cell be read as two bytes, even the last one.
+        length = (size * ACTION_BITS + 7) // 8 + 1
+        with open(file_path, 'w+b') as f:
+            f.truncate(length)
+            self.buffer = mmap.mmap(f.fileno(), length)
+
+    def get(self, index):
+        """
+        Method to get the action a cell was reached with.
+
+        Args:
+            index(int): Index of the cell.
+
+        Returns:
+            (action): Action the cell was reached with, START_ACTION for the start node or 0 if it was not reached.
+
+        """
+        bit = index * ACTION_BITS
+        byte = bit >> 3
+        return ((self.buffer[byte] | self.buffer[byte + 1] << 8) >> (bit & 7)) & ACTION_MASK
+
+    def set(self, index, action):
+        """
+        Method to set the action a cell was reached with.
+
+        Args:
+            index(int): Index of the cell.
+            action(int): Action the cell was reached with, or START_ACTION for the start node.
+
+        """
+        bit = index * ACTION_BITS
+        byte = bit >> 3
+        shift = bit & 7
+        word = (self.buffer[byte] | self.buffer[byte + 1] << 8) & ~(ACTION_MASK << shift) | action << shift
+        self.buffer[byte] = word & 0xFF
+        self.buffer[byte + 1] = word >> 8
+
+    def close(self):
+        """
+        Method to unmap the file of the array.
+        """
+        self.buffer.close()
+
+
+class ExternalFrontier(object):
+    """
+    A class that implements a frontier of buckets of cells keyed by cost, which spills its buckets to sorted files in
+    a directory when it holds more entries than its memory budget. Each entry packs a cell index with the action the
+    cell was reached with.
+    """
+
+    def __init__(self, directory, memory_budget=MEMORY_BUDGET):
+        """
+        Method to initialize the frontier.
+
+        Args:
+            directory(str): Directory to write the spilled buckets to.
+            memory_budget(int): Number of bytes of entries to hold in memory. Defaults to MEMORY_BUDGET.
+
+        """
+        self.directory = directory
+        self.capacity = max(1, memory_budget // array('Q').itemsize)
+        self.buckets = {}
+        self.runs = {}
+        self.entries = 0
+        self.peak_entries = 0
+        self.spilled_runs = 0
+        self.spilled_entries = 0
+
+    def __len__(self):
+        """
+        Method to get the number of buckets in the frontier.
+
+        Returns:
+            (int): Number of buckets with entries in memory or on disk.
+
+        """
+        return len(self.buckets.keys() | self.runs.keys())
+
+    def push(self, cost, index, action):
+        """
+        Method to add a cell to the bucket of a cost, spilling the frontier to disk if it goes past its budget.
+
+        Args:
+            cost(int): Cost to reach the cell.
+            index(int): Index of the cell.
+            action(int): Action the cell was reached with.
+
+        """
+        bucket = self.buckets.get(cost)
+        if bucket is None:
+            bucket = self.buckets[cost] = array('Q')
+        bucket.append(index << ACTION_BITS | action)
+
+        self.entries += 1
+        if self.entries > self.peak_entries:
+            self.peak_entries = self.entries
+        if self.entries > self.capacity:
+            self.spill()
+
+    def spill(self):
+        """
+        Method to sort each bucket held in memory and write it to a file of its own.
+        """
+        for cost, bucket in self.buckets.items():
+            file_path = os.path.join(self.directory, "{}-{}.bin".format(cost, self.spilled_runs))
+            with open(file_path, 'wb') as f:
+                array('Q', sorted(bucket)).tofile(f)
+            runs = self.runs.setdefault(cost, [])
+            runs.append(file_path)
+            self.spilled_runs += 1
+            self.spilled_entries += len(bucket)
+
+            if len(runs) >= MERGE_FAN_IN:
+                merged_path = os.path.join(self.directory, "{}-{}.bin".format(cost, self.spilled_runs))
+                _write_run(merged_path, heapq.merge(*[_read_run(run) for run in runs]))
+                self.runs[cost] = [merged_path]
+                self.spilled_runs += 1
+
+        self.buckets = {}
+        self.entries = 0
+
+    def pop(self):
+        """
+        Method to remove the bucket with the lowest cost from the frontier.
+
+        Returns:
+            (cost, entries): Cost of the bucket and a sorted iterator over its entries, which deletes the bucket's files
+                once it is used up.
+
+        """
+        cost = min(self.buckets.keys() | self.runs.keys())
+        bucket = self.buckets.pop(cost, array('Q'))
+        self.entries -= len(bucket)
+
+        runs = self.runs.pop(cost, [])
+        if len(runs) == 0:
+            return cost, iter(sorted(bucket))
+
+        return cost, heapq.merge(sorted(bucket), *[_read_run(file_path) for file_path in runs])
+
+
+def external_bfs(graph, start, end, memory_budget=MEMORY_BUDGET, directory=None):
+    """
+    This is a function implementing the Breadth First Search algorithm for mazes larger than memory, given a start and
+    end node. A reference node based graph is already held in memory, so it is searched with the BFS algorithm.
+
+    Args:
+        graph(GridGraph): Graph to perform the pathfinding on.
+        start(Vector): Position to start the search at.
+        end(Vector): Position to find a path to in the graph.
+        memory_budget(int): Number of bytes of frontier entries to hold in memory. Defaults to MEMORY_BUDGET.
+        directory(str): Directory to write the temporary files to. Defaults to the system's temporary directory.
+
+    Returns:
+        (success, path, cost): Whether a path was found, path from the start node to the end node in the graph and the
+            cost of each point in the path.
+
+    """
+    if not isinstance(graph, GridGraph):
+        return bfs(graph, start, end)
+
+    return _external_search(graph, start, end, True, memory_budget, directory)
+
+
+def external_ucs(graph, start, end, memory_budget=MEMORY_BUDGET, directory=None):
+    """
+    This is a function implementing the Uniform Cost Search algorithm for mazes larger than memory, given a start and
+    end node. A reference node based graph is already held in memory, so it is searched with the UCS algorithm.
+
+    Args:
+        graph(GridGraph): Graph to perform the pathfinding on.
+        start(Vector): Position to start the search at.
+        end(Vector): Position to find a path to in the graph.
+        memory_budget(int): Number of bytes of frontier entries to hold in memory. Defaults to MEMORY_BUDGET.
+        directory(str): Directory to write the temporary files to. Defaults to the system's temporary directory.
+
+    Returns:
+        (success, path, cost): Whether a path was found, path from the start node to the end node in the graph and the
+            cost of each point in the path.
+
+    """
+    if not isinstance(graph, GridGraph):
+        return ucs(graph, start, end)
+
+    return _external_search(graph, start, end, False, memory_budget, directory)
+
+
+def _external_search(graph, start, end, unit_cost, memory_budget, directory):
+    """
+    Method to search a grid graph with a frontier spilled to disk and the parent actions in a memory mapped file.
+
+    Args:
+        graph(GridGraph): Graph to perform the pathfinding on.
+        start(Vector): Position to start the search at.
+        end(Vector): Position to find a path to in the graph.
+        unit_cost(bool): Whether every action costs 1, as for BFS, rather than the cost of the action.
+        memory_budget(int): Number of bytes of frontier entries to hold in memory.
+        directory(str): Directory to write the temporary files to, or None for the system's temporary directory.
+
+    Returns:
+        (success, path, cost): Whether a path was found, path from the start node to the end node in the graph and the
+            cost of each point in the path.
+
+    """
+    algorithm = "BFS-EXTERNAL" if unit_cost else "UCS-EXTERNAL"
+
+    # Get the start and end nodes from the graph.
+    start_node = graph.get_index(start)
+    end_node = graph.get_index(end)
+
+    if (start_node is None) or (end_node is None):
+        return False, [], None
+
+    cells = graph.cells
+    costs = _get_action_costs(unit_cost)
+    moves_cache = {}
+
+    work_directory = tempfile.mkdtemp(prefix="maze-", dir=directory)
+    parents = ParentActions(os.path.join(work_directory, "parents.bin"), graph.size)
+    try:
+        frontier = ExternalFrontier(work_directory, memory_budget)
+        frontier.push(0, start_node, START_ACTION)
+        expanded, pushed, lookups = 0, 1, 0
+        end_cost = None
+
+        # Expanding the buckets of the frontier in order of cost until the end node is reached.
+        while end_cost is None and len(frontier) != 0:
+            cost, entries = frontier.pop()
+            previous = None
+            for entry in entries:
+                node = entry >> ACTION_BITS
+
+                # Entries are sorted by cell, so the duplicates of a cell follow each other. A cell reached in an
+                # earlier bucket was reached more cheaply.
+                if node == previous or parents.get(node) != 0:
+                    continue
+                previous = node
+
+                parents.set(node, entry & ACTION_MASK)
+                if node == end_node:
+                    end_cost = cost
+                    break
+
+                mask = cells[node]
+                moves = moves_cache.get(mask)
+                if moves is None:
+                    moves = moves_cache[mask] = tuple((action, graph.offsets[action], costs[action])
+                                                      for action in ACTIONS if mask & (1 << action))
+
+                expanded += 1
+                lookups += len(moves)
+                for action, offset, action_cost in moves:
+                    neighbour = node + offset
+                    if cells[neighbour] & PRESENT and parents.get(neighbour) == 0:
+                        frontier.push(cost + action_cost, neighbour, action)
+                        pushed += 1
+
+        record_search(algorithm, expanded, pushed, frontier.peak_entries, lookups, spilled_runs=frontier.spilled_runs,
+                      spilled_entries=frontier.spilled_entries)
+
+        if end_cost is None:
+            return False, [], None
+
+        return True, _get_path(graph, parents, end_node, costs), end_cost
+    finally:
+        parents.close()
+        shutil.rmtree(work_directory, ignore_errors=True)
+
+
+def _get_action_costs(unit_cost):
+    """
+    Method to get the cost of each action, indexed by the action.
+
+    Args:
+        unit_cost(bool): Whether every action costs 1.
+
+    Returns:
+        (costs): Tuple of the cost of each action. Index 0 is unused.
+
+    """
+    return (None,) + tuple(1 if unit_cost else get_action_cost(action) for action in ACTIONS)
+
+
+def _get_path(graph, parents, end, costs):
+    """
+    Method to get the path to a node by undoing the actions recorded for each cell, from the end node back to the
+    start node.
+
+    Args:
+        graph(GridGraph): Graph the pathfinding was performed on.
+        parents(ParentActions): Actions each cell was reached with.
+        end(int): Index of the node to get the path to.
+        costs(tuple): Cost of each action, indexed by the action.
+
+    Returns:
+        (path): List of nodes from the start node to the end node, with the cost of reaching each node set.
+
+    """
+    with phase("reconstruct"):
+        nodes = [end]
+        actions = []
+        action = parents.get(end)
+        while action != START_ACTION:
+            actions.append(action)
+            nodes.append(nodes[-1] - graph.offsets[action])
+            action = parents.get(nodes[-1])
+
+        nodes.reverse()
+        actions.reverse()
+
+        path = [Node(graph.get_position(nodes[0]), cost=0)]
+        for node, action in zip(nodes[1:], actions):
+            path.append(Node(graph.get_position(node), cost=path[-1].cost + costs[action]))
+
+    return path
+
+
+def _write_run(file_path, entries):
+    """
+    Method to write sorted entries to the file of a spilled bucket in chunks.
+
+    Args:
+        file_path(str): Path of the file of the bucket.
+        entries(iterator): Sorted entries of the bucket.
+
+    """
+    with open(file_path, 'wb') as f:
+        chunk = array('Q')
+        for entry in entries:
+            chunk.append(entry)
+            if len(chunk) >= READ_CHUNK_SIZE:
+                chunk.tofile(f)
+                chunk = array('Q')
+        chunk.tofile(f)
+
+
+def _read_run(file_path):
+    """
+    Method to read the entries of a spilled bucket in chunks, deleting its file once they are all read.
+
+    Args:
+        file_path(str): Path of the file of the bucket.
+
+    Returns:
+        (entries): Generator of the sorted entries of the bucket.
+
+    """
+    itemsize = array('Q').itemsize
+    with open(file_path, 'rb') as f:
+        while True:
+            chunk = array('Q')
+            chunk.frombytes(f.read(READ_CHUNK_SIZE * itemsize))
+            if len(chunk) == 0:
+                break
+            yield from chunk
+
+    os.remove(file_path)
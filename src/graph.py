@@ -10,6 +10,22 @@ Author: shravan@usc.edu (5451873903)
 from vector import Vector
 
 
+# Position offsets for each action. Index 0 is unused so that the table can be indexed by the action directly.
+ACTION_OFFSETS = (
+    None,
+    (1, 0, 0), (-1, 0, 0), (0, 1, 0), (0, -1, 0), (0, 0, 1), (0, 0, -1),
+    (1, 1, 0), (1, -1, 0), (-1, 1, 0), (-1, -1, 0),
+    (1, 0, 1), (1, 0, -1), (-1, 0, 1), (-1, 0, -1),
+    (0, 1, 1), (0, 1, -1), (0, -1, 1), (0, -1, -1)
+)
+
+# List of all valid actions.
+ACTIONS = tuple(range(1, len(ACTION_OFFSETS)))
+
+# Map of each valid action to its position offset, so that looking up an invalid action raises a KeyError.
+NEIGHBOUR_OFFSETS = dict((action, ACTION_OFFSETS[action]) for action in ACTIONS)
+
+
 class Graph(object):
     """
     A module that implements a graph data structure which represents the maze to solve.
@@ -24,11 +40,14 @@ class Graph(object):
             bounds(Vector): Bounds of the graph. Defaults to None.
 
         """
+        # Nodes are keyed by the packed key of their position, which is cheaper to hash than the position itself.
         self.nodes = {}
         self.bounds = bounds
+        self.version = 0
+        self._predecessors = None
         if nodes is not None:
             for node in nodes:
-                self.nodes[str(node)] = node
+                self.nodes[node.position.key] = node
 
     def __repr__(self):
         """
@@ -39,18 +58,84 @@ class Graph(object):
 
         """
         base_str = "Bounds: {}, Nodes: {}"
-        points = [str(node) for node in self.nodes]
+        points = [str(node) for node in self.nodes.values()]
         return base_str.format(self.bounds, "  ".join(points))
 
+    @property
+    def size(self):
+        """
+        Method to get the number of cells spanned by the graph's bounds. Cell indices are always less than this.
+
+        Returns:
+            (size): Number of cells in the graph's bounds.
+
+        """
+        return self.bounds.x * self.bounds.y * self.bounds.z
+
     def add_node(self, node):
         """
-        Method to add a node to the graph.
+        Method to add a node to the graph, replacing any node at its position.
 
         Args:
             node(Node): Node to add to the graph.
 
         """
-        self.nodes[str(node)] = node
+        self.nodes[node.position.key] = node
+        self._edited()
+
+    def remove_node(self, position):
+        """
+        Method to remove the node at a position from the graph. Actions of other nodes leading to the position are
+        kept, but lead nowhere until a node is added there again.
+
+        Args:
+            position(Vector): Position of the node to remove.
+
+        """
+        if self.nodes.pop(position.key, None) is None:
+            raise ValueError("There is no node at {}.".format(position))
+        self._edited()
+
+    def add_actions(self, position, actions):
+        """
+        Method to add actions to the node at a position.
+
+        Args:
+            position(Vector): Position of the node.
+            actions(list): List of actions to add.
+
+        """
+        node = self.get_node(position)
+        if node is None:
+            raise ValueError("There is no node at {}.".format(position))
+
+        node.add_neighbours(actions)
+        self._edited()
+
+    def remove_actions(self, position, actions):
+        """
+        Method to remove actions from the node at a position.
+
+        Args:
+            position(Vector): Position of the node.
+            actions(list): List of actions to remove.
+
+        """
+        node = self.get_node(position)
+        if node is None:
+            raise ValueError("There is no node at {}.".format(position))
+
+        for action in actions:
+            node.neighbours.pop(action, None)
+        self._edited()
+
+    def _edited(self):
+        """
+        Method to record an edit of the graph. The version is bumped so that caches built for the graph can tell they
+        are out of date, and the reverse adjacency is dropped.
+        """
+        self.version += 1
+        self._predecessors = None
 
     def get_node(self, position):
         """
@@ -63,7 +148,7 @@ class Graph(object):
             (node): Node at the given position.
 
         """
-        return self.nodes.get(str(position)) if self.is_valid(position) else None
+        return self.nodes.get(position.key) if self.is_valid(position) else None
 
     def get_neighbours(self, node):
         """
@@ -98,6 +183,85 @@ class Graph(object):
 
         return neighbour_cost_map
 
+    def get_index(self, position):
+        """
+        Method to get the cell index of the node at a given position. The index is used by the pathfinding algorithms
+        to refer to nodes without holding on to the node objects.
+
+        Args:
+            position(Vector): Position to get the index for.
+
+        Returns:
+            (index): Index of the node at the position, or None if there is no node at the position.
+
+        """
+        if self.get_node(position) is None:
+            return None
+
+        return position_to_index(position, self.bounds)
+
+    def get_position(self, index):
+        """
+        Method to get the position of a cell index.
+
+        Args:
+            index(int): Index of the cell.
+
+        Returns:
+            (position): Position vector of the cell.
+
+        """
+        return index_to_position(index, self.bounds)
+
+    def get_successors(self, index):
+        """
+        Method to get the neighbours of the node at a cell index along with the cost of reaching them.
+
+        Args:
+            index(int): Index of the node to get the neighbours for.
+
+        Returns:
+            (successors): List of (neighbour index, cost) pairs for the node.
+
+        """
+        node = self.get_node(self.get_position(index))
+        if node is None:
+            return []
+
+        successors = []
+        nodes = self.nodes
+        bounds_x, bounds_y, bounds_z = self.bounds.x, self.bounds.y, self.bounds.z
+
+        # The checks of get_node, is_valid and position_to_index are inlined, as this runs for every expanded node.
+        for action, neighbour in node.neighbours.items():
+            x, y, z = neighbour.x, neighbour.y, neighbour.z
+            if 0 <= x < bounds_x and 0 <= y < bounds_y and 0 <= z < bounds_z and neighbour.key in nodes:
+                successors.append((x + bounds_x * (y + bounds_y * z), get_action_cost(action)))
+
+        return successors
+
+    def get_predecessors(self, index):
+        """
+        Method to get the nodes which have an action leading to the node at a cell index, along with the cost of that
+        action. The reverse adjacency is built for the whole graph the first time this is called.
+
+        Args:
+            index(int): Index of the node to get the predecessors for.
+
+        Returns:
+            (predecessors): List of (predecessor index, cost) pairs for the node.
+
+        """
+        if self._predecessors is None:
+            predecessors = {}
+            for node in self.nodes.values():
+                node_index = position_to_index(node.position, self.bounds)
+                for neighbour, cost in self.get_successors(node_index):
+                    predecessors.setdefault(neighbour, []).append((node_index, cost))
+            self._predecessors = predecessors
+
+        return self._predecessors.get(index, [])
+
     def is_valid(self, position):
         """
         Method to check if a position is valid (within the graph's bounds).
@@ -119,6 +283,8 @@ class Node(object):
     A class that implements a node in a graph.
     """
 
+    __slots__ = ("position", "neighbours", "cost", "heuristic", "parent", "visited")
+
     def __init__(self, position, actions=None, cost=0, heuristic=0, parent=None):
         """
         Method to initialize the graph.
@@ -188,7 +354,7 @@ class Node(object):
             (hash): Returns the hash of the node.
 
         """
-        return hash(str(self))
+        return hash(self.position)
 
     @property
     def total_cost(self):
@@ -225,28 +391,41 @@ def get_neighbour(position, action):
         (neighbour): Vector of the neighbour.
 
     """
-    action_map = {
-        1:  Vector(position.x + 1, position.y, position.z),
-        2:  Vector(position.x - 1, position.y, position.z),
-        3:  Vector(position.x, position.y + 1, position.z),
-        4:  Vector(position.x, position.y - 1, position.z),
-        5:  Vector(position.x, position.y, position.z + 1),
-        6:  Vector(position.x, position.y, position.z - 1),
-        7:  Vector(position.x + 1, position.y + 1, position.z),
-        8:  Vector(position.x + 1, position.y - 1, position.z),
-        9:  Vector(position.x - 1, position.y + 1, position.z),
-        10: Vector(position.x - 1, position.y - 1, position.z),
-        11: Vector(position.x + 1, position.y, position.z + 1),
-        12: Vector(position.x + 1, position.y, position.z - 1),
-        13: Vector(position.x - 1, position.y, position.z + 1),
-        14: Vector(position.x - 1, position.y, position.z - 1),
-        15: Vector(position.x, position.y + 1, position.z + 1),
-        16: Vector(position.x, position.y + 1, position.z - 1),
-        17: Vector(position.x, position.y - 1, position.z + 1),
-        18: Vector(position.x, position.y - 1, position.z - 1)
-    }
-
-    return action_map[action]
+    dx, dy, dz = NEIGHBOUR_OFFSETS[action]
+    return Vector(position.x + dx, position.y + dy, position.z + dz)
+
+
+def position_to_index(position, bounds):
+    """
+    Method to get the index of a position in a flat array of cells spanning the bounds. The index is laid out as
+    x + y * X + z * X * Y.
+
+    Args:
+        position(Vector): Position to get the index for.
+        bounds(Vector): Bounds of the graph.
+
+    Returns:
+        (index): Index of the position.
+
+    """
+    return position.x + bounds.x * (position.y + bounds.y * position.z)
+
+
+def index_to_position(index, bounds):
+    """
+    Method to get the position of an index in a flat array of cells spanning the bounds.
+
+    Args:
+        index(int): Index to get the position for.
+        bounds(Vector): Bounds of the graph.
+
+    Returns:
+        (position): Position vector of the index.
+
+    """
+    index, x = divmod(index, bounds.x)
+    z, y = divmod(index, bounds.y)
+    return Vector(x, y, z)
 
 
 def get_action_cost(action):
@@ -0,0 +1,301 @@
+"""
+Maze Solver - Grid Graph
+
+This module implements a compact graph data structure used to represent large mazes. Cells are stored in a flat array
+indexed by x + y * X + z * X * Y, with a single integer bitmask of actions per cell.
+
+Author: shravan@usc.edu (5451873903)
+
+"""
+
+from array import array
+
+from graph import ACTION_OFFSETS, ACTIONS, Node, get_action_cost, index_to_position, position_to_index
+from vector import Vector
+
+
+# Bit marking that a cell holds a node. Actions are numbered from 1, so bit 0 is free to use for this.
+PRESENT = 1
+
+
+class GridGraph(object):
+    """
+    A class that implements a compact graph data structure which represents the maze to solve. It exposes the same
+    index based interface as the Graph class, so it can be used by all of the pathfinding algorithms.
+    """
+
+    def __init__(self, bounds, cells=None):
+        """
+        Method to initialize the grid graph.
+
+        Args:
+            bounds(Vector): Bounds of the graph.
+            cells(array): Action masks of each cell, such as a view of a compiled maze. Defaults to an empty graph.
+
+        """
+        self.bounds = bounds
+        self.size = bounds.x * bounds.y * bounds.z
+        self.cells = array('I', bytes(array('I').itemsize * self.size)) if cells is None else cells
+        self.version = 0
+        self.offsets = tuple(None if offset is None else position_to_index(Vector(*offset), bounds)
+                             for offset in ACTION_OFFSETS)
+        self._successor_cache = {}
+        self._valid_mask_cache = {}
+
+    def __repr__(self):
+        """
+        Method to represent a grid graph as a string.
+
+        Returns:
+            (str): String representation of a grid graph.
+
+        """
+        return "Bounds: {}, Nodes: {}".format(self.bounds, len(self))
+
+    def __len__(self):
+        """
+        Method to get the number of nodes in the grid graph.
+
+        Returns:
+            (int): Number of nodes in the graph.
+
+        """
+        return sum(1 for mask in self.cells if mask & PRESENT)
+
+    def add_node(self, position, actions=None):
+        """
+        Method to add a node to the grid graph. Actions leading out of the bounds of the graph are dropped, as they
+        can never lead to a node.
+
+        Args:
+            position(Vector): Position of the node to add.
+            actions(list): List of actions we can take at the node. Defaults to None.
+
+        """
+        mask = PRESENT
+        if actions is not None:
+            for action in actions:
+                mask |= 1 << action
+
+        mask &= self.get_valid_mask(position.x, position.y, position.z)
+        self.cells[position_to_index(position, self.bounds)] = mask
+        self.version += 1
+
+    def remove_node(self, position):
+        """
+        Method to remove the node at a position from the grid graph. Actions of other nodes leading to the position
+        are kept, but lead nowhere until a node is added there again.
+
+        Args:
+            position(Vector): Position of the node to remove.
+
+        """
+        self.cells[self._get_node_index(position)] = 0
+        self.version += 1
+
+    def add_actions(self, position, actions):
+        """
+        Method to add actions to the node at a position. Actions leading out of the bounds of the graph are dropped.
+
+        Args:
+            position(Vector): Position of the node.
+            actions(list): List of actions to add.
+
+        """
+        index = self._get_node_index(position)
+
+        mask = self.cells[index]
+        for action in actions:
+            mask |= 1 << action
+
+        self.cells[index] = mask & self.get_valid_mask(position.x, position.y, position.z)
+        self.version += 1
+
+    def remove_actions(self, position, actions):
+        """
+        Method to remove actions from the node at a position.
+
+        Args:
+            position(Vector): Position of the node.
+            actions(list): List of actions to remove.
+
+        """
+        index = self._get_node_index(position)
+
+        mask = self.cells[index]
+        for action in actions:
+            mask &= ~(1 << action)
+
+        self.cells[index] = mask
+        self.version += 1
+
+    def get_valid_mask(self, x, y, z):
+        """
+        Method to get the mask of actions that stay within the bounds of the graph from a cell. Only cells on the
+        faces of the bounds have actions masked out.
+
+        Args:
+            x(int): X co-ordinate of the cell.
+            y(int): Y co-ordinate of the cell.
+            z(int): Z co-ordinate of the cell.
+
+        Returns:
+            (mask): Mask of valid actions at the cell, including the presence bit.
+
+        """
+        bounds = self.bounds
+        key = (x == 0, x == bounds.x - 1, y == 0, y == bounds.y - 1, z == 0, z == bounds.z - 1)
+
+        mask = self._valid_mask_cache.get(key)
+        if mask is None:
+            mask = PRESENT
+            for action in ACTIONS:
+                dx, dy, dz = ACTION_OFFSETS[action]
+                if ((dx != -1 or not key[0]) and (dx != 1 or not key[1]) and
+                        (dy != -1 or not key[2]) and (dy != 1 or not key[3]) and
+                        (dz != -1 or not key[4]) and (dz != 1 or not key[5])):
+                    mask |= 1 << action
+            self._valid_mask_cache[key] = mask
+
+        return mask
+
+    def get_node(self, position):
+        """
+        Method to get the node for a given point. The node is built from the cell data, so this is only meant for
+        inspecting the graph and not for use in pathfinding.
+
+        Args:
+            position(Vector): Position at which we need to get the node.
+
+        Returns:
+            (node): Node at the given position.
+
+        """
+        index = self.get_index(position)
+        if index is None:
+            return None
+
+        return Node(position, self.get_actions(index))
+
+    def get_actions(self, index):
+        """
+        Method to get the actions we can take at a cell.
+
+        Args:
+            index(int): Index of the cell.
+
+        Returns:
+            (actions): List of actions we can take at the cell.
+
+        """
+        mask = self.cells[index]
+        return [action for action in ACTIONS if mask & (1 << action)]
+
+    def get_index(self, position):
+        """
+        Method to get the cell index of the node at a given position.
+
+        Args:
+            position(Vector): Position to get the index for.
+
+        Returns:
+            (index): Index of the node at the position, or None if there is no node at the position.
+
+        """
+        if not self.is_valid(position):
+            return None
+
+        index = position_to_index(position, self.bounds)
+        return index if self.cells[index] & PRESENT else None
+
+    def get_position(self, index):
+        """
+        Method to get the position of a cell index.
+
+        Args:
+            index(int): Index of the cell.
+
+        Returns:
+            (position): Position vector of the cell.
+
+        """
+        return index_to_position(index, self.bounds)
+
+    def get_successors(self, index):
+        """
+        Method to get the neighbours of the node at a cell index along with the cost of reaching them.
+
+        Args:
+            index(int): Index of the node to get the neighbours for.
+
+        Returns:
+            (successors): List of (neighbour index, cost) pairs for the node.
+
+        """
+        cells = self.cells
+        mask = cells[index]
+
+        # The offsets and costs only depend on the action mask, and mazes only use a handful of distinct masks.
+        moves = self._successor_cache.get(mask)
+        if moves is None:
+            moves = tuple((self.offsets[action], get_action_cost(action)) for action in ACTIONS
+                          if mask & (1 << action))
+            self._successor_cache[mask] = moves
+
+        return [(index + offset, cost) for offset, cost in moves if cells[index + offset] & PRESENT]
+
+    def get_predecessors(self, index):
+        """
+        Method to get the nodes which have an action leading to the node at a cell index, along with the cost of that
+        action. Actions are not guaranteed to be reversible, so these can differ from the successors.
+
+        Args:
+            index(int): Index of the node to get the predecessors for.
+
+        Returns:
+            (predecessors): List of (predecessor index, cost) pairs for the node.
+
+        """
+        cells = self.cells
+        predecessors = []
+
+        for action in ACTIONS:
+            predecessor = index - self.offsets[action]
+            # A cell can only have an action if it stays within the bounds, so a matching action means the predecessor
+            # really is adjacent and the index did not wrap around a face of the bounds.
+            if 0 <= predecessor < self.size and cells[predecessor] & (1 << action):
+                predecessors.append((predecessor, get_action_cost(action)))
+
+        return predecessors
+
+    def is_valid(self, position):
+        """
+        Method to check if a position is valid (within the graph's bounds).
+
+        Args:
+            position(Vector): Position to check.
+
+        Returns:
+            (is_valid): Whether the position is valid or not.
+
+        """
+        return ((position.x >= 0 and position.x < self.bounds.x) and
+                (position.y >= 0 and position.y < self.bounds.y) and
+                (position.z >= 0 and position.z < self.bounds.z))
+
+    def _get_node_index(self, position):
+        """
+        Method to get the cell index of the node at a position, for editing the node.
+
+        Args:
+            position(Vector): Position of the node.
+
+        Returns:
+            (index): Index of the node at the position.
+
+        """
+        index = self.get_index(position)
+        if index is None:
+            raise ValueError("There is no node at {}.".format(position))
+
+        return index
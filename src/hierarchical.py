@@ -0,0 +1,416 @@
+"""
+Maze Solver - Hierarchical Pathfinding (HPA*) Algorithm
+
+A module implementing hierarchical pathfinding to solve large mazes. The bounds of the maze are split into cubic
+clusters. The nodes at the ends of actions crossing between clusters are entrances, and the cost of the cheapest path
+inside a cluster between each pair of its entrances is computed once per maze. A query searches this small abstract
+graph of entrances, and then refines each step of the abstract path with a search confined to a single cluster.
+
+The abstraction is either exact, where every node with an action crossing between clusters is an entrance and the
+paths found are optimal, or fast, where each run of neighbouring crossing actions of the same kind only keeps its
+middle action, which gives far fewer entrances and near optimal paths.
+
+Author: shravan@usc.edu (5451873903)
+
+"""
+
+import heapq
+import threading
+import weakref
+
+from a_star import a_star
+from grid_graph import PRESENT, GridGraph
+from graph import Node
+from instrumentation import record_search
+from vector import Vector, grid_distance
+
+
+# Default length of the sides of a cluster.
+CLUSTER_SIZE = 8
+
+# Per graph cache of the abstractions built for it, keyed by cluster size and exactness.
+_abstraction_cache = weakref.WeakKeyDictionary()
+_abstraction_lock = threading.Lock()
+
+
+class Abstraction(object):
+    """
+    A class that holds the abstract graph of the entrances of a maze's clusters.
+    """
+
+    def __init__(self, graph, cluster_size, exact):
+        """
+        Method to initialize the abstraction, without any entrances.
+
+        Args:
+            graph(GridGraph): Graph of the maze.
+            cluster_size(int): Length of the sides of a cluster.
+            exact(bool): Whether every crossing action is kept, so that paths found are optimal.
+
+        """
+        # The abstraction is cached against the graph, so it must not keep the graph alive.
+        self.graph = weakref.proxy(graph)
+        self.cluster_size = cluster_size
+        self.exact = exact
+        self.version = graph.version
+        self.clusters = Vector(-(-graph.bounds.x // cluster_size), -(-graph.bounds.y // cluster_size),
+                               -(-graph.bounds.z // cluster_size))
+        self.entrances = {}
+        self.edges = {}
+
+    def __repr__(self):
+        """
+        Method to represent an abstraction as a string.
+
+        Returns:
+            (str): String representation of an abstraction.
+
+        """
+        return "Clusters: {}, Entrances: {}, Edges: {}".format(
+            self.clusters, sum(len(entrances) for entrances in self.entrances.values()),
+            sum(len(edges) for edges in self.edges.values()))
+
+    def get_cluster(self, index):
+        """
+        Method to get the cluster a cell is in.
+
+        Args:
+            index(int): Index of the cell.
+
+        Returns:
+            (cluster): Index of the cluster.
+
+        """
+        bounds = self.graph.bounds
+        rest, x = divmod(index, bounds.x)
+        z, y = divmod(rest, bounds.y)
+        size = self.cluster_size
+        return x // size + self.clusters.x * (y // size + self.clusters.y * (z // size))
+
+    def search_cluster(self, source, target=None, reverse=False, counters=None):
+        """
+        Method to find the cheapest paths from a node to the other nodes of its cluster, using Dijkstra's algorithm
+        confined to the cluster.
+
+        Args:
+            source(int): Index of the node to search from.
+            target(int): Index of a node to stop the search at. Defaults to searching the whole cluster.
+            reverse(bool): Whether to find the cheapest paths to the source node instead. Defaults to False.
+            counters(list): Expanded, pushed, peak frontier and lookup counters of the query to add the search's
+                counters to. Defaults to None.
+
+        Returns:
+            (costs, parents): Maps of the nodes reached to the cost of reaching them and to their parent node.
+
+        """
+        get_neighbours = self.graph.get_predecessors if reverse else self.graph.get_successors
+        cluster = self.get_cluster(source)
+        costs = {source: 0}
+        parents = {source: None}
+
+        queue = [(0, source)]
+        expanded, pushed, peak_frontier, lookups = 0, 1, 1, 0
+        while len(queue) != 0:
+            cost, node = heapq.heappop(queue)
+            if node == target:
+                break
+            if cost > costs[node]:
+                continue
+
+            neighbours = get_neighbours(node)
+            expanded += 1
+            lookups += len(neighbours)
+
+            for neighbour, neighbour_cost in neighbours:
+                neighbour_cost += cost
+                if neighbour_cost < costs.get(neighbour, neighbour_cost + 1) and self.get_cluster(neighbour) == cluster:
+                    costs[neighbour] = neighbour_cost
+                    parents[neighbour] = node
+                    heapq.heappush(queue, (neighbour_cost, neighbour))
+                    pushed += 1
+
+            if len(queue) > peak_frontier:
+                peak_frontier = len(queue)
+
+        if counters is not None:
+            _add_counters(counters, expanded, pushed, peak_frontier, lookups)
+
+        return costs, parents
+
+
+def build_abstraction(graph, cluster_size=CLUSTER_SIZE, exact=False):
+    """
+    Method to build the abstract graph of the entrances of a maze's clusters.
+
+    Args:
+        graph(GridGraph): Graph of the maze.
+        cluster_size(int): Length of the sides of a cluster. Defaults to CLUSTER_SIZE.
+        exact(bool): Whether to keep every crossing action, so that paths found are optimal. Defaults to False.
+
+    Returns:
+        (abstraction): Abstraction of the maze.
+
+    """
+    abstraction = Abstraction(graph, cluster_size, exact)
+
+    # Gather the actions crossing between clusters, grouped by the clusters they join and the move they make.
+    groups = {}
+    for node in range(graph.size):
+        if not graph.cells[node] & PRESENT:
+            continue
+
+        cluster = abstraction.get_cluster(node)
+        for neighbour, cost in graph.get_successors(node):
+            neighbour_cluster = abstraction.get_cluster(neighbour)
+            if neighbour_cluster != cluster:
+                groups.setdefault((cluster, neighbour_cluster, neighbour - node), {})[node] = cost
+
+    crossings = []
+    for (_, _, offset), sources in groups.items():
+        if exact:
+            crossings.extend((node, node + offset, cost) for node, cost in sources.items())
+        else:
+            crossings.extend((node, node + offset, sources[node]) for node in _get_run_middles(graph, sources))
+
+    for node, neighbour, cost in crossings:
+        abstraction.entrances.setdefault(abstraction.get_cluster(node), set()).add(node)
+        abstraction.entrances.setdefault(abstraction.get_cluster(neighbour), set()).add(neighbour)
+        abstraction.edges.setdefault(node, []).append((neighbour, cost))
+
+    # Connect the entrances of each cluster with the cost of the cheapest path between them inside the cluster.
+    for entrances in abstraction.entrances.values():
+        for entrance in entrances:
+            costs, _ = abstraction.search_cluster(entrance)
+            for other in entrances:
+                if other != entrance and other in costs:
+                    abstraction.edges.setdefault(entrance, []).append((other, costs[other]))
+
+    return abstraction
+
+
+def get_abstraction(graph, cluster_size=CLUSTER_SIZE, exact=False):
+    """
+    Method to get the abstraction of a maze, building it the first time it is needed. Abstractions are cached for each
+    graph, so every later query reuses them until the graph is edited.
+
+    Args:
+        graph(GridGraph): Graph of the maze.
+        cluster_size(int): Length of the sides of a cluster. Defaults to CLUSTER_SIZE.
+        exact(bool): Whether to keep every crossing action, so that paths found are optimal. Defaults to False.
+
+    Returns:
+        (abstraction): Abstraction of the maze.
+
+    """
+    with _abstraction_lock:
+        abstractions = _abstraction_cache.get(graph)
+        if abstractions is None:
+            abstractions = _abstraction_cache[graph] = {}
+
+        abstraction = abstractions.get((cluster_size, exact))
+        if abstraction is None or abstraction.version != graph.version:
+            abstraction = abstractions[(cluster_size, exact)] = build_abstraction(graph, cluster_size, exact)
+
+    return abstraction
+
+
+def hpa_star(graph, start, end, cluster_size=CLUSTER_SIZE, exact=False):
+    """
+    This is a function implementing hierarchical pathfinding to find paths in a graph, given a start and end node.
+    Paths are optimal if the abstraction is exact. Otherwise they are near optimal, and the whole graph is searched with
+    A* if the abstraction misses every path. Only grid graphs are supported, other graphs are searched with A*.
+
+    Args:
+        graph(GridGraph): Graph to perform the pathfinding on.
+        start(Vector): Position to start the search at.
+        end(Vector): Position to find a path to in the graph.
+        cluster_size(int): Length of the sides of a cluster. Defaults to CLUSTER_SIZE.
+        exact(bool): Whether to use an exact abstraction. Defaults to False.
+
+    Returns:
+        (success, path, cost): Whether a path was found, path from the start node to the end node in the graph and the
+            cost of each point in the path.
+
+    """
+    if not isinstance(graph, GridGraph):
+        return a_star(graph, start, end)
+
+    # Get the start and end nodes from the graph.
+    start_node = graph.get_index(start)
+    end_node = graph.get_index(end)
+
+    if (start_node is None) or (end_node is None):
+        return False, [], None
+
+    algorithm = "HPA*-EXACT" if exact else "HPA*"
+    abstraction = get_abstraction(graph, cluster_size, exact)
+
+    # Counters of every search the query runs. The abstraction is shared between queries, so building it is not counted.
+    counters = [0, 0, 0, 0]
+
+    # Connect the start and end nodes to the entrances of their clusters for this query only.
+    start_costs, _ = abstraction.search_cluster(start_node, counters=counters)
+    end_costs, _ = abstraction.search_cluster(end_node, reverse=True, counters=counters)
+    start_edges = [(entrance, start_costs[entrance])
+                   for entrance in abstraction.entrances.get(abstraction.get_cluster(start_node), ())
+                   if entrance in start_costs]
+    if end_node in start_costs:
+        start_edges.append((end_node, start_costs[end_node]))
+    end_edges = dict((entrance, end_costs[entrance])
+                     for entrance in abstraction.entrances.get(abstraction.get_cluster(end_node), ())
+                     if entrance in end_costs)
+
+    abstract_path = _search_abstraction(abstraction, start_node, end_node, start_edges, end_edges, counters)
+    if abstract_path is None:
+        record_search(algorithm, *counters, abstract_path=0)
+        return (False, [], None) if exact else a_star(graph, start, end)
+
+    # Refine each step of the abstract path. Steps between clusters are single actions, and steps inside a cluster are
+    # found again with a search confined to the cluster.
+    nodes, costs = [start_node], [0]
+    for node, next_node in zip(abstract_path, abstract_path[1:]):
+        if abstraction.get_cluster(node) != abstraction.get_cluster(next_node):
+            step_cost = dict(graph.get_successors(node))[next_node]
+            nodes.append(next_node)
+            costs.append(costs[-1] + step_cost)
+            continue
+
+        step_costs, parents = abstraction.search_cluster(node, next_node, counters=counters)
+        segment = []
+        index = next_node
+        while index != node:
+            segment.append(index)
+            index = parents[index]
+
+        base_cost = costs[-1]
+        for index in reversed(segment):
+            nodes.append(index)
+            costs.append(base_cost + step_costs[index])
+
+    record_search(algorithm, *counters, abstract_path=len(abstract_path))
+    return True, [Node(graph.get_position(index), cost=cost) for index, cost in zip(nodes, costs)], costs[-1]
+
+
+def _get_run_middles(graph, nodes):
+    """
+    Method to split a set of nodes into runs of nodes next to each other along the axes, and get the middle node of
+    each run.
+
+    Args:
+        graph(GridGraph): Graph the nodes are in.
+        nodes(iterable): Indices of the nodes.
+
+    Returns:
+        (middles): List of the middle node of each run.
+
+    """
+    bounds = graph.bounds
+    axis_offsets = (1, bounds.x, bounds.x * bounds.y)
+    remaining = set(nodes)
+
+    middles = []
+    for node in sorted(remaining):
+        if node not in remaining:
+            continue
+
+        # Flood fill the run, only stepping to nodes which really are next to each other in the grid.
+        run = [node]
+        remaining.discard(node)
+        for current in run:
+            position = graph.get_position(current)
+            for neighbour in (current + offset for offset in axis_offsets + tuple(-offset for offset in axis_offsets)):
+                if neighbour in remaining and grid_distance(position, graph.get_position(neighbour)) == 10:
+                    remaining.discard(neighbour)
+                    run.append(neighbour)
+
+        run.sort()
+        middles.append(run[len(run) // 2])
+
+    return middles
+
+
+def _search_abstraction(abstraction, start_node, end_node, start_edges, end_edges, counters):
+    """
+    Method to find the cheapest path through the abstract graph, using A* with the cost of the cheapest path in a maze
+    without walls as the heuristic.
+
+    Args:
+        abstraction(Abstraction): Abstraction of the maze.
+        start_node(int): Index of the start node.
+        end_node(int): Index of the end node.
+        start_edges(list): Edges from the start node, as (node, cost) pairs.
+        end_edges(dict): Map of the nodes with an edge to the end node to the cost of the edge.
+        counters(list): Expanded, pushed, peak frontier and lookup counters of the query to add the search's counters
+            to.
+
+    Returns:
+        (path): List of the abstract nodes from the start node to the end node, or None if there is no path.
+
+    """
+    graph = abstraction.graph
+    end = graph.get_position(end_node)
+    costs = {start_node: 0}
+    parents = {start_node: None}
+
+    queue = [(grid_distance(graph.get_position(start_node), end), 0, start_node)]
+    expanded, pushed, peak_frontier, lookups = 0, 1, 1, 0
+    while len(queue) != 0:
+        _, cost, node = heapq.heappop(queue)
+        if node == end_node:
+            break
+        if cost > costs[node]:
+            continue
+
+        edges = abstraction.edges.get(node, [])
+        if node == start_node:
+            edges = edges + start_edges
+        if node in end_edges:
+            edges = edges + [(end_node, end_edges[node])]
+
+        expanded += 1
+        lookups += len(edges)
+
+        for neighbour, edge_cost in edges:
+            neighbour_cost = cost + edge_cost
+            if neighbour_cost < costs.get(neighbour, neighbour_cost + 1):
+                costs[neighbour] = neighbour_cost
+                parents[neighbour] = node
+                heuristic = grid_distance(graph.get_position(neighbour), end)
+                heapq.heappush(queue, (neighbour_cost + heuristic, neighbour_cost, neighbour))
+                pushed += 1
+
+        if len(queue) > peak_frontier:
+            peak_frontier = len(queue)
+    else:
+        _add_counters(counters, expanded, pushed, peak_frontier, lookups)
+        return None
+
+    _add_counters(counters, expanded, pushed, peak_frontier, lookups)
+
+    path = []
+    node = end_node
+    while node is not None:
+        path.append(node)
+        node = parents[node]
+
+    path.reverse()
+    return path
+
+
+def _add_counters(counters, expanded, pushed, peak_frontier, lookups):
+    """
+    Method to add the counters of one of the searches run by a query to the query's counters. The peak frontier of the
+    query is the largest of its searches, as they do not run at the same time.
+
+    Args:
+        counters(list): Expanded, pushed, peak frontier and lookup counters of the query.
+        expanded(int): Number of nodes expanded by the search.
+        pushed(int): Number of nodes pushed onto the queue by the search.
+        peak_frontier(int): Largest number of entries in the queue of the search at once.
+        lookups(int): Number of neighbours looked up by the search.
+
+    """
+    counters[0] += expanded
+    counters[1] += pushed
+    counters[2] = max(counters[2], peak_frontier)
+    counters[3] += lookups
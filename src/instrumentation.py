@@ -0,0 +1,178 @@
+"""
+Maze Solver - Instrumentation
+
+This module implements the counters and timers used to tell why a query is slow. The search algorithms count the nodes
+they expand and push, the peak size of their frontier and the neighbours they look up in plain local variables, and
+report them once at the end of each search. Phases of solving a maze are timed as a whole. Reports are only gathered
+while a collector is active in the calling thread or a profiling hook is registered, and are dropped otherwise, so the
+instrumentation costs almost nothing when it is disabled.
+
+Profiling hooks are functions taking an event name and a map of its measurements. The events are "search", with the
+algorithm and its counters, and "phase", with the name of the phase and the seconds it took.
+
+Author: shravan@usc.edu (5451873903)
+
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+
+# Registered profiling hooks, called for every event in any thread.
+_hooks = []
+
+# Per-thread active collector.
+_local = threading.local()
+
+
+class SearchStats(object):
+    """
+    A class that gathers the search counters and phase timings reported while it is active.
+    """
+
+    def __init__(self):
+        """
+        Method to initialize the statistics, without any measurements.
+        """
+        self.searches = []
+        self.phases = {}
+
+    def __repr__(self):
+        """
+        Method to represent the statistics as a string.
+
+        Returns:
+            (str): String representation of the statistics.
+
+        """
+        return "Searches: {}, Phases: {}".format(self.searches, self.phases)
+
+    def as_dict(self):
+        """
+        Method to get the statistics as a map which can be written as JSON.
+
+        Returns:
+            (stats): Map of the search counters and phase timings.
+
+        """
+        return {"searches": list(self.searches), "phases": dict(self.phases)}
+
+    def record(self, event, data):
+        """
+        Method to record an event.
+
+        Args:
+            event(str): Name of the event, either "search" or "phase".
+            data(dict): Measurements of the event.
+
+        """
+        if event == "search":
+            self.searches.append(data)
+        elif event == "phase":
+            self.phases[data["name"]] = self.phases.get(data["name"], 0.0) + data["seconds"]
+
+
+def add_hook(hook):
+    """
+    Method to register a profiling hook.
+
+    Args:
+        hook(function): Function taking an event name and a map of its measurements.
+
+    """
+    _hooks.append(hook)
+
+
+def remove_hook(hook):
+    """
+    Method to unregister a profiling hook.
+
+    Args:
+        hook(function): Hook to unregister.
+
+    """
+    _hooks.remove(hook)
+
+
+@contextmanager
+def collect():
+    """
+    Method to gather the statistics of everything run in the calling thread while the context is active.
+
+    Returns:
+        (stats): Context manager giving the SearchStats the measurements are gathered in.
+
+    """
+    previous = getattr(_local, "collector", None)
+    stats = _local.collector = SearchStats()
+    try:
+        yield stats
+    finally:
+        _local.collector = previous
+
+
+def is_enabled():
+    """
+    Method to check whether reports are gathered in the calling thread.
+
+    Returns:
+        (bool): Whether a collector is active or a hook is registered.
+
+    """
+    return len(_hooks) != 0 or getattr(_local, "collector", None) is not None
+
+
+def record_search(algorithm, expanded, pushed, peak_frontier, lookups, **details):
+    """
+    Method to report the counters of a finished search.
+
+    Args:
+        algorithm(str): Name of the algorithm.
+        expanded(int): Number of nodes expanded.
+        pushed(int): Number of nodes pushed onto the queue or frontier, including the start node.
+        peak_frontier(int): Largest number of entries in the queue or frontier at once.
+        lookups(int): Number of neighbours looked up.
+        details(dict): Further measurements particular to the algorithm.
+
+    """
+    if is_enabled():
+        _record("search", dict(details, algorithm=algorithm, expanded=expanded, pushed=pushed,
+                               peak_frontier=peak_frontier, lookups=lookups))
+
+
+@contextmanager
+def phase(name):
+    """
+    Method to time a phase of solving a maze. Phases with the same name are added up.
+
+    Args:
+        name(str): Name of the phase.
+
+    Returns:
+        (context): Context manager timing the code run inside it.
+
+    """
+    start_time = time.perf_counter()
+    try:
+        yield
+    finally:
+        if is_enabled():
+            _record("phase", {"name": name, "seconds": time.perf_counter() - start_time})
+
+
+def _record(event, data):
+    """
+    Method to pass an event to the active collector and the profiling hooks.
+
+    Args:
+        event(str): Name of the event.
+        data(dict): Measurements of the event.
+
+    """
+    collector = getattr(_local, "collector", None)
+    if collector is not None:
+        collector.record(event, data)
+
+    for hook in list(_hooks):
+        hook(event, data)
@@ -0,0 +1,375 @@
+"""
+Maze Solver - Jump Point Search (JPS) Algorithm
+
+A module implementing Jump Point Search for the 18-connected 3D action set to solve mazes. JPS is A* which only follows
+one canonical path out of the many symmetric optimal paths between two cells, and which jumps over cells whose only
+canonical successor continues in the same direction instead of adding them to the priority queue.
+
+Paths are ordered by cost, then by number of moves, then lexicographically by the rank of their moves, where planar
+diagonal moves rank before axial moves. A successor of a node is pruned when a better path in this order leads from the
+node's parent to the successor without passing through the node, within the 3x3x3 block around the node. Successors
+that are only kept because cells in the block are missing are the forced neighbours. The rule assumes that every node
+in the block can take every action leading to another node, so nodes with any irregular node in their block are
+expanded like in A*, without pruning. The search is guided by the cost of the cheapest path in a maze without walls,
+which is a much tighter bound than the straight line distance.
+
+Author: shravan@usc.edu (5451873903)
+
+"""
+
+import heapq
+import weakref
+from array import array
+
+from a_star import a_star
+from graph import ACTION_OFFSETS, ACTIONS, get_action_cost
+from grid_graph import PRESENT, GridGraph
+from instrumentation import record_search
+from search_state import get_search_state
+from utils import get_path
+from vector import grid_distance
+
+
+# Rank of each action when ordering paths. Planar diagonal moves rank before axial moves.
+ACTION_RANKS = tuple(None if action == 0 else (action - 7 if action >= 7 else action + 11)
+                     for action in range(len(ACTION_OFFSETS)))
+
+# Offsets of the 26 cells around a cell.
+BLOCK_OFFSETS = tuple((dx, dy, dz) for dz in (-1, 0, 1) for dy in (-1, 0, 1) for dx in (-1, 0, 1)
+                      if (dx, dy, dz) != (0, 0, 0))
+
+# Map of block offsets to their bit in the occupancy mask of a block.
+BLOCK_BITS = dict((offset, 1 << bit) for bit, offset in enumerate(BLOCK_OFFSETS))
+
+# Map of position offsets to the action that moves by them.
+OFFSET_ACTIONS = dict((ACTION_OFFSETS[action], action) for action in ACTIONS)
+
+# Occupancy mask of a block with every cell present.
+FULL_BLOCK = (1 << len(BLOCK_OFFSETS)) - 1
+
+# Bits marking that a block's occupancy is cached and that the block is uniform.
+KNOWN = 1 << 31
+UNIFORM = 1 << 30
+
+# States of a cell in the regularity cache.
+UNKNOWN, REGULAR, IRREGULAR = 0, 1, 2
+
+# Cache of the successor actions for each (arriving action, block occupancy) pair.
+_successor_cache = {}
+
+# Per graph cache of the version of the graph it was built for, the block around each cell and the regularity of each
+# cell.
+_block_cache = weakref.WeakKeyDictionary()
+
+
+def jps(graph, start, end, state=None):
+    """
+    This is a function implementing Jump Point Search to find paths in a graph, given a start and end node. It finds
+    paths as cheap as the A* algorithm, with far fewer nodes pushed onto the priority queue in open mazes. Only grid
+    graphs are supported, other graphs are searched with A*.
+
+    Args:
+        graph(GridGraph): Graph to perform the pathfinding on.
+        start(Vector): Position to start the search at.
+        end(Vector): Position to find a path to in the graph.
+        state(SearchState): State to use for the search. Defaults to the calling thread's state for the graph.
+
+    Returns:
+        (success, path, cost): Whether a path was found, path from the start node to the end node in the graph and the
+            cost of each point in the path.
+
+    """
+    if not isinstance(graph, GridGraph):
+        return a_star(graph, start, end, state)
+
+    # Get the start and end nodes from the graph.
+    start_node = graph.get_index(start)
+    end_node = graph.get_index(end)
+
+    if (start_node is None) or (end_node is None):
+        return False, [], None
+
+    if state is None:
+        state = get_search_state(graph)
+
+    # Initialize the JPS priority queue. Entries are (total cost, cost, node) tuples. Ties are broken by the lower cost,
+    # so every optimal path to a node reaches it before it is expanded, and the actions it was reached with can be
+    # gathered into a mask instead of queueing the node once per action.
+    jps_queue = [(grid_distance(start, end), 0, start_node)]
+    arrivals = {start_node: (0, 0)}
+    state.visit(start_node, 0, None)
+    expanded, pushed, peak_frontier, lookups = 0, 1, 1, 0
+
+    # Searching the graph for the end node.
+    while len(jps_queue) != 0:
+        _, node_cost, node = heapq.heappop(jps_queue)
+
+        if node == end_node:
+            break
+
+        # Skip entries for nodes that were reached more cheaply after they were queued.
+        if node_cost > state.get_cost(node):
+            continue
+
+        # Each action jumped along counts as a neighbour lookup.
+        actions = get_arrival_actions(graph, node, arrivals[node][1])
+        expanded += 1
+        lookups += len(actions)
+
+        for action in actions:
+            jump_point, jump_cost = jump(graph, state, node, node_cost, action, end_node)
+            if jump_point is None:
+                continue
+
+            arrival = arrivals.get(jump_point)
+            if arrival is not None and arrival[0] == jump_cost:
+                arrivals[jump_point] = (jump_cost, arrival[1] | (1 << action))
+            elif arrival is None or arrival[0] > jump_cost:
+                arrivals[jump_point] = (jump_cost, 1 << action)
+                heuristic = grid_distance(graph.get_position(jump_point), end)
+                heapq.heappush(jps_queue, (jump_cost + heuristic, jump_cost, jump_point))
+                pushed += 1
+
+        if len(jps_queue) > peak_frontier:
+            peak_frontier = len(jps_queue)
+
+    # If the JPS queue is empty without finding the end node, then we can't reach it.
+    else:
+        record_search("JPS", expanded, pushed, peak_frontier, lookups)
+        return False, [], None
+
+    record_search("JPS", expanded, pushed, peak_frontier, lookups)
+
+    # Getting the path from the end node to the source by traversing the parents. Jumped over nodes are recorded in
+    # the state as well, so the path includes every node.
+    return True, get_path(graph, state, end_node), state.get_cost(end_node)
+
+
+def jump(graph, state, node, node_cost, action, end_node):
+    """
+    Method to move from a node along an action for as long as the only canonical successor of each node is the next
+    node along the same action. Every node passed is recorded in the search state.
+
+    Args:
+        graph(GridGraph): Graph to perform the pathfinding on.
+        state(SearchState): State of the search.
+        node(int): Index of the node to jump from.
+        node_cost(int): Cost of reaching the node.
+        action(int): Action to jump along.
+        end_node(int): Index of the node the search is looking for.
+
+    Returns:
+        (jump_point, cost): Index of the node the jump stopped at and the cost of reaching it, or (None, None) if the
+            jump ended without finding a node worth expanding.
+
+    """
+    offset = graph.offsets[action]
+    cost = get_action_cost(action)
+    cells = graph.cells
+
+    while True:
+        neighbour = node + offset
+        if not cells[neighbour] & PRESENT:
+            return None, None
+
+        # A cheaper path to the node has been found already, so no optimal path continues along this jump.
+        neighbour_cost = node_cost + cost
+        if state.is_visited(neighbour):
+            if state.get_cost(neighbour) < neighbour_cost:
+                return None, None
+            if state.get_cost(neighbour) > neighbour_cost:
+                state.visit(neighbour, neighbour_cost, node)
+        else:
+            state.visit(neighbour, neighbour_cost, node)
+
+        if neighbour == end_node:
+            return neighbour, neighbour_cost
+
+        actions = get_jps_actions(graph, neighbour, action)
+        if len(actions) == 0:
+            return None, None
+        if actions != (action,):
+            return neighbour, neighbour_cost
+
+        node, node_cost = neighbour, neighbour_cost
+
+
+def get_arrival_actions(graph, node, arrival_mask):
+    """
+    Method to get the actions to expand a node with, given the mask of actions the node was reached with at its
+    lowest cost.
+
+    Args:
+        graph(GridGraph): Graph to perform the pathfinding on.
+        node(int): Index of the node.
+        arrival_mask(int): Mask of the actions the node was reached with, or 0 for the start node.
+
+    Returns:
+        (actions): Tuple of the actions to expand the node with.
+
+    """
+    if arrival_mask == 0:
+        return get_jps_actions(graph, node, None)
+
+    actions = set()
+    for action in ACTIONS:
+        if arrival_mask & (1 << action):
+            actions.update(get_jps_actions(graph, node, action))
+
+    return sorted(actions)
+
+
+def get_jps_actions(graph, node, action):
+    """
+    Method to get the actions to expand a node with, given the action the node was reached with.
+
+    Args:
+        graph(GridGraph): Graph to perform the pathfinding on.
+        node(int): Index of the node.
+        action(int): Action the node was reached with, or None for the start node.
+
+    Returns:
+        (actions): Tuple of the actions to expand the node with.
+
+    """
+    block = get_block(graph, node)
+    if action is None or not block & UNIFORM:
+        return tuple(graph.get_actions(node))
+
+    occupancy = block & FULL_BLOCK
+    actions = _successor_cache.get((action, occupancy))
+    if actions is None:
+        actions = tuple(successor_action for successor_action in ACTIONS
+                        if occupancy & BLOCK_BITS[ACTION_OFFSETS[successor_action]] and
+                        not any(mask & occupancy == mask for mask in PRUNING_RULES[action][successor_action]))
+        _successor_cache[(action, occupancy)] = actions
+
+    return actions
+
+
+def get_block(graph, node):
+    """
+    Method to get the occupancy mask of the block around a node, with a bit set for each cell holding a node, along
+    with the UNIFORM bit if every node in the block can take every action that leads to another node. The result is
+    cached for each graph, until the graph is edited.
+
+    Args:
+        graph(GridGraph): Graph the node is in.
+        node(int): Index of the node.
+
+    Returns:
+        (block): Occupancy mask and uniformity of the block around the node.
+
+    """
+    cache = _block_cache.get(graph)
+    if cache is None or cache[0] != graph.version:
+        cache = _block_cache[graph] = (graph.version, array('I', bytes(array('I').itemsize * graph.size)),
+                                       bytearray(graph.size))
+    _, blocks, regular = cache
+
+    block = blocks[node]
+    if block & KNOWN:
+        return block
+
+    cells = graph.cells
+    bounds = graph.bounds
+    position = graph.get_position(node)
+
+    block = KNOWN | UNIFORM
+    for (dx, dy, dz), bit in BLOCK_BITS.items():
+        x, y, z = position.x + dx, position.y + dy, position.z + dz
+        if not (0 <= x < bounds.x and 0 <= y < bounds.y and 0 <= z < bounds.z):
+            continue
+
+        cell = x + bounds.x * (y + bounds.y * z)
+        if cells[cell] & PRESENT:
+            block |= bit
+            if not is_regular(graph, regular, cell, x, y, z):
+                block &= ~UNIFORM
+
+    if not is_regular(graph, regular, node, position.x, position.y, position.z):
+        block &= ~UNIFORM
+
+    blocks[node] = block
+    return block
+
+
+def is_regular(graph, regular, cell, x, y, z):
+    """
+    Method to check whether a node can take exactly the actions that lead to other nodes.
+
+    Args:
+        graph(GridGraph): Graph the node is in.
+        regular(bytearray): Cache of the regularity of each cell.
+        cell(int): Index of the node.
+        x(int): X co-ordinate of the node.
+        y(int): Y co-ordinate of the node.
+        z(int): Z co-ordinate of the node.
+
+    Returns:
+        (bool): Whether the node is regular.
+
+    """
+    if regular[cell] == UNKNOWN:
+        cells = graph.cells
+        valid_mask = graph.get_valid_mask(x, y, z)
+
+        expected = PRESENT
+        for action in ACTIONS:
+            bit = 1 << action
+            if valid_mask & bit and cells[cell + graph.offsets[action]] & PRESENT:
+                expected |= bit
+
+        regular[cell] = REGULAR if cells[cell] == expected else IRREGULAR
+
+    return regular[cell] == REGULAR
+
+
+def _get_pruning_rules():
+    """
+    Method to build the pruning rules for every pair of actions. For a node reached with one action, the successor
+    along the other action is pruned if the cells of any of the pair's block masks are all present, as they hold a
+    better path from the node's parent to the successor which does not pass through the node.
+
+    Returns:
+        (rules): Nested tuple of the block masks for each pair of actions, indexed by action and successor action.
+
+    """
+    def get_move(source, target):
+        return OFFSET_ACTIONS.get((target[0] - source[0], target[1] - source[1], target[2] - source[2]))
+
+    def get_order(moves):
+        return (sum(get_action_cost(move) for move in moves), len(moves), tuple(ACTION_RANKS[move] for move in moves))
+
+    rules = [None]
+    for action in ACTIONS:
+        dx, dy, dz = ACTION_OFFSETS[action]
+        parent = (-dx, -dy, -dz)
+
+        action_rules = [None]
+        for successor_action in ACTIONS:
+            successor = ACTION_OFFSETS[successor_action]
+            order = get_order((action, successor_action))
+
+            # A direct move from the parent needs no other cells, and a move through another cell of the block
+            # needs that cell.
+            masks = []
+            direct = get_move(parent, successor)
+            if successor == parent or (direct is not None and get_order((direct,)) < order):
+                masks.append(0)
+
+            for other in BLOCK_OFFSETS:
+                if other in (parent, successor):
+                    continue
+                first, second = get_move(parent, other), get_move(other, successor)
+                if first is not None and second is not None and get_order((first, second)) < order:
+                    masks.append(BLOCK_BITS[other])
+
+            action_rules.append(tuple(masks))
+        rules.append(tuple(action_rules))
+
+    return tuple(rules)
+
+
+# Pruning rules for every pair of actions.
+PRUNING_RULES = _get_pruning_rules()
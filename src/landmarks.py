@@ -0,0 +1,243 @@
+"""
+Maze Solver - Landmarks
+
+This module implements the landmark tables used by the ALT (A*, landmarks and triangle inequality) heuristic. For a
+handful of landmark nodes, the cost of the cheapest path from the landmark to every node and from every node to the
+landmark is computed once per maze and stored in a file next to it. By the triangle inequality, these give a lower
+bound on the cost of the cheapest path between any two nodes, which follows the walls of the maze far more closely than
+the straight line distance. A landmark file records a hash of the maze it was built for, so a file built before the
+maze was edited is rejected rather than giving a heuristic which may overestimate.
+
+Author: shravan@usc.edu (5451873903)
+
+"""
+
+import heapq
+import mmap
+import struct
+from array import array
+from collections import Counter
+
+from components import get_components
+from grid_graph import PRESENT
+from path_cache import get_graph_hash
+
+
+# Magic bytes at the start of every landmark file.
+MAGIC = b"MZLM"
+
+# Version of the landmark file format.
+VERSION = 2
+
+# Marker written in native byte order, used to check that a landmark file was written on a compatible machine.
+BYTE_ORDER_MARK = 0x0102
+
+# Header layout: magic, version, byte order mark, number of landmarks, bounds of the maze and hash of its contents.
+HEADER = struct.Struct("=4sHHI3i16s")
+
+# Distance stored for nodes which cannot be reached.
+UNREACHABLE = (1 << (8 * array('I').itemsize)) - 1
+
+
+class Landmarks(object):
+    """
+    A class that holds the distance tables of the landmarks of a maze.
+    """
+
+    def __init__(self, landmarks, forward, backward):
+        """
+        Method to initialize the landmarks.
+
+        Args:
+            landmarks(list): Indices of the landmark nodes.
+            forward(list): Cost of the cheapest path from each landmark to every node.
+            backward(list): Cost of the cheapest path from every node to each landmark.
+
+        """
+        self.landmarks = landmarks
+        self.forward = forward
+        self.backward = backward
+
+    def __len__(self):
+        """
+        Method to get the number of landmarks.
+
+        Returns:
+            (int): Number of landmarks.
+
+        """
+        return len(self.landmarks)
+
+    def get_heuristic(self, target):
+        """
+        Method to get the ALT heuristic for paths to a target node. The heuristic is the largest lower bound given by
+        any landmark, so it never overestimates and is consistent.
+
+        Args:
+            target(int): Index of the target node.
+
+        Returns:
+            (heuristic): Function giving the lower bound for a node index, or None if the node cannot reach the target.
+
+        """
+        bounds = [(forward, forward[target], backward, backward[target])
+                  for forward, backward in zip(self.forward, self.backward)]
+
+        def heuristic(node):
+            best = 0
+            for forward, forward_target, backward, backward_target in bounds:
+                forward_node, backward_node = forward[node], backward[node]
+
+                # If the landmark reaches the node but not the target, then the node cannot reach the target either.
+                # The same holds if the target reaches the landmark but the node does not.
+                if forward_node != UNREACHABLE:
+                    if forward_target == UNREACHABLE:
+                        return None
+                    best = max(best, forward_target - forward_node)
+                if backward_target != UNREACHABLE:
+                    if backward_node == UNREACHABLE:
+                        return None
+                    best = max(best, backward_node - backward_target)
+
+            return best
+
+        return heuristic
+
+
+def get_distances(graph, source, reverse=False):
+    """
+    Method to get the cost of the cheapest path from a node to every node in a graph, using Dijkstra's algorithm.
+
+    Args:
+        graph(GridGraph): Graph to get the distances in.
+        source(int): Index of the node to get the distances from.
+        reverse(bool): Whether to get the cost of the cheapest path from every node to the source node instead.
+            Defaults to False.
+
+    Returns:
+        (distances): Array of the distance of each cell, or UNREACHABLE if there is no path.
+
+    """
+    get_neighbours = graph.get_predecessors if reverse else graph.get_successors
+    distances = array('I', [UNREACHABLE]) * graph.size
+    distances[source] = 0
+
+    queue = [(0, source)]
+    while len(queue) != 0:
+        cost, node = heapq.heappop(queue)
+        if cost > distances[node]:
+            continue
+
+        for neighbour, neighbour_cost in get_neighbours(node):
+            neighbour_cost += cost
+            if neighbour_cost < distances[neighbour]:
+                distances[neighbour] = neighbour_cost
+                heapq.heappush(queue, (neighbour_cost, neighbour))
+
+    return distances
+
+
+def build_landmarks(graph, count):
+    """
+    Method to pick landmarks in a graph and compute their distance tables. Landmarks are picked one at a time as the
+    node furthest from the landmarks picked so far, which spreads them over the edges of the maze. Nodes which no
+    landmark reaches count as the furthest of all, so parts of the maze cut off from the landmarks picked so far get
+    landmarks of their own first, largest part first. Parts of a single node are skipped, as a landmark there gives no
+    bound on any path.
+
+    Args:
+        graph(GridGraph): Graph to pick the landmarks in.
+        count(int): Number of landmarks to pick.
+
+    Returns:
+        (landmarks): Landmarks of the graph.
+
+    """
+    nodes = [index for index in range(graph.size) if graph.cells[index] & PRESENT]
+    if len(nodes) == 0:
+        return Landmarks([], [], [])
+
+    # Size of the weakly connected part of the maze each node is in.
+    groups = get_components(graph).groups
+    group_sizes = Counter(groups[node] for node in nodes)
+
+    # The search for the first landmark starts from a node of the largest part of the maze, and is not kept.
+    closest = get_distances(graph, max(nodes, key=lambda node: group_sizes[groups[node]]))
+    landmarks, forward, backward = [], [], []
+
+    while len(landmarks) < count:
+        candidates = [node for node in nodes if node not in landmarks and
+                      (closest[node] != UNREACHABLE or group_sizes[groups[node]] > 1)]
+        if len(landmarks) == 0:
+            # The first search is not from a landmark, so the nodes it cannot reach are not cut off from any landmark.
+            candidates = [node for node in candidates if closest[node] != UNREACHABLE]
+        if len(candidates) == 0:
+            break
+
+        landmark = max(candidates, key=lambda node: (closest[node], group_sizes[groups[node]]))
+        landmarks.append(landmark)
+        forward.append(get_distances(graph, landmark))
+        backward.append(get_distances(graph, landmark, reverse=True))
+
+        # Nodes the new landmark cannot reach keep their distance, so they are still the furthest from the landmarks
+        # if no landmark reaches them.
+        if len(landmarks) == 1:
+            closest = array('I', forward[0])
+        else:
+            for node in nodes:
+                closest[node] = min(closest[node], forward[-1][node])
+
+    return Landmarks(landmarks, forward, backward)
+
+
+def write_landmarks(file_path, landmarks, graph):
+    """
+    Method to write the landmarks of a maze to a landmark file.
+
+    Args:
+        file_path(str): Path of the file to write.
+        landmarks(Landmarks): Landmarks to write.
+        graph(GridGraph): Graph of the maze the landmarks belong to.
+
+    """
+    bounds = graph.bounds
+    with open(file_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, BYTE_ORDER_MARK, len(landmarks), bounds.x, bounds.y, bounds.z,
+                            bytes.fromhex(get_graph_hash(graph))))
+        f.write(array('I', landmarks.landmarks).tobytes())
+        for table in landmarks.forward + landmarks.backward:
+            f.write(memoryview(table).cast('B'))
+
+
+def load_landmarks(file_path, graph):
+    """
+    Method to load the landmarks of a maze. The distance tables are read only views of the memory mapped file.
+
+    Args:
+        file_path(str): Path of the landmark file.
+        graph(GridGraph): Graph of the maze the landmarks belong to.
+
+    Returns:
+        (landmarks): Landmarks of the maze.
+
+    """
+    with open(file_path, 'rb') as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    magic, version, byte_order_mark, count, size_x, size_y, size_z, graph_hash = HEADER.unpack_from(buffer)
+    if magic != MAGIC:
+        raise ValueError("{} is not a landmark file.".format(file_path))
+    if version != VERSION:
+        raise ValueError("{} has landmark version {}, expected {}.".format(file_path, version, VERSION))
+    if byte_order_mark != BYTE_ORDER_MARK:
+        raise ValueError("{} was written on a machine with a different byte order.".format(file_path))
+    if (size_x, size_y, size_z) != (graph.bounds.x, graph.bounds.y, graph.bounds.z):
+        raise ValueError("{} belongs to a maze with different bounds.".format(file_path))
+    if graph_hash != bytes.fromhex(get_graph_hash(graph)):
+        raise ValueError("{} was built for different maze contents, and must be built again.".format(file_path))
+
+    cells = memoryview(buffer)[HEADER.size:].cast('I')
+    landmarks = list(cells[:count])
+
+    tables = [cells[count + table * graph.size:count + (table + 1) * graph.size] for table in range(2 * count)]
+    return Landmarks(landmarks, tables[:count], tables[count:])
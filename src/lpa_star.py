@@ -0,0 +1,217 @@
+"""
+Maze Solver - Lifelong Planning A* (LPA*) Algorithm
+
+A module implementing Lifelong Planning A* to solve mazes which are edited between queries. The planner keeps the cost
+of every node it has searched along with a one step lookahead of that cost computed from the node's predecessors, and
+only nodes where the two disagree are queued. After the graph is edited, only the nodes around the edited cells are
+rechecked, so replanning repairs the previous search in the region affected by the edits instead of starting over.
+
+The start and end positions are fixed for the lifetime of a planner. D* Lite extends the same idea to a moving start,
+which is not needed for answering queries against a changing maze.
+
+Author: shravan@usc.edu (5451873903)
+
+"""
+
+import heapq
+
+from graph import ACTION_OFFSETS, ACTIONS, Node, position_to_index
+from instrumentation import record_search
+from vector import Vector, grid_distance
+
+
+# Cost of nodes which have not been reached.
+INFINITY = float('inf')
+
+
+class LPAStar(object):
+    """
+    A class that implements an incremental planner for a path between two positions in a graph, which is repaired
+    after the graph is edited.
+    """
+
+    def __init__(self, graph, start, end):
+        """
+        Method to initialize the planner. No search is done until a path is planned.
+
+        Args:
+            graph(Graph): Graph to perform the pathfinding on. Either a Graph or a GridGraph.
+            start(Vector): Position to start the search at.
+            end(Vector): Position to find a path to in the graph.
+
+        """
+        self.graph = graph
+        self.start = start
+        self.end = end
+        self.start_node = position_to_index(start, graph.bounds)
+        self.end_node = position_to_index(end, graph.bounds)
+
+        self.costs = {}
+        self.lookaheads = {self.start_node: 0}
+        self.keys = {}
+        self.queue = []
+        self.expanded, self.pushed, self.peak_frontier, self.lookups = 0, 0, 0, 0
+        self._queue_node(self.start_node)
+
+    def plan(self):
+        """
+        Method to find the cheapest path from the start position to the end position, reusing the previous search. The
+        counters reported for the plan cover the search since the previous plan, including the nodes queued by updates.
+
+        Returns:
+            (success, path, cost): Whether a path was found, path from the start node to the end node in the graph and
+                the cost of each point in the path.
+
+        """
+        if self.graph.get_index(self.start) is None or self.graph.get_index(self.end) is None:
+            return False, [], None
+
+        self._search()
+        record_search("LPA*", self.expanded, self.pushed, self.peak_frontier, self.lookups)
+        self.expanded, self.pushed, self.peak_frontier, self.lookups = 0, 0, len(self.queue), 0
+
+        cost = self.costs.get(self.end_node, INFINITY)
+        if cost == INFINITY:
+            return False, [], None
+
+        # Getting the path from the end node to the source by following the predecessors that give each node its cost.
+        nodes = [self.end_node]
+        while nodes[-1] != self.start_node:
+            node = nodes[-1]
+            nodes.append(min(self.graph.get_predecessors(node),
+                             key=lambda predecessor: self.costs.get(predecessor[0], INFINITY) + predecessor[1])[0])
+
+        nodes.reverse()
+        return True, [Node(self.graph.get_position(node), cost=self.costs[node]) for node in nodes], cost
+
+    def update(self, positions):
+        """
+        Method to tell the planner which positions have been edited in the graph since the last plan. An edit can only
+        change the actions leading out of and into the edited cell, so only the edited cells and the cells next to them
+        are rechecked.
+
+        Args:
+            positions(iterable): Positions of the cells where nodes or actions were added or removed.
+
+        """
+        bounds = self.graph.bounds
+        for position in positions:
+            self._update_node(position_to_index(position, bounds))
+
+            for action in ACTIONS:
+                dx, dy, dz = ACTION_OFFSETS[action]
+                neighbour = Vector(position.x + dx, position.y + dy, position.z + dz)
+                if 0 <= neighbour.x < bounds.x and 0 <= neighbour.y < bounds.y and 0 <= neighbour.z < bounds.z:
+                    self._update_node(position_to_index(neighbour, bounds))
+
+    def _search(self):
+        """
+        Method to expand queued nodes until the cost of the end node is known to be correct.
+        """
+        graph = self.graph
+        costs = self.costs
+        lookaheads = self.lookaheads
+
+        while True:
+            top = self._peek()
+            end_cost = costs.get(self.end_node, INFINITY)
+            end_lookahead = lookaheads.get(self.end_node, INFINITY)
+            if top is None or (top >= self._get_key(self.end_node) and end_cost == end_lookahead):
+                break
+
+            node = heapq.heappop(self.queue)[1]
+            del self.keys[node]
+
+            successors = graph.get_successors(node)
+            self.expanded += 1
+            self.lookups += len(successors)
+
+            lookahead = lookaheads.get(node, INFINITY)
+            if costs.get(node, INFINITY) > lookahead:
+                # The node was reached more cheaply, so its cost is settled and its successors can use it.
+                costs[node] = lookahead
+                for successor, cost in successors:
+                    if lookahead + cost < lookaheads.get(successor, INFINITY):
+                        lookaheads[successor] = lookahead + cost
+                        self._queue_node(successor)
+            else:
+                # The node got more expensive, so it and every successor which relied on it are rechecked.
+                costs[node] = INFINITY
+                self._update_node(node)
+                for successor, _ in successors:
+                    self._update_node(successor)
+
+    def _update_node(self, node):
+        """
+        Method to recompute the lookahead cost of a node from its predecessors, and queue it if the lookahead disagrees
+        with its cost.
+
+        Args:
+            node(int): Index of the node.
+
+        """
+        graph = self.graph
+        if graph.get_index(graph.get_position(node)) is None:
+            lookahead = INFINITY
+        elif node == self.start_node:
+            lookahead = 0
+        else:
+            predecessors = graph.get_predecessors(node)
+            self.lookups += len(predecessors)
+            lookahead = min([self.costs.get(predecessor, INFINITY) + cost for predecessor, cost in predecessors] +
+                            [INFINITY])
+
+        self.lookaheads[node] = lookahead
+        self._queue_node(node)
+
+    def _queue_node(self, node):
+        """
+        Method to queue a node with its current key if its cost and lookahead cost disagree, or to drop it from the
+        queue otherwise. Queue entries with an outdated key are skipped when they reach the top of the queue.
+
+        Args:
+            node(int): Index of the node.
+
+        """
+        if self.costs.get(node, INFINITY) != self.lookaheads.get(node, INFINITY):
+            key = self._get_key(node)
+            if self.keys.get(node) != key:
+                self.keys[node] = key
+                heapq.heappush(self.queue, (key, node))
+                self.pushed += 1
+                if len(self.queue) > self.peak_frontier:
+                    self.peak_frontier = len(self.queue)
+        else:
+            self.keys.pop(node, None)
+
+    def _peek(self):
+        """
+        Method to get the key of the node at the top of the queue, dropping outdated entries.
+
+        Returns:
+            (key): Key of the node at the top of the queue, or None if the queue is empty.
+
+        """
+        queue = self.queue
+        while len(queue) != 0:
+            key, node = queue[0]
+            if self.keys.get(node) == key:
+                return key
+            heapq.heappop(queue)
+
+        return None
+
+    def _get_key(self, node):
+        """
+        Method to get the priority of a node, which is the smaller of its cost and lookahead cost plus the heuristic,
+        with ties broken by the smaller of the two costs.
+
+        Args:
+            node(int): Index of the node.
+
+        Returns:
+            (key): Key of the node.
+
+        """
+        cost = min(self.costs.get(node, INFINITY), self.lookaheads.get(node, INFINITY))
+        return cost + grid_distance(self.graph.get_position(node), self.end), cost
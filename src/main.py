@@ -1,77 +1,421 @@
 """
 Maze Solver - A program which solves a maze read from an input file.
 
-This module implements the main program that runs the pathfinding algorithms (BFS, UCS and A*) on a maze defined by an
-input file, and writes the optimal path to an output file.
+This module implements the main program that runs the pathfinding algorithms (BFS, UCS, A* and their variants) on a
+maze defined by an input file, and writes the optimal path to an output file. Mazes can also be compiled into a binary
+file, which loads much faster than the text format, and batches of queries can be answered against a single loaded
+maze. Paths from the start of a maze to many targets are answered from a single distance field of the start. A server
+keeps mazes loaded between queries, and the external memory algorithms search compiled mazes larger than memory.
+Mazes with several goals are searched for the nearest goal, or for every goal, in a single pass.
 
-Usage: python main.py
+Usage: python main.py [input] [-o output] [--queue heap|bucket] [--landmarks file] [--cache-dir directory]
+                      [--stats file] [--components] [--weight W] [--time-limit seconds] [--format text|rle]
+                      [--memory-budget MiB] [--spill-dir directory] [-w workers] [--reduce]
+                      [--goals nearest|all]
+       python main.py compile input output
+       python main.py landmarks input output [-k count]
+       python main.py batch input queries [-o output] [-w workers] [--landmarks file] [--cache-size MiB]
+                                          [--cache-dir directory] [--components]
+       python main.py targets input targets [-o output] [--field file] [--save file]
+       python main.py decode input output
+       python main.py serve maze [maze ...] [--socket path] [--host host] [--port port] [-w workers]
+                                            [--cache-size MiB] [--components]
 
 Author: shravan@usc.edu (5451873903)
 
 """
 
 import argparse
+import asyncio
+import json
+import os
+import sys
 
-from a_star import a_star
-from bfs import bfs
-from ucs import ucs
-from utils import generate_maze
+from action_path import decode_action_path, write_action_path
+from algorithms import (ALGORITHMS, ANYTIME_ALGORITHMS, COMPONENT_ALGORITHMS, EXTERNAL_ALGORITHMS, GOAL_ALGORITHMS,
+                        LANDMARK_ALGORITHMS, PARALLEL_ALGORITHMS, QUEUE_ALGORITHMS, REDUCIBLE_ALGORITHMS,
+                        UNIT_COST_ALGORITHMS, WEIGHTED_ALGORITHMS)
+from batch import format_result, read_queries, run_batch
+from compiled_maze import write_compiled_maze
+from components import get_components
+from distance_field import build_distance_field, load_distance_field, read_targets, write_distance_field
+from instrumentation import collect, phase
+from landmarks import build_landmarks, load_landmarks, write_landmarks
+from multi_goal import all_goals_search, nearest_goal_search
+from path_cache import PathCache
+from priority_queue import PRIORITY_QUEUES
+from reduced_graph import reduce_graph
+from server import MazeServer, parse_maze_names
+from utils import load_maze, read_maze, write_path
 
 
-if __name__ == "__main__":
-    # Getting args.
-    parser = argparse.ArgumentParser(description='Module to perform pathfinding in graphs using different algorithms.')
-    parser.add_argument("input", nargs='?', type=str, default="input.txt",
-                        help="Input file path containing the graph and node information.")
-    parser.add_argument("-o", "--output", type=str, default="output.txt",
-                        help="Output file to store the results of the pathfinding algorithms.")
-    args = parser.parse_args()
+def solve(args):
+    """
+    Method to solve the maze in an input file and write the path to an output file. For a maze with several goals,
+    either the path to the nearest goal is written, or one result line per goal.
 
+    Args:
+        args(Namespace): Parsed command line arguments.
+
+    """
     input_file_path = args.input
     output_file_path = args.output
 
-    # Reading input file.
-    input_file_contents = []
-    with open(input_file_path, 'r') as f:
-        input_file_contents = f.readlines()
-
-    # Generating the maze.
-    algorithm, start, end, graph = generate_maze(input_file_contents)
-    print("Algorithm: {}, Start: {}, End: {}".format(algorithm, start, end))
-
-    # Running the pathfinding algorithms.
-    success, path, cost = False, None, None
-    if algorithm == "BFS":
-        success, path, cost = bfs(graph, start, end)
-        print("Sucess: {}".format(success))
-        print("Cost: {}".format(cost))
-        print("Path Length: {}".format(len(path)))
-
-    elif algorithm == "UCS":
-        success, path, cost = ucs(graph, start, end)
-        print("Sucess: {}".format(success))
-        print("Cost: {}".format(cost))
-        print("Path Length: {}".format(len(path)))
-
-    elif algorithm == "A*":
-        success, path, cost = a_star(graph, start, end)
-        print("Sucess: {}".format(success))
-        print("Cost: {}".format(cost))
-        print("Path Length: {}".format(len(path)))
-
-    # Writing the path to the output file.
-    if success:
-        with open(output_file_path, 'w') as f:
-            f.truncate(0)
-            f.write("{}\n".format(cost))
-            f.write("{}\n".format(len(path)))
-
-            last_cost = 0
-            for node in path:
-                f.write("{} {} {} {}\n".format(node.position.x, node.position.y, node.position.z,
-                                               node.cost - last_cost))
-                last_cost = node.cost
+    # Statistics are always gathered, as they carry the suboptimality bound of the bounded suboptimal algorithms.
+    with collect() as stats:
+        # Reading the maze from the input file.
+        algorithm, start, end, graph = load_maze(input_file_path, compact=not args.reference_graph)
+        print("Algorithm: {}, Start: {}, End: {}".format(algorithm, start, end))
+
+        # Running the pathfinding algorithm.
+        success, path, cost = False, [], None
+        results = None
+        if isinstance(end, tuple):
+            if algorithm not in GOAL_ALGORITHMS:
+                raise ValueError("The {} algorithm cannot search for several goals.".format(algorithm))
+
+            heuristic = GOAL_ALGORITHMS[algorithm]
+            with phase("search"):
+                if args.goals == "all":
+                    results = all_goals_search(graph, start, end, heuristic)
+                else:
+                    success, path, cost = nearest_goal_search(graph, start, end, heuristic)
+
+            if results is not None:
+                success = any(result[0] for result in results)
+                cost = [result[2] for result in results]
+                print("Goals Reached: {}/{}".format(sum(1 for result in results if result[0]), len(results)))
+            else:
+                print("Sucess: {}".format(success))
+                print("Goal: {}".format(path[-1].position if success else None))
+                print("Cost: {}".format(cost))
+                print("Path Length: {}".format(len(path)))
+        elif algorithm in ALGORITHMS:
+            options = {}
+            if algorithm in QUEUE_ALGORITHMS:
+                options["queue_type"] = PRIORITY_QUEUES[args.queue]
+            if algorithm in LANDMARK_ALGORITHMS and args.landmarks is not None:
+                options["landmarks"] = load_landmarks(args.landmarks, graph)
+            if algorithm in WEIGHTED_ALGORITHMS and args.weight is not None:
+                options["weight"] = args.weight
+            if algorithm in ANYTIME_ALGORITHMS and args.time_limit is not None:
+                options["time_limit"] = args.time_limit
+            if algorithm in EXTERNAL_ALGORITHMS:
+                if args.memory_budget is not None:
+                    options["memory_budget"] = int(args.memory_budget * (1 << 20))
+                options["directory"] = args.spill_dir
+            if algorithm in PARALLEL_ALGORITHMS:
+                options["workers"] = args.workers
+            if algorithm in COMPONENT_ALGORITHMS and args.components:
+                with phase("components"):
+                    options["components"] = get_components(graph)
+            cache = None if args.cache_dir is None else PathCache(directory=args.cache_dir)
+            if algorithm in REDUCIBLE_ALGORITHMS and args.reduce:
+                # Cached paths are over the full maze, so they are looked up and stored against the full maze.
+                result = None if cache is None else cache.get(graph, algorithm, start, end)
+                if result is None:
+                    with phase("reduce"):
+                        reduced_graph = reduce_graph(graph, (start, end))
+                    print("Reduced: {}".format(reduced_graph))
+                    with phase("search"):
+                        success, path, cost = ALGORITHMS[algorithm](reduced_graph, start, end, **options)
+                        result = success, reduced_graph.expand_path(path), cost
+                    if cache is not None:
+                        cache.put(graph, algorithm, start, end, result)
+                success, path, cost = result
+            else:
+                with phase("search"):
+                    if cache is not None:
+                        success, path, cost = cache.search(graph, algorithm, start, end, **options)
+                    else:
+                        success, path, cost = ALGORITHMS[algorithm](graph, start, end, **options)
+            print("Sucess: {}".format(success))
+            print("Cost: {}".format(cost))
+            print("Path Length: {}".format(len(path)))
+            if len(stats.searches) != 0 and "bound" in stats.searches[-1]:
+                print("Bound: {}".format(stats.searches[-1]["bound"]))
+
+        # Writing the path to the output file.
+        with phase("write"):
+            if results is not None:
+                with open(output_file_path, 'w') as f:
+                    for goal, result in zip(end, results):
+                        f.write(format_result("{} {} {}".format(goal.x, goal.y, goal.z), *result))
+            elif args.format == "rle":
+                write_action_path(output_file_path, success, path, cost)
+            else:
+                write_path(output_file_path, success, path, cost)
+
+    if args.stats is not None:
+        report = dict(stats.as_dict(), algorithm=algorithm, success=success, cost=cost, path_length=len(path))
+        if args.stats == "-":
+            print(json.dumps(report, indent=2, sort_keys=True))
+        else:
+            with open(args.stats, 'w') as f:
+                json.dump(report, f, indent=2, sort_keys=True)
+
+
+def compile_maze(args):
+    """
+    Method to compile the maze in a text input file into a binary compiled maze file.
+
+    Args:
+        args(Namespace): Parsed command line arguments.
+
+    """
+    algorithm, start, end, graph = read_maze(args.input)
+    write_compiled_maze(args.output, algorithm, start, end, graph)
+    print("Compiled {} into {}".format(args.input, args.output))
+
+
+def precompute_landmarks(args):
+    """
+    Method to pick the landmarks of the maze in an input file and write their distance tables to a landmark file.
+
+    Args:
+        args(Namespace): Parsed command line arguments.
+
+    """
+    _, _, _, graph = load_maze(args.input)
+    landmarks = build_landmarks(graph, args.count)
+    write_landmarks(args.output, landmarks, graph)
+    print("Wrote {} landmarks for {} into {}".format(len(landmarks), args.input, args.output))
+
+
+def batch(args):
+    """
+    Method to answer a batch of queries against the maze in an input file and write their results to an output file.
+
+    Args:
+        args(Namespace): Parsed command line arguments.
+
+    """
+    _, _, _, graph = load_maze(args.input)
+
+    cache = None
+    if args.cache_size > 0 or args.cache_dir is not None:
+        cache = PathCache(args.cache_size << 20, args.cache_dir)
+
+    components = get_components(graph) if args.components else None
+    if components is not None:
+        print(components, file=sys.stderr)
+
+    queries_file = sys.stdin if args.queries == "-" else open(args.queries, 'r')
+    output_file = sys.stdout if args.output == "-" else open(args.output, 'w')
+    try:
+        count = run_batch(graph, read_queries(queries_file), output_file, args.workers, args.landmarks, cache,
+                          components)
+    finally:
+        if queries_file is not sys.stdin:
+            queries_file.close()
+        if output_file is not sys.stdout:
+            output_file.close()
+
+    print("Answered {} queries".format(count), file=sys.stderr)
+    if cache is not None:
+        print("Cache: {}".format(cache.get_stats()), file=sys.stderr)
+
+
+def targets(args):
+    """
+    Method to find the paths from the start of the maze in an input file to a list of targets, using a distance field
+    of the start, and write their results to an output file.
+
+    Args:
+        args(Namespace): Parsed command line arguments.
+
+    """
+    algorithm, start, _, graph = load_maze(args.input)
+
+    # The distance field is searched with BFS if the maze's algorithm treats every action as costing 1. A saved field
+    # must have been built the same way from the start of the maze.
+    unit_cost = algorithm in UNIT_COST_ALGORITHMS
+    if args.field is not None:
+        field = load_distance_field(args.field, graph, start, unit_cost)
+    else:
+        field = build_distance_field(graph, start, unit_cost=unit_cost)
+        if field is not None and args.save is not None:
+            write_distance_field(args.save, field, graph)
+
+    targets_file = sys.stdin if args.targets == "-" else open(args.targets, 'r')
+    output_file = sys.stdout if args.output == "-" else open(args.output, 'w')
+    try:
+        count = 0
+        for target in read_targets(targets_file):
+            success, path, cost = (False, [], None) if field is None else field.get_path(target)
+            output_file.write(format_result("{} {} {}".format(target.x, target.y, target.z), success, path, cost))
+            count += 1
+    finally:
+        if targets_file is not sys.stdin:
+            targets_file.close()
+        if output_file is not sys.stdout:
+            output_file.close()
+
+    print("Answered {} targets".format(count), file=sys.stderr)
+
+
+def decode(args):
+    """
+    Method to decode a path written in the action format into the text format.
+
+    Args:
+        args(Namespace): Parsed command line arguments.
+
+    """
+    decode_action_path(args.input, args.output)
+
+
+def serve(args):
+    """
+    Method to load mazes and answer queries against them over a socket until interrupted.
+
+    Args:
+        args(Namespace): Parsed command line arguments.
+
+    """
+    cache = PathCache(args.cache_size << 20) if args.cache_size > 0 else None
+    with MazeServer(parse_maze_names(args.mazes), args.workers, cache, args.components) as server:
+        try:
+            asyncio.run(server.serve(args.socket, args.host, args.port))
+        except KeyboardInterrupt:
+            pass
+
+    if cache is not None:
+        print("Cache: {}".format(cache.get_stats()), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    # Getting args.
+    if len(sys.argv) > 1 and sys.argv[1] == "compile":
+        parser = argparse.ArgumentParser(prog="main.py compile",
+                                         description='Module to compile a maze into a binary file for fast loading.')
+        parser.add_argument("input", type=str, help="Input file path containing the graph and node information.")
+        parser.add_argument("output", type=str, help="Output file path to write the compiled maze to.")
+        compile_maze(parser.parse_args(sys.argv[2:]))
+
+    elif len(sys.argv) > 1 and sys.argv[1] == "landmarks":
+        parser = argparse.ArgumentParser(prog="main.py landmarks",
+                                         description='Module to precompute the landmarks used by the ALT heuristic.')
+        parser.add_argument("input", type=str,
+                            help="Input file path containing the graph and node information, or a compiled maze.")
+        parser.add_argument("output", type=str, help="Output file path to write the landmarks to.")
+        parser.add_argument("-k", "--count", type=int, default=8, help="Number of landmarks to pick. Defaults to 8.")
+        precompute_landmarks(parser.parse_args(sys.argv[2:]))
+
+    elif len(sys.argv) > 1 and sys.argv[1] == "batch":
+        parser = argparse.ArgumentParser(prog="main.py batch",
+                                         description='Module to answer a batch of queries against a single maze.')
+        parser.add_argument("input", type=str,
+                            help="Input file path containing the graph and node information, or a compiled maze.")
+        parser.add_argument("queries", type=str,
+                            help="File path containing one 'algorithm sx sy sz ex ey ez' query per line, or - for "
+                                 "stdin.")
+        parser.add_argument("-o", "--output", type=str, default="-",
+                            help="Output file to store one result per query, or - for stdout. Defaults to stdout.")
+        parser.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 1,
+                            help="Number of worker processes to answer the queries with. Defaults to the CPU count.")
+        parser.add_argument("--landmarks", type=str, default=None,
+                            help="Landmark file of the maze, used by the A* algorithm for the ALT heuristic.")
+        parser.add_argument("--cache-size", type=int, default=0,
+                            help="Memory bound of the cache of repeated queries, in MiB. Defaults to 0, which disables "
+                                 "the memory tier of the cache.")
+        parser.add_argument("--cache-dir", type=str, default=None,
+                            help="Directory of the disk tier of the cache of repeated queries, shared between runs.")
+        parser.add_argument("--components", action="store_true",
+                            help="Build the connected components of the maze first, to reject queries without a path "
+                                 "without searching.")
+        batch(parser.parse_args(sys.argv[2:]))
+
+    elif len(sys.argv) > 1 and sys.argv[1] == "targets":
+        parser = argparse.ArgumentParser(prog="main.py targets",
+                                         description='Module to find the paths from the start of a maze to many '
+                                                     'targets.')
+        parser.add_argument("input", type=str,
+                            help="Input file path containing the graph and node information, or a compiled maze.")
+        parser.add_argument("targets", type=str,
+                            help="File path containing one 'x y z' target per line, or - for stdin.")
+        parser.add_argument("-o", "--output", type=str, default="-",
+                            help="Output file to store one result per target, or - for stdout. Defaults to stdout.")
+        parser.add_argument("--field", type=str, default=None,
+                            help="Distance field file to answer the targets from, instead of searching the maze.")
+        parser.add_argument("--save", type=str, default=None,
+                            help="File path to save the distance field of the start to, for later runs.")
+        targets(parser.parse_args(sys.argv[2:]))
+
+    elif len(sys.argv) > 1 and sys.argv[1] == "decode":
+        parser = argparse.ArgumentParser(prog="main.py decode",
+                                         description='Module to decode a path in the action format into the text '
+                                                     'format.')
+        parser.add_argument("input", type=str, help="Output file path containing a path in the action format.")
+        parser.add_argument("output", type=str, help="Output file path to write the path in the text format to.")
+        decode(parser.parse_args(sys.argv[2:]))
+
+    elif len(sys.argv) > 1 and sys.argv[1] == "serve":
+        parser = argparse.ArgumentParser(prog="main.py serve",
+                                         description='Module to answer queries against mazes kept in memory over a '
+                                                     'socket.')
+        parser.add_argument("mazes", nargs='+', type=str,
+                            help="Mazes to load, as name=path or as a path named after its file. Each path is an "
+                                 "input file containing the graph and node information, or a compiled maze.")
+        parser.add_argument("--socket", type=str, default=None,
+                            help="Path of a Unix socket to listen on, instead of a TCP socket.")
+        parser.add_argument("--host", type=str, default="127.0.0.1",
+                            help="Host of the TCP socket to listen on. Defaults to 127.0.0.1.")
+        parser.add_argument("--port", type=int, default=0,
+                            help="Port of the TCP socket to listen on. Defaults to any free port.")
+        parser.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 1,
+                            help="Number of worker processes to answer the queries with. Defaults to the CPU count.")
+        parser.add_argument("--cache-size", type=int, default=0,
+                            help="Memory bound of the cache of repeated queries, in MiB. Defaults to 0, which disables "
+                                 "the cache.")
+        parser.add_argument("--components", action="store_true",
+                            help="Build the connected components of each maze when it is loaded, to reject queries "
+                                 "without a path without searching.")
+        serve(parser.parse_args(sys.argv[2:]))
+
     else:
-        with open(output_file_path, 'w') as f:
-            f.truncate(0)
-            f.write("FAIL\n")
+        parser = argparse.ArgumentParser(
+            description='Module to perform pathfinding in graphs using different algorithms.')
+        parser.add_argument("input", nargs='?', type=str, default="input.txt",
+                            help="Input file path containing the graph and node information, or a compiled maze.")
+        parser.add_argument("-o", "--output", type=str, default="output.txt",
+                            help="Output file to store the results of the pathfinding algorithms.")
+        parser.add_argument("--reference-graph", action="store_true",
+                            help="Use the reference node based graph instead of the compact grid graph.")
+        parser.add_argument("--queue", choices=sorted(PRIORITY_QUEUES), default="heap",
+                            help="Priority queue used by the UCS and A* algorithms. Defaults to heap.")
+        parser.add_argument("--landmarks", type=str, default=None,
+                            help="Landmark file of the maze, used by the A* algorithm for the ALT heuristic.")
+        parser.add_argument("--cache-dir", type=str, default=None,
+                            help="Directory of a cache of paths shared between runs, used to answer repeated runs.")
+        parser.add_argument("--stats", type=str, default=None,
+                            help="File to write the search counters and the seconds taken by each phase to as JSON, "
+                                 "or - for stdout. The search phase includes the reconstruct phase.")
+        parser.add_argument("--components", action="store_true",
+                            help="Build the connected components of the maze first, to reject a query without a path "
+                                 "without searching.")
+        parser.add_argument("--weight", type=float, default=None,
+                            help="Weight of the heuristic of the WA* and ARA* algorithms, bounding the cost of the "
+                                 "path to the weight times the cheapest path. Defaults to 2 for WA* and 3 for ARA*.")
+        parser.add_argument("--time-limit", type=float, default=None,
+                            help="Seconds the ARA* algorithm improves its path for. Defaults to 1.")
+        parser.add_argument("--format", choices=("text", "rle"), default="text",
+                            help="Format of the output file: a line per point of the path, or the start and the runs "
+                                 "of actions taken from it, which 'main.py decode' turns back into text. Defaults to "
+                                 "text.")
+        parser.add_argument("--memory-budget", type=float, default=None,
+                            help="MiB of frontier the BFS-EXTERNAL and UCS-EXTERNAL algorithms hold in memory before "
+                                 "spilling it to disk. Defaults to 64.")
+        parser.add_argument("--spill-dir", type=str, default=None,
+                            help="Directory the BFS-EXTERNAL and UCS-EXTERNAL algorithms write their temporary files "
+                                 "to. Defaults to the system's temporary directory.")
+        parser.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 1,
+                            help="Number of worker processes the BFS-PARALLEL and UCS-PARALLEL algorithms split the "
+                                 "maze between. Defaults to the number of CPUs.")
+        parser.add_argument("--reduce", action="store_true",
+                            help="Prune dead ends and contract corridors of the maze first, and search the reduced "
+                                 "maze with the UCS, A*, WA*, ARA* and BI-A* algorithms.")
+        parser.add_argument("--goals", choices=("nearest", "all"), default="nearest",
+                            help="For a maze with several goals, whether to write the path to the nearest goal, or "
+                                 "one result line per goal with the UCS and A* algorithms. Defaults to nearest.")
+        solve(parser.parse_args())
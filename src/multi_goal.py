@@ -0,0 +1,149 @@
+"""
+Maze Solver - Multi Goal Search
+
+A module implementing UCS and A* searches from a start node to a set of goal nodes in a single pass. The nearest goal
+search stops at the first goal it reaches, which is the cheapest goal to reach, and the all goals search carries on
+until every goal is reached, and returns a path to each of them from the same search.
+
+The A* heuristic of a node is its grid distance to the closest goal. Each grid distance never overestimates the cost to
+its goal and never drops by more than the cost of an action, so their minimum does neither for the whole set, and every
+goal is reached with its cheapest path.
+
+Author: shravan@usc.edu (5451873903)
+
+"""
+
+import heapq
+
+from instrumentation import record_search
+from search_state import get_search_state
+from utils import get_path
+from vector import grid_distance
+
+
+# Names of the goal searches, by whether they use the A* heuristic.
+GOAL_SEARCHES = {False: "UCS", True: "A*"}
+
+
+def nearest_goal_search(graph, start, goals, heuristic=False):
+    """
+    This is a function finding the cheapest path from a start node to the nearest of a set of goal nodes.
+
+    Args:
+        graph(Graph): Graph to perform the pathfinding on.
+        start(Vector): Position to start the search at.
+        goals(list): Positions of the goal nodes.
+        heuristic(bool): Whether to search with the A* heuristic rather than as UCS. Defaults to False.
+
+    Returns:
+        (success, path, cost): Whether a path was found, path from the start node to the nearest goal node in the graph
+            and the cost of each point in the path.
+
+    """
+    state, reached = _search_goals(graph, start, goals, heuristic, True)
+    if len(reached) == 0:
+        return False, [], None
+
+    return True, get_path(graph, state, reached[0]), state.get_cost(reached[0])
+
+
+def all_goals_search(graph, start, goals, heuristic=False):
+    """
+    This is a function finding the cheapest path from a start node to each of a set of goal nodes, with a single search
+    which carries on until every goal node is reached.
+
+    Args:
+        graph(Graph): Graph to perform the pathfinding on.
+        start(Vector): Position to start the search at.
+        goals(list): Positions of the goal nodes.
+        heuristic(bool): Whether to search with the A* heuristic rather than as UCS. Defaults to False.
+
+    Returns:
+        (results): List of (success, path, cost) results, one for each goal in the order of the goals.
+
+    """
+    state, reached = _search_goals(graph, start, goals, heuristic, False)
+    reached = set(reached)
+
+    results = []
+    for goal in goals:
+        goal_node = graph.get_index(goal)
+        if goal_node in reached:
+            results.append((True, get_path(graph, state, goal_node), state.get_cost(goal_node)))
+        else:
+            results.append((False, [], None))
+
+    return results
+
+
+def _search_goals(graph, start, goals, heuristic, nearest):
+    """
+    Method to search a graph from a start node until the nearest goal node, or every goal node, is reached.
+
+    Args:
+        graph(Graph): Graph to perform the pathfinding on.
+        start(Vector): Position to start the search at.
+        goals(list): Positions of the goal nodes.
+        heuristic(bool): Whether to search with the A* heuristic rather than as UCS.
+        nearest(bool): Whether to stop at the first goal node reached.
+
+    Returns:
+        (state, reached): State of the search, holding the path to every goal node reached, and the indices of the
+            goal nodes reached in the order they were reached.
+
+    """
+    algorithm = "{}-{}".format(GOAL_SEARCHES[heuristic], "NEAREST" if nearest else "ALL")
+
+    # Get the start and goal nodes from the graph.
+    start_node = graph.get_index(start)
+    remaining = set(node for node in (graph.get_index(goal) for goal in goals) if node is not None)
+
+    state = get_search_state(graph)
+    if (start_node is None) or len(remaining) == 0:
+        return state, []
+
+    goal_positions = [graph.get_position(node) for node in remaining]
+
+    def get_heuristic(node):
+        if not heuristic:
+            return 0
+        position = graph.get_position(node)
+        return min(grid_distance(position, goal) for goal in goal_positions)
+
+    # Initialize the priority queue. Entries are (priority, cost, node), queued with their total cost as the priority.
+    queue = [(get_heuristic(start_node), 0, start_node)]
+    state.visit(start_node, 0, None)
+    reached = []
+    expanded, pushed, peak_frontier, lookups = 0, 1, 1, 0
+
+    # Searching the graph until the goal nodes are reached.
+    while len(queue) != 0:
+        _, node_cost, node = heapq.heappop(queue)
+
+        # Skip entries for nodes that were reached more cheaply after they were queued.
+        if node_cost > state.get_cost(node):
+            continue
+
+        if node in remaining:
+            remaining.discard(node)
+            reached.append(node)
+            if nearest or len(remaining) == 0:
+                break
+
+        successors = graph.get_successors(node)
+        expanded += 1
+        lookups += len(successors)
+
+        for neighbour, cost in successors:
+            neighbour_cost = cost + node_cost
+            if not state.is_visited(neighbour) or neighbour_cost < state.get_cost(neighbour):
+                state.visit(neighbour, neighbour_cost, node)
+                heapq.heappush(queue, (neighbour_cost + get_heuristic(neighbour), neighbour_cost, neighbour))
+                pushed += 1
+
+        if len(queue) > peak_frontier:
+            peak_frontier = len(queue)
+
+    record_search(algorithm, expanded, pushed, peak_frontier, lookups, goals=len(reached) + len(remaining),
+                  reached=len(reached))
+    return state, reached
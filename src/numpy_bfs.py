@@ -0,0 +1,103 @@
+"""
+Maze Solver - Vectorized Breadth First Search (BFS) Algorithm
+
+A module implementing a level synchronous BFS with NumPy to solve large mazes. The frontier is an array of cell indices
+over the flattened bounds of the maze, and each level is expanded at once by applying every action offset to the
+frontier cells that can take the action. The action each cell was reached with is recorded, so the path is recovered by
+walking the offsets back from the end cell.
+
+NumPy is an optional dependency. Without it, or for graphs other than grid graphs, the search falls back to the BFS
+algorithm, which finds paths of the same length.
+
+Author: shravan@usc.edu (5451873903)
+
+"""
+
+from bfs import bfs
+from graph import ACTIONS, Node
+from grid_graph import PRESENT, GridGraph
+from instrumentation import phase, record_search
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def numpy_bfs(graph, start, end):
+    """
+    This is a function implementing a vectorized Breadth First Search to find paths in a graph, given a start and end
+    node. The whole frontier is expanded one level at a time with array operations instead of one node at a time.
+
+    Args:
+        graph(GridGraph): Graph to perform the pathfinding on.
+        start(Vector): Position to start the search at.
+        end(Vector): Position to find a path to in the graph.
+
+    Returns:
+        (success, path, cost): Whether a path was found, path from the start node to the end node in the graph and the
+            cost of each point in the path.
+
+    """
+    if np is None or not isinstance(graph, GridGraph):
+        return bfs(graph, start, end)
+
+    # Get the start and end nodes from the graph.
+    start_node = graph.get_index(start)
+    end_node = graph.get_index(end)
+
+    if (start_node is None) or (end_node is None):
+        return False, [], None
+
+    cells = np.frombuffer(graph.cells, dtype=np.uintc)
+    visited = np.zeros(graph.size, dtype=np.bool_)
+    parent_actions = np.zeros(graph.size, dtype=np.uint8)
+
+    # Initialize the BFS frontier.
+    frontier = np.array([start_node], dtype=np.intp)
+    visited[start_node] = True
+    level = 0
+    expanded, pushed, peak_frontier, lookups = 0, 1, 1, 0
+
+    # Searching the graph for the end node, one level at a time.
+    while not visited[end_node]:
+        if len(frontier) == 0:
+            # If the frontier is empty without finding the end node, then we can't reach it.
+            record_search("BFS-NUMPY", expanded, pushed, peak_frontier, lookups)
+            return False, [], None
+
+        masks = cells[frontier]
+        reached = []
+        for action in ACTIONS:
+            sources = frontier[(masks & (1 << action)) != 0]
+            lookups += len(sources)
+            if len(sources) == 0:
+                continue
+
+            # Actions always stay within the bounds of the graph, so the shifted indices never wrap around a face.
+            # Cells reached by an earlier action in this level are already visited, so each cell is only kept once.
+            targets = sources + graph.offsets[action]
+            targets = targets[((cells[targets] & PRESENT) != 0) & ~visited[targets]]
+            visited[targets] = True
+            parent_actions[targets] = action
+            reached.append(targets)
+
+        expanded += len(frontier)
+        frontier = np.concatenate(reached) if len(reached) != 0 else frontier[:0]
+        pushed += len(frontier)
+        peak_frontier = max(peak_frontier, len(frontier))
+        level += 1
+
+    record_search("BFS-NUMPY", expanded, pushed, peak_frontier, lookups)
+
+    # Getting the path from the end node to the source by undoing the action each node was reached with.
+    with phase("reconstruct"):
+        nodes = [end_node]
+        while nodes[-1] != start_node:
+            nodes.append(nodes[-1] - graph.offsets[parent_actions[nodes[-1]]])
+
+        # Cost of traversing each node in BFS is 1.
+        nodes.reverse()
+        path = [Node(graph.get_position(index), cost=cost) for cost, index in enumerate(nodes)]
+
+    return True, path, level
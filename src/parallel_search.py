@@ -0,0 +1,355 @@
+"""
+Maze Solver - Parallel Search
+
+A module implementing BFS and UCS with the maze split into slabs along the z axis, each searched by its own worker
+process. The search runs in rounds in the style of delta-stepping: every round, each worker expands the cells of its
+slab in the same bucket of costs, and sends the cells it reaches in the neighbouring slabs to their workers for the next
+round. Buckets are as wide as the cheapest action, so a cell can never be reached more cheaply from a cell in its own
+bucket, and the costs found are the same as those of a single search.
+
+The cell array is copied into shared memory, along with an array of the action each cell was reached with. Each worker
+only writes the actions of its own slab, and the path is recovered from the actions once the end node is reached.
+
+Author: shravan@usc.edu (5451873903)
+
+"""
+
+import multiprocessing
+import os
+import signal
+from array import array
+from multiprocessing import shared_memory
+
+from bfs import bfs
+from graph import ACTIONS, Node, get_action_cost
+from grid_graph import PRESENT, GridGraph
+from instrumentation import phase, record_search
+from ucs import ucs
+from vector import Vector
+
+
+# Action code marking the start node, which has no parent. Codes 1 to 18 are actions.
+START_ACTION = 255
+
+
+def parallel_bfs(graph, start, end, workers=None):
+    """
+    This is a function implementing the Breadth First Search algorithm with the maze split between worker processes,
+    given a start and end node. A reference node based graph, a single worker, or a search from a daemonic process
+    such as a batch worker, is searched with the BFS algorithm.
+
+    Args:
+        graph(GridGraph): Graph to perform the pathfinding on.
+        start(Vector): Position to start the search at.
+        end(Vector): Position to find a path to in the graph.
+        workers(int): Number of worker processes, at most one per layer of the maze. Defaults to the number of CPUs.
+
+    Returns:
+        (success, path, cost): Whether a path was found, path from the start node to the end node in the graph and the
+            cost of each point in the path.
+
+    """
+    workers = _get_workers(graph, workers)
+    if workers == 1:
+        return bfs(graph, start, end)
+
+    return _parallel_search(graph, start, end, True, workers)
+
+
+def parallel_ucs(graph, start, end, workers=None):
+    """
+    This is a function implementing the Uniform Cost Search algorithm with the maze split between worker processes,
+    given a start and end node. A reference node based graph, a single worker, or a search from a daemonic process
+    such as a batch worker, is searched with the UCS algorithm.
+
+    Args:
+        graph(GridGraph): Graph to perform the pathfinding on.
+        start(Vector): Position to start the search at.
+        end(Vector): Position to find a path to in the graph.
+        workers(int): Number of worker processes, at most one per layer of the maze. Defaults to the number of CPUs.
+
+    Returns:
+        (success, path, cost): Whether a path was found, path from the start node to the end node in the graph and the
+            cost of each point in the path.
+
+    """
+    workers = _get_workers(graph, workers)
+    if workers == 1:
+        return ucs(graph, start, end)
+
+    return _parallel_search(graph, start, end, False, workers)
+
+
+def _get_workers(graph, workers):
+    """
+    Method to get the number of worker processes to split a graph between.
+
+    Args:
+        graph(Graph): Graph to perform the pathfinding on.
+        workers(int): Number of worker processes asked for, or None for the number of CPUs.
+
+    Returns:
+        (workers): Number of worker processes, which is 1 if the graph cannot be split or this process cannot start
+            worker processes of its own.
+
+    """
+    # Daemonic processes, such as the workers of a batch's pool, are not allowed to have children.
+    if not isinstance(graph, GridGraph) or multiprocessing.current_process().daemon:
+        return 1
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    return max(1, min(workers, graph.bounds.z))
+
+
+def _parallel_search(graph, start, end, unit_cost, workers):
+    """
+    Method to search a grid graph split into slabs between worker processes, coordinating their rounds.
+
+    Args:
+        graph(GridGraph): Graph to perform the pathfinding on.
+        start(Vector): Position to start the search at.
+        end(Vector): Position to find a path to in the graph.
+        unit_cost(bool): Whether every action costs 1, as for BFS, rather than the cost of the action.
+        workers(int): Number of worker processes.
+
+    Returns:
+        (success, path, cost): Whether a path was found, path from the start node to the end node in the graph and the
+            cost of each point in the path.
+
+    """
+    algorithm = "BFS-PARALLEL" if unit_cost else "UCS-PARALLEL"
+
+    # Get the start and end nodes from the graph.
+    start_node = graph.get_index(start)
+    end_node = graph.get_index(end)
+
+    if (start_node is None) or (end_node is None):
+        return False, [], None
+
+    bounds = graph.bounds
+    plane = bounds.x * bounds.y
+    depth = -(-bounds.z // workers)
+    slabs = [(z * plane, min(z + depth, bounds.z) * plane) for z in range(0, bounds.z, depth)]
+
+    # Copy the cell array into shared memory, followed by the action each cell was reached with. New shared memory is
+    # zeroed, which marks every cell as not reached.
+    cells = memoryview(graph.cells).cast('B')
+    memory = shared_memory.SharedMemory(create=True, size=len(cells) + graph.size)
+    processes, connections = [], []
+    try:
+        memory.buf[:len(cells)] = cells
+
+        for slab_start, slab_end in slabs:
+            connection, child_connection = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=_run_slab, daemon=True, args=(
+                child_connection, memory.name, (bounds.x, bounds.y, bounds.z), slab_start, slab_end, depth, unit_cost,
+                end_node))
+            process.start()
+            child_connection.close()
+            processes.append(process)
+            connections.append(connection)
+
+        # Delta-stepping buckets are as wide as the cheapest action.
+        delta = 1 if unit_cost else min(get_action_cost(action) for action in ACTIONS)
+        inboxes = [[] for _ in slabs]
+        inboxes[start_node // (depth * plane)].append((start_node, 0, START_ACTION))
+        bucket = 0
+        end_cost = None
+        expanded, pushed, peak_frontier, lookups, rounds, messages = 0, 1, 1, 0, 0, 0
+
+        # Running rounds until the end node is reached or every worker runs out of cells to expand.
+        while end_cost is None and bucket is not None:
+            for connection, inbox in zip(connections, inboxes):
+                connection.send((bucket, inbox))
+
+            # The next bucket is the lowest one left in any slab or reached by the cells sent between slabs.
+            inboxes = [[] for _ in slabs]
+            next_buckets, frontier = [], 0
+            for connection in connections:
+                outboxes, next_bucket, found, counters = connection.recv()
+                if next_bucket is not None:
+                    next_buckets.append(next_bucket)
+                for worker, outbox in outboxes.items():
+                    inboxes[worker].extend(outbox)
+                    next_buckets.append(min(cost for _, cost, _ in outbox) // delta)
+                    messages += len(outbox)
+                if found is not None:
+                    end_cost = found
+
+                expanded += counters[0]
+                pushed += counters[1]
+                lookups += counters[2]
+                frontier += counters[3]
+
+            bucket = min(next_buckets) if len(next_buckets) != 0 else None
+            peak_frontier = max(peak_frontier, frontier + sum(len(inbox) for inbox in inboxes))
+            rounds += 1
+
+        record_search(algorithm, expanded, pushed, peak_frontier, lookups, workers=len(slabs), rounds=rounds,
+                      messages=messages)
+
+        if end_cost is None:
+            return False, [], None
+
+        parents = memory.buf[len(cells):len(cells) + graph.size]
+        try:
+            path = _get_path(graph, parents, end_node, unit_cost)
+        finally:
+            parents.release()
+        return True, path, end_cost
+    finally:
+        for connection in connections:
+            try:
+                connection.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+            connection.close()
+        for process in processes:
+            process.join()
+        memory.close()
+        memory.unlink()
+
+
+def _run_slab(connection, memory_name, bounds, slab_start, slab_end, depth, unit_cost, end_node):
+    """
+    Method to search a slab of the maze in a worker process. Each message from the coordinating process holds the
+    bucket to expand and the cells reached from other slabs since the last round, and is answered with the cells
+    reached in other slabs, the lowest bucket left in the slab, the cost of the end node if it was expanded and the
+    worker's counters. A message of None stops the worker.
+
+    Args:
+        connection(Connection): Connection to the coordinating process.
+        memory_name(str): Name of the shared memory block holding the cell array and the actions of the cells.
+        bounds(tuple): Bounds of the graph.
+        slab_start(int): Index of the first cell of the slab.
+        slab_end(int): Index one past the last cell of the slab.
+        depth(int): Number of layers in each slab.
+        unit_cost(bool): Whether every action costs 1, rather than the cost of the action.
+        end_node(int): Index of the end node.
+
+    """
+    # Interrupting the search stops the workers through the coordinating process.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    memory = shared_memory.SharedMemory(name=memory_name)
+    bounds = Vector(*bounds)
+    size = bounds.x * bounds.y * bounds.z
+    cells_size = size * array('I').itemsize
+    cells = memory.buf[:cells_size].cast('I')
+    parents = memory.buf[cells_size:cells_size + size]
+    graph = GridGraph(bounds, cells)
+
+    slab_cells = depth * bounds.x * bounds.y
+    delta = 1 if unit_cost else min(get_action_cost(action) for action in ACTIONS)
+    costs = array('q', [-1]) * (slab_end - slab_start)
+    settled = bytearray(slab_end - slab_start)
+    buckets = {}
+    moves_cache = {}
+
+    try:
+        while True:
+            message = connection.recv()
+            if message is None:
+                break
+
+            bucket, inbox = message
+            outboxes = {}
+            found = None
+            expanded, pushed, lookups = 0, 0, 0
+
+            # Cells reached from other slabs are relaxed like cells reached from this one.
+            for node, cost, action in inbox:
+                local = node - slab_start
+                if not settled[local] and (costs[local] < 0 or cost < costs[local]):
+                    costs[local] = cost
+                    parents[node] = action
+                    buckets.setdefault(cost // delta, []).append(node)
+                    pushed += 1
+
+            for node in buckets.pop(bucket, []):
+                local = node - slab_start
+                if settled[local]:
+                    continue
+                settled[local] = 1
+
+                cost = costs[local]
+                if node == end_node:
+                    found = cost
+                    break
+
+                mask = cells[node]
+                moves = moves_cache.get(mask)
+                if moves is None:
+                    moves = moves_cache[mask] = tuple((action, graph.offsets[action],
+                                                       1 if unit_cost else get_action_cost(action))
+                                                      for action in ACTIONS if mask & (1 << action))
+
+                expanded += 1
+                lookups += len(moves)
+                for action, offset, action_cost in moves:
+                    neighbour = node + offset
+                    if not cells[neighbour] & PRESENT:
+                        continue
+
+                    neighbour_cost = cost + action_cost
+                    if slab_start <= neighbour < slab_end:
+                        local = neighbour - slab_start
+                        if not settled[local] and (costs[local] < 0 or neighbour_cost < costs[local]):
+                            costs[local] = neighbour_cost
+                            parents[neighbour] = action
+                            buckets.setdefault(neighbour_cost // delta, []).append(neighbour)
+                            pushed += 1
+                    else:
+                        # Only the cheapest way this round of reaching a cell in another slab is sent.
+                        outbox = outboxes.setdefault(neighbour // slab_cells, {})
+                        previous = outbox.get(neighbour)
+                        if previous is None or neighbour_cost < previous[0]:
+                            outbox[neighbour] = (neighbour_cost, action)
+
+            outboxes = dict((worker, [(node, cost, action) for node, (cost, action) in outbox.items()])
+                            for worker, outbox in outboxes.items())
+            frontier = sum(len(cells_in_bucket) for cells_in_bucket in buckets.values())
+            connection.send((outboxes, min(buckets) if len(buckets) != 0 else None, found,
+                             (expanded, pushed, lookups, frontier)))
+    finally:
+        del graph
+        cells.release()
+        parents.release()
+        memory.close()
+        connection.close()
+
+
+def _get_path(graph, parents, end, unit_cost):
+    """
+    Method to get the path to a node by undoing the actions recorded for each cell, from the end node back to the
+    start node.
+
+    Args:
+        graph(GridGraph): Graph the pathfinding was performed on.
+        parents(memoryview): Action each cell was reached with.
+        end(int): Index of the node to get the path to.
+        unit_cost(bool): Whether every action costs 1, rather than the cost of the action.
+
+    Returns:
+        (path): List of nodes from the start node to the end node, with the cost of reaching each node set.
+
+    """
+    with phase("reconstruct"):
+        nodes = [end]
+        actions = []
+        action = parents[end]
+        while action != START_ACTION:
+            actions.append(action)
+            nodes.append(nodes[-1] - graph.offsets[action])
+            action = parents[nodes[-1]]
+
+        nodes.reverse()
+        actions.reverse()
+
+        path = [Node(graph.get_position(nodes[0]), cost=0)]
+        for node, action in zip(nodes[1:], actions):
+            path.append(Node(graph.get_position(node), cost=path[-1].cost + (1 if unit_cost else
+                                                                               get_action_cost(action))))
+
+    return path
@@ -0,0 +1,419 @@
+"""
+Maze Solver - Path Cache
+
+This module implements a cache of pathfinding results, so that repeated queries against the same maze are answered
+without searching again. Results are kept in memory up to a bound on their size, evicting the least recently used
+results first, and can also be written to a directory shared between processes and runs.
+
+Results are keyed by the query and by a hash of the contents of the graph. The hash is recomputed whenever the graph's
+version changes, so editing a graph invalidates every result cached for it. The bounded suboptimal algorithms are never
+cached, as their paths depend on their weight and time limit, which are not part of the query.
+
+Author: shravan@usc.edu (5451873903)
+
+"""
+
+import hashlib
+import os
+import struct
+import tempfile
+import threading
+import weakref
+from array import array
+from collections import OrderedDict
+
+from algorithms import ALGORITHMS, ANYTIME_ALGORITHMS, WEIGHTED_ALGORITHMS
+from graph import Node, position_to_index
+from grid_graph import PRESENT
+
+
+# Default bound on the memory used by the cached results, in bytes.
+MAX_BYTES = 64 << 20
+
+# Estimate of the memory used by a cached result, besides its path.
+ENTRY_OVERHEAD = 256
+
+# Algorithms whose paths depend on arguments besides the query, such as the weight of WA* and ARA* and the time limit
+# of ARA*, so their results are never cached.
+UNCACHED_ALGORITHMS = WEIGHTED_ALGORITHMS + ANYTIME_ALGORITHMS
+
+# Layout of a result in the disk tier: whether a path was found and its cost, followed by the path.
+RESULT_HEADER = struct.Struct("=?q")
+
+
+class PathCache(object):
+    """
+    A class that implements a least recently used cache of pathfinding results, with an optional disk tier.
+    """
+
+    def __init__(self, max_bytes=MAX_BYTES, directory=None):
+        """
+        Method to initialize the path cache.
+
+        Args:
+            max_bytes(int): Bound on the memory used by the cached results, in bytes. Defaults to MAX_BYTES.
+            directory(str): Directory of the disk tier, created if it does not exist. Defaults to no disk tier.
+
+        """
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.size = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._graph_hashes = weakref.WeakKeyDictionary()
+        self._lock = threading.RLock()
+
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def __len__(self):
+        """
+        Method to get the number of results cached in memory.
+
+        Returns:
+            (int): Number of results cached in memory.
+
+        """
+        return len(self._entries)
+
+    def get_stats(self):
+        """
+        Method to get the counters of the cache, for monitoring.
+
+        Returns:
+            (stats): Map of the counter names to their values.
+
+        """
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self.size, "hits": self.hits,
+                    "disk_hits": self.disk_hits, "misses": self.misses, "evictions": self.evictions}
+
+    def search(self, graph, algorithm, start, end, **options):
+        """
+        Method to find a path with a pathfinding algorithm, answering from the cache if the query has been answered
+        before for the same graph contents.
+
+        Args:
+            graph(Graph): Graph to perform the pathfinding on.
+            algorithm(str): Name of the pathfinding algorithm.
+            start(Vector): Position to start the search at.
+            end(Vector): Position to find a path to in the graph.
+            options(dict): Extra arguments of the algorithm, which must not change the cost of the path found unless
+                the algorithm is one of UNCACHED_ALGORITHMS.
+
+        Returns:
+            (success, path, cost): Whether a path was found, path from the start node to the end node in the graph and
+                the cost of each point in the path.
+
+        """
+        result = self.get(graph, algorithm, start, end)
+        if result is None:
+            result = ALGORITHMS[algorithm](graph, start, end, **options)
+            self.put(graph, algorithm, start, end, result)
+
+        return result
+
+    def get(self, graph, algorithm, start, end):
+        """
+        Method to get a cached result.
+
+        Args:
+            graph(Graph): Graph the query is against.
+            algorithm(str): Name of the pathfinding algorithm.
+            start(Vector): Start position of the query.
+            end(Vector): End position of the query.
+
+        Returns:
+            (success, path, cost): Cached result of the query, or None if the query is not cached or its algorithm is
+                one of UNCACHED_ALGORITHMS.
+
+        """
+        if algorithm in UNCACHED_ALGORITHMS:
+            return None
+
+        with self._lock:
+            key = self._get_key(graph, algorithm, start, end)
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return _unpack_result(graph, entry)
+
+            entry = self._read_entry(key)
+            if entry is not None:
+                self._add_entry(key, entry)
+                self.disk_hits += 1
+                return _unpack_result(graph, entry)
+
+            self.misses += 1
+            return None
+
+    def put(self, graph, algorithm, start, end, result):
+        """
+        Method to cache the result of a query. Results of UNCACHED_ALGORITHMS are dropped.
+
+        Args:
+            graph(Graph): Graph the query is against.
+            algorithm(str): Name of the pathfinding algorithm.
+            start(Vector): Start position of the query.
+            end(Vector): End position of the query.
+            result(tuple): Result of the query, as a (success, path, cost) tuple.
+
+        """
+        if algorithm in UNCACHED_ALGORITHMS:
+            return
+
+        with self._lock:
+            key = self._get_key(graph, algorithm, start, end)
+            entry = _pack_result(graph, result)
+            self._add_entry(key, entry)
+            self._write_entry(key, entry)
+
+    def clear(self):
+        """
+        Method to drop every result cached in memory. The disk tier is kept.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def _get_key(self, graph, algorithm, start, end):
+        """
+        Method to get the cache key of a query.
+
+        Args:
+            graph(Graph): Graph the query is against.
+            algorithm(str): Name of the pathfinding algorithm.
+            start(Vector): Start position of the query.
+            end(Vector): End position of the query.
+
+        Returns:
+            (key): Key of the query.
+
+        """
+        return "{} {} {} {} {} {} {} {}".format(self._get_graph_hash(graph), algorithm, start.x, start.y, start.z,
+                                                end.x, end.y, end.z)
+
+    def _get_graph_hash(self, graph):
+        """
+        Method to get the hash of the contents of a graph. The hash is only recomputed when the graph's version
+        changes, and the results cached for the previous contents are dropped then.
+
+        Args:
+            graph(Graph): Graph to get the hash of.
+
+        Returns:
+            (hash): Hex digest of the graph's contents.
+
+        """
+        cached = self._graph_hashes.get(graph)
+        if cached is not None and cached[0] == graph.version:
+            return cached[1]
+
+        graph_hash = get_graph_hash(graph)
+        self._graph_hashes[graph] = (graph.version, graph_hash)
+
+        if cached is not None and cached[1] != graph_hash:
+            prefix = cached[1] + " "
+            for key in [key for key in self._entries if key.startswith(prefix)]:
+                self._remove_entry(key)
+
+        return graph_hash
+
+    def _add_entry(self, key, entry):
+        """
+        Method to add an entry to the memory tier, evicting the least recently used entries to stay within the bound.
+
+        Args:
+            key(str): Key of the entry.
+            entry(tuple): Packed result.
+
+        """
+        if key in self._entries:
+            self._remove_entry(key)
+
+        size = _get_entry_size(entry)
+        if size > self.max_bytes:
+            return
+
+        self._entries[key] = entry
+        self.size += size
+        while self.size > self.max_bytes:
+            self._remove_entry(next(iter(self._entries)))
+            self.evictions += 1
+
+    def _remove_entry(self, key):
+        """
+        Method to remove an entry from the memory tier.
+
+        Args:
+            key(str): Key of the entry.
+
+        """
+        self.size -= _get_entry_size(self._entries.pop(key))
+
+    def _get_entry_path(self, key):
+        """
+        Method to get the path of the file holding an entry in the disk tier.
+
+        Args:
+            key(str): Key of the entry.
+
+        Returns:
+            (path): Path of the entry's file.
+
+        """
+        return os.path.join(self.directory, hashlib.sha1(key.encode()).hexdigest() + ".path")
+
+    def _read_entry(self, key):
+        """
+        Method to read an entry from the disk tier.
+
+        Args:
+            key(str): Key of the entry.
+
+        Returns:
+            (entry): Packed result, or None if there is no disk tier or the entry is not in it.
+
+        """
+        if self.directory is None:
+            return None
+
+        try:
+            with open(self._get_entry_path(key), 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+
+        # Each file starts with the key it holds, which guards against hash collisions.
+        key_bytes = key.encode() + b"\n"
+        if not data.startswith(key_bytes):
+            return None
+
+        success, cost = RESULT_HEADER.unpack_from(data, len(key_bytes))
+        path = array('I')
+        path.frombytes(data[len(key_bytes) + RESULT_HEADER.size:])
+        return success, cost, path
+
+    def _write_entry(self, key, entry):
+        """
+        Method to write an entry to the disk tier. The file is written under a temporary name and renamed into place,
+        so other processes sharing the directory never read a partly written entry.
+
+        Args:
+            key(str): Key of the entry.
+            entry(tuple): Packed result.
+
+        """
+        if self.directory is None:
+            return
+
+        success, cost, path = entry
+        descriptor, temporary_path = tempfile.mkstemp(dir=self.directory)
+        with os.fdopen(descriptor, 'wb') as f:
+            f.write(key.encode() + b"\n")
+            f.write(RESULT_HEADER.pack(success, cost))
+            f.write(path.tobytes())
+        os.replace(temporary_path, self._get_entry_path(key))
+
+
+def get_graph_hash(graph):
+    """
+    Method to get a hash of the contents of a graph. The hash is taken over the action mask of every cell in index
+    order, which is the same for a Graph and a GridGraph of the same maze, so they have the same hash.
+
+    Args:
+        graph(Graph): Graph to get the hash of. Either a Graph or a GridGraph.
+
+    Returns:
+        (hash): Hex digest of the graph's contents.
+
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update("{} {} {}\n".format(graph.bounds.x, graph.bounds.y, graph.bounds.z).encode())
+    digest.update(memoryview(_get_cell_masks(graph)).cast('B'))
+    return digest.hexdigest()
+
+
+def _pack_result(graph, result):
+    """
+    Method to pack a result into a compact entry, with the path stored as pairs of cell indices and costs.
+
+    Args:
+        graph(Graph): Graph the result was found in.
+        result(tuple): Result of a query, as a (success, path, cost) tuple.
+
+    Returns:
+        (entry): Packed result, as a (success, cost, path) tuple.
+
+    """
+    success, path, cost = result
+    packed = array('I')
+    for node in path:
+        packed.append(graph.get_index(node.position))
+        packed.append(node.cost)
+
+    return success, -1 if cost is None else cost, packed
+
+
+def _unpack_result(graph, entry):
+    """
+    Method to unpack an entry into a result.
+
+    Args:
+        graph(Graph): Graph the result was found in.
+        entry(tuple): Packed result, as a (success, cost, path) tuple.
+
+    Returns:
+        (success, path, cost): Whether a path was found, path from the start node to the end node in the graph and the
+            cost of each point in the path.
+
+    """
+    success, cost, packed = entry
+    path = [Node(graph.get_position(packed[i]), cost=packed[i + 1]) for i in range(0, len(packed), 2)]
+    return success, path, None if cost == -1 else cost
+
+
+def _get_entry_size(entry):
+    """
+    Method to estimate the memory used by an entry.
+
+    Args:
+        entry(tuple): Packed result.
+
+    Returns:
+        (size): Estimated size of the entry, in bytes.
+
+    """
+    return ENTRY_OVERHEAD + len(entry[2]) * entry[2].itemsize
+
+
+def _get_cell_masks(graph):
+    """
+    Method to get the action mask of every cell of a graph, as held in the cell array of a grid graph. Actions of a
+    reference graph leading out of its bounds are dropped, as a grid graph drops them.
+
+    Args:
+        graph(Graph): Graph to get the masks of. Either a Graph or a GridGraph.
+
+    Returns:
+        (masks): Action mask of each cell, or 0 for cells without a node.
+
+    """
+    cells = getattr(graph, "cells", None)
+    if cells is not None:
+        return cells
+
+    bounds = graph.bounds
+    masks = array('I', [0]) * (bounds.x * bounds.y * bounds.z)
+    for node in graph.nodes.values():
+        mask = PRESENT
+        for action, neighbour in node.neighbours.items():
+            if 0 <= neighbour.x < bounds.x and 0 <= neighbour.y < bounds.y and 0 <= neighbour.z < bounds.z:
+                mask |= 1 << action
+        masks[position_to_index(node.position, bounds)] = mask
+
+    return masks
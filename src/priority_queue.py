@@ -0,0 +1,130 @@
+"""
+Maze Solver - Priority Queues
+
+This module implements the priority queues used by the UCS and A* algorithms. Each queue holds (priority, item) pairs
+and pops the pair with the lowest priority first.
+
+Author: shravan@usc.edu (5451873903)
+
+"""
+
+import heapq
+
+
+class HeapQueue(object):
+    """
+    A class that implements a priority queue on a binary heap. Priorities can be any comparable values, and pairs with
+    equal priorities are popped in the order of their items.
+    """
+
+    def __init__(self):
+        """
+        Method to initialize the heap queue.
+        """
+        self.heap = []
+
+    def __len__(self):
+        """
+        Method to get the number of pairs in the queue.
+
+        Returns:
+            (int): Number of pairs in the queue.
+
+        """
+        return len(self.heap)
+
+    def push(self, priority, item):
+        """
+        Method to add an item to the queue.
+
+        Args:
+            priority(object): Priority of the item.
+            item(object): Item to add.
+
+        """
+        heapq.heappush(self.heap, (priority, item))
+
+    def pop(self):
+        """
+        Method to remove the item with the lowest priority from the queue.
+
+        Returns:
+            (priority, item): Priority of the item and the item.
+
+        """
+        return heapq.heappop(self.heap)
+
+
+class BucketQueue(object):
+    """
+    A class that implements a priority queue on buckets of items with the same integer priority (Dial's algorithm).
+    Pushing and popping take constant time when priorities never drop below the last popped priority, which holds for
+    UCS and for A* with a consistent heuristic, as the priorities then only grow by small steps. Pairs with equal
+    priorities are popped last in, first out.
+    """
+
+    def __init__(self):
+        """
+        Method to initialize the bucket queue.
+        """
+        self.buckets = {}
+        self.current = None
+        self.size = 0
+
+    def __len__(self):
+        """
+        Method to get the number of pairs in the queue.
+
+        Returns:
+            (int): Number of pairs in the queue.
+
+        """
+        return self.size
+
+    def push(self, priority, item):
+        """
+        Method to add an item to the queue.
+
+        Args:
+            priority(int): Priority of the item.
+            item(object): Item to add.
+
+        """
+        bucket = self.buckets.get(priority)
+        if bucket is None:
+            bucket = self.buckets[priority] = []
+        bucket.append(item)
+
+        if self.current is None or priority < self.current:
+            self.current = priority
+        self.size += 1
+
+    def pop(self):
+        """
+        Method to remove the item with the lowest priority from the queue.
+
+        Returns:
+            (priority, item): Priority of the item and the item.
+
+        """
+        if self.size == 0:
+            raise IndexError("pop from an empty bucket queue")
+
+        # Move up to the next non-empty bucket. Empty buckets are removed as soon as they are emptied.
+        while self.current not in self.buckets:
+            self.current += 1
+
+        bucket = self.buckets[self.current]
+        item = bucket.pop()
+        if len(bucket) == 0:
+            del self.buckets[self.current]
+
+        self.size -= 1
+        return self.current, item
+
+
+# Map of priority queue names to the classes implementing them.
+PRIORITY_QUEUES = {
+    "heap": HeapQueue,
+    "bucket": BucketQueue
+}
@@ -0,0 +1,241 @@
+"""
+Maze Solver - Reduced Graph
+
+This module implements an offline reduction of a maze for mazes made mostly of one cell wide corridors and dead end
+pockets, where searches spend most of their expansions walking down corridors one cell at a time.
+
+Dead ends are pruned first. A node with at most one neighbour, or which can only be entered or only be left, cannot lie
+on a path between two other nodes, so it is removed, along with the nodes that become dead ends once it is gone. Then
+each chain of corridor nodes, which have exactly two neighbours, is contracted into a single weighted edge between the
+nodes at its ends. The edge remembers the nodes it skips, so a path found on the reduced graph is expanded back into a
+path over every node of the maze.
+
+Neither step changes the cost of the cheapest path between the nodes kept, so searches on the reduced graph find paths
+of the same cost. The start and end of the queries to answer must be kept, as they are not on a path between two other
+nodes.
+
+Author: shravan@usc.edu (5451873903)
+
+"""
+
+from collections import deque
+
+from components import get_nodes
+from graph import Node
+
+
+class ReducedGraph(object):
+    """
+    A class that implements a reduced graph of a maze, which exposes the same index based interface as the Graph class
+    over the nodes kept by the reduction, so it can be used by the pathfinding algorithms which only use that
+    interface. Nodes keep their cell index in the original graph.
+    """
+
+    def __init__(self, graph, edges, paths, pruned, contracted):
+        """
+        Method to initialize the reduced graph.
+
+        Args:
+            graph(Graph): Graph the reduction was built from. Either a Graph or a GridGraph.
+            edges(dict): Map of each node kept to its list of (neighbour index, cost) pairs.
+            paths(dict): Map of the (node, neighbour) pairs of contracted edges to the nodes they skip, as a tuple of
+                (index, cost from the node) pairs in the order they are passed.
+            pruned(int): Number of nodes removed as dead ends.
+            contracted(int): Number of nodes removed by contracting corridors.
+
+        """
+        self.graph = graph
+        self.bounds = graph.bounds
+        self.size = graph.size
+        self.version = graph.version
+        self.edges = edges
+        self.paths = paths
+        self.pruned = pruned
+        self.contracted = contracted
+        self._predecessors = None
+
+    def __repr__(self):
+        """
+        Method to represent a reduced graph as a string.
+
+        Returns:
+            (str): String representation of a reduced graph.
+
+        """
+        return "Bounds: {}, Nodes: {}, Pruned: {}, Contracted: {}".format(self.bounds, len(self.edges), self.pruned,
+                                                                         self.contracted)
+
+    def get_index(self, position):
+        """
+        Method to get the cell index of the node at a given position.
+
+        Args:
+            position(Vector): Position to get the index for.
+
+        Returns:
+            (index): Index of the node at the position, or None if there is no node at the position or it was removed
+                by the reduction.
+
+        """
+        index = self.graph.get_index(position)
+        return index if index in self.edges else None
+
+    def get_position(self, index):
+        """
+        Method to get the position of a cell index.
+
+        Args:
+            index(int): Index of the cell.
+
+        Returns:
+            (position): Position vector of the cell.
+
+        """
+        return self.graph.get_position(index)
+
+    def get_successors(self, index):
+        """
+        Method to get the neighbours of the node at a cell index along with the cost of reaching them, following
+        contracted corridors to their ends.
+
+        Args:
+            index(int): Index of the node to get the neighbours for.
+
+        Returns:
+            (successors): List of (neighbour index, cost) pairs for the node.
+
+        """
+        return self.edges.get(index, [])
+
+    def get_predecessors(self, index):
+        """
+        Method to get the nodes which have an edge leading to the node at a cell index, along with the cost of that
+        edge. The reverse adjacency is built for the whole graph the first time this is called.
+
+        Args:
+            index(int): Index of the node to get the predecessors for.
+
+        Returns:
+            (predecessors): List of (predecessor index, cost) pairs for the node.
+
+        """
+        if self._predecessors is None:
+            predecessors = {}
+            for node, successors in self.edges.items():
+                for neighbour, cost in successors:
+                    predecessors.setdefault(neighbour, []).append((node, cost))
+            self._predecessors = predecessors
+
+        return self._predecessors.get(index, [])
+
+    def expand_path(self, path):
+        """
+        Method to expand a path found on the reduced graph into a path over every node of the original graph, adding
+        the nodes skipped by each contracted edge.
+
+        Args:
+            path(list): Path found on the reduced graph, with the cost of reaching each node set.
+
+        Returns:
+            (path): List of nodes from the start node to the end node, with the cost of reaching each node set.
+
+        """
+        if len(path) == 0:
+            return path
+
+        expanded = [path[0]]
+        for previous, node in zip(path, path[1:]):
+            skipped = self.paths.get((self.graph.get_index(previous.position), self.graph.get_index(node.position)), ())
+            for index, cost in skipped:
+                expanded.append(Node(self.get_position(index), cost=previous.cost + cost))
+            expanded.append(node)
+
+        return expanded
+
+
+def reduce_graph(graph, keep=()):
+    """
+    Method to build the reduced graph of a graph, by pruning dead ends and contracting corridors.
+
+    Args:
+        graph(Graph): Graph to reduce. Either a Graph or a GridGraph.
+        keep(iterable): Positions of the nodes which must be kept, such as the start and end of the queries to answer.
+            Defaults to none.
+
+    Returns:
+        (reduced_graph): Reduced graph of the graph.
+
+    """
+    keep = set(index for index in (graph.get_index(position) for position in keep) if index is not None)
+
+    # Cheapest action from each node to each of its neighbours, and the reverse.
+    successors = {}
+    predecessors = {}
+    for node in get_nodes(graph):
+        node_successors = successors[node] = {}
+        for neighbour, cost in graph.get_successors(node):
+            if neighbour != node and cost < node_successors.get(neighbour, cost + 1):
+                node_successors[neighbour] = cost
+        predecessors.setdefault(node, {})
+        for neighbour, cost in node_successors.items():
+            predecessors.setdefault(neighbour, {})[node] = cost
+
+    def is_dead_end(node):
+        return node not in keep and (len(successors[node]) == 0 or len(predecessors[node]) == 0 or
+                                     len(successors[node].keys() | predecessors[node].keys()) < 2)
+
+    def is_corridor(node):
+        return node not in keep and len(successors[node].keys() | predecessors[node].keys()) == 2
+
+    # Pruning dead ends, and the nodes which become dead ends once their neighbours are pruned.
+    pruned = 0
+    queue = deque(node for node in successors if is_dead_end(node))
+    while len(queue) != 0:
+        node = queue.popleft()
+        if node not in successors:
+            continue
+
+        node_successors = successors.pop(node)
+        node_predecessors = predecessors.pop(node)
+        for neighbour in node_successors:
+            del predecessors[neighbour][node]
+        for neighbour in node_predecessors:
+            del successors[neighbour][node]
+        pruned += 1
+
+        for neighbour in node_successors.keys() | node_predecessors.keys():
+            if neighbour in successors and is_dead_end(neighbour):
+                queue.append(neighbour)
+
+    # Contracting each corridor into an edge from the node before it to the node after it, in each direction it can be
+    # walked in.
+    edges = {}
+    paths = {}
+    for node in successors:
+        if is_corridor(node):
+            continue
+
+        ends = {}
+        for neighbour, cost in successors[node].items():
+            skipped = []
+            previous, current = node, neighbour
+            while current is not None and is_corridor(current):
+                skipped.append((current, cost))
+                following = next(iter((successors[current].keys() | predecessors[current].keys()) - {previous}))
+                step = successors[current].get(following)
+                previous, current = current, following
+                if step is None:
+                    # The corridor can only be walked the other way.
+                    current = None
+                else:
+                    cost += step
+
+            if current is not None and current != node and cost < ends.get(current, (cost + 1,))[0]:
+                ends[current] = (cost, tuple(skipped))
+
+        edges[node] = [(end, cost) for end, (cost, _) in ends.items()]
+        for end, (cost, skipped) in ends.items():
+            if len(skipped) != 0:
+                paths[(node, end)] = skipped
+
+    return ReducedGraph(graph, edges, paths, pruned, len(successors) - len(edges))
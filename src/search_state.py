@@ -0,0 +1,136 @@
+"""
+Maze Solver - Search State
+
+This module implements the per-query state used by the pathfinding algorithms, so that a graph is never modified by
+a search and can answer any number of queries, including from several threads at once.
+
+Author: shravan@usc.edu (5451873903)
+
+"""
+
+import threading
+import weakref
+from array import array
+
+
+# Largest generation that fits in the generation array before it has to be cleared.
+MAX_GENERATION = (1 << (8 * array('I').itemsize)) - 1
+
+# Per-thread cache of search states for each graph.
+_local = threading.local()
+
+
+class SearchState(object):
+    """
+    A class that holds the cost and parent of every cell visited by a search. Cells are marked as visited by stamping
+    them with the current generation, so resetting the state between searches does not have to touch the arrays.
+    """
+
+    def __init__(self, size):
+        """
+        Method to initialize the search state.
+
+        Args:
+            size(int): Number of cells in the graph the state is used for.
+
+        """
+        self.size = size
+        self.generation = 1
+        self.generations = array('I', bytes(array('I').itemsize * size))
+        self.costs = array('q', bytes(array('q').itemsize * size))
+        self.parents = array('q', bytes(array('q').itemsize * size))
+
+    def reset(self):
+        """
+        Method to clear the state before a new search. This only bumps the generation, unless the generation counter
+        has run out, in which case the generation array is cleared.
+        """
+        if self.generation == MAX_GENERATION:
+            self.generations = array('I', bytes(array('I').itemsize * self.size))
+            self.generation = 0
+
+        self.generation += 1
+
+    def is_visited(self, index):
+        """
+        Method to check whether a cell has been visited in the current search.
+
+        Args:
+            index(int): Index of the cell.
+
+        Returns:
+            (bool): Whether the cell has been visited.
+
+        """
+        return self.generations[index] == self.generation
+
+    def visit(self, index, cost, parent):
+        """
+        Method to mark a cell as visited in the current search, recording how it was reached.
+
+        Args:
+            index(int): Index of the cell.
+            cost(int): Cost to reach the cell.
+            parent(int): Index of the cell we reached this cell from, or None for the start cell.
+
+        """
+        self.generations[index] = self.generation
+        self.costs[index] = cost
+        self.parents[index] = -1 if parent is None else parent
+
+    def get_cost(self, index):
+        """
+        Method to get the cost to reach a visited cell.
+
+        Args:
+            index(int): Index of the cell.
+
+        Returns:
+            (cost): Cost to reach the cell.
+
+        """
+        return self.costs[index]
+
+    def get_parent(self, index):
+        """
+        Method to get the parent of a visited cell.
+
+        Args:
+            index(int): Index of the cell.
+
+        Returns:
+            (parent): Index of the parent of the cell, or None for the start cell.
+
+        """
+        parent = self.parents[index]
+        return None if parent == -1 else parent
+
+
+def get_search_state(graph, slot=0):
+    """
+    Method to get a search state for a graph. Each thread keeps its own states for each graph, so searches in different
+    threads never share a state. The state is reset before it is returned.
+
+    Args:
+        graph(Graph): Graph to get the search state for.
+        slot(int): Slot of the state, for searches that need more than one state at a time. Defaults to 0.
+
+    Returns:
+        (state): Search state for the graph.
+
+    """
+    states = getattr(_local, "states", None)
+    if states is None:
+        states = _local.states = weakref.WeakKeyDictionary()
+
+    graph_states = states.get(graph)
+    if graph_states is None:
+        graph_states = states[graph] = {}
+
+    state = graph_states.get(slot)
+    if state is None or state.size != graph.size:
+        state = graph_states[slot] = SearchState(graph.size)
+    else:
+        state.reset()
+
+    return state
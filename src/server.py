@@ -0,0 +1,343 @@
+"""
+Maze Solver - Server
+
+This module implements a long running server which keeps named mazes loaded in memory and answers pathfinding queries
+against them over a local Unix socket or a TCP socket, so that a query does not pay for starting a process, importing
+the modules and reading the maze.
+
+Each connection sends one request per line in the format "maze algorithm sx sy sz ex ey ez", and gets one result line
+per request in the same order, in the format "maze algorithm sx sy sz ex ey ez cost length x y z x y z ...",
+"maze algorithm sx sy sz ex ey ez FAIL" if there is no path, or "request ERROR message" if the request is invalid.
+Requests can be pipelined, without waiting for the results of the earlier ones.
+
+The event loop only parses requests and writes results. The searches run in a pool of worker processes attached to
+the cell arrays of the mazes in shared memory, so the server keeps accepting requests while they run.
+
+Author: shravan@usc.edu (5451873903)
+
+"""
+
+import asyncio
+import os
+import signal
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from batch import POOL_SEARCH_WORKERS, format_error, format_result, get_prefix, parse_query, run_query, search
+from components import get_components
+from grid_graph import GridGraph
+from utils import load_maze
+from vector import Vector
+
+
+# Number of requests of a connection being answered at once, before the server stops reading more of its requests.
+MAX_PIPELINED = 1024
+
+# Graphs and their components used by the worker processes, by maze name, attached to the shared memory when the
+# worker starts.
+_graphs = {}
+_components = {}
+_shared_memory = []
+
+
+class MazeServer(object):
+    """
+    A class that implements a server answering pathfinding queries against mazes kept in memory.
+    """
+
+    def __init__(self, mazes, workers=1, cache=None, components=False):
+        """
+        Method to initialize the server.
+
+        Args:
+            mazes(dict): Map of maze names to the paths of their input files or compiled mazes.
+            workers(int): Number of worker processes to answer the queries with. Defaults to 1.
+            cache(PathCache): Cache to answer repeated queries from in the server process. Defaults to None.
+            components(bool): Whether to build the components of each maze when it is loaded, to answer queries
+                without a path in the server process and prune the searches. Defaults to False.
+
+        """
+        self.mazes = mazes
+        self.workers = workers
+        self.cache = cache
+        self.graphs = {}
+        self.components = {} if components else None
+        self._memory = []
+        self._executor = None
+        self._searching = {}
+
+    def __enter__(self):
+        """
+        Method to load the mazes and start the worker processes.
+
+        Returns:
+            (server): The server.
+
+        """
+        self.load()
+        return self
+
+    def __exit__(self, *args):
+        """
+        Method to stop the worker processes and release the shared memory.
+        """
+        self.close()
+
+    def load(self):
+        """
+        Method to load the mazes, copy their cell arrays into shared memory and start the worker processes.
+        """
+        shared = {}
+        for name, file_path in self.mazes.items():
+            _, _, _, graph = load_maze(file_path)
+            self.graphs[name] = graph
+            if self.components is not None:
+                self.components[name] = get_components(graph)
+
+            cells = memoryview(graph.cells).cast('B')
+            memory = shared_memory.SharedMemory(create=True, size=max(len(cells), 1))
+            memory.buf[:len(cells)] = cells
+            self._memory.append(memory)
+            shared[name] = (memory.name, (graph.bounds.x, graph.bounds.y, graph.bounds.z),
+                            None if self.components is None else self.components[name])
+
+        # Start the workers now, so the first requests do not wait for them to attach to the mazes.
+        self._executor = ProcessPoolExecutor(self.workers, initializer=_init_worker, initargs=(shared,))
+        self._executor.submit(int).result()
+
+    def close(self):
+        """
+        Method to stop the worker processes and release the shared memory.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+        for memory in self._memory:
+            memory.close()
+            memory.unlink()
+        self._memory = []
+
+    async def answer(self, line):
+        """
+        Method to answer a request.
+
+        Args:
+            line(str): Request, in the format "maze algorithm sx sy sz ex ey ez".
+
+        Returns:
+            (result): Result line for the request.
+
+        """
+        values = line.split()
+        if len(values) == 0 or values[0] not in self.graphs:
+            return format_error(line, "Unknown maze.")
+
+        query = parse_query(values[1:])
+        if query is None:
+            return format_error(line, "Invalid query.")
+
+        name, graph = values[0], self.graphs[values[0]]
+        if self.components is not None and self._is_unreachable(name, query):
+            return format_result("{} {}".format(name, get_prefix(query)), False, [], None)
+
+        loop = asyncio.get_running_loop()
+        if self.cache is None:
+            return "{} {}".format(name, await loop.run_in_executor(self._executor, _run_worker_query, name, query))
+
+        result = self.cache.get(graph, *query)
+        if result is None:
+            # Requests repeated while the first copy is still being searched wait for its result, instead of
+            # searching again.
+            key = (name, query)
+            searching = self._searching.get(key)
+            if searching is None:
+                searching = self._searching[key] = loop.run_in_executor(self._executor, _search_worker_query, name,
+                                                                        query)
+                searching.add_done_callback(lambda future: self._finish_search(key, graph, future))
+            result = await asyncio.shield(searching)
+
+        return format_result("{} {}".format(name, get_prefix(query)), *result)
+
+    def _is_unreachable(self, name, query):
+        """
+        Method to check whether a query certainly has no path, from the components of its maze.
+
+        Args:
+            name(str): Name of the maze.
+            query(tuple): Query, as an (algorithm, start, end) tuple.
+
+        Returns:
+            (bool): Whether the query certainly has no path.
+
+        """
+        graph = self.graphs[name]
+        start_node = graph.get_index(query[1])
+        end_node = graph.get_index(query[2])
+        return start_node is None or end_node is None or self.components[name].is_unreachable(start_node, end_node)
+
+    def _finish_search(self, key, graph, future):
+        """
+        Method to cache the result of a search once it is done.
+
+        Args:
+            key(tuple): Maze name and query of the search.
+            graph(GridGraph): Graph of the maze.
+            future(Future): Finished search.
+
+        """
+        del self._searching[key]
+        if not future.cancelled() and future.exception() is None:
+            algorithm, start, end = key[1]
+            self.cache.put(graph, algorithm, start, end, future.result())
+
+    async def handle_connection(self, reader, writer):
+        """
+        Method to answer the requests of a connection until it is closed. Each request is answered as soon as it is
+        read, and the results are written in the order of the requests.
+
+        Args:
+            reader(StreamReader): Stream to read the requests from.
+            writer(StreamWriter): Stream to write the results to.
+
+        """
+        # Requests and their results being answered, in the order of the requests. Reading stops while the queue is
+        # full.
+        results = asyncio.Queue(MAX_PIPELINED)
+
+        async def write_results():
+            while True:
+                request = await results.get()
+                if request is None:
+                    break
+                line, result = request
+                try:
+                    line = await result
+                except Exception as error:
+                    # A failed search only fails its own request.
+                    line = format_error(line, error)
+                writer.write(line.encode())
+                await writer.drain()
+
+        writing = asyncio.ensure_future(write_results())
+        try:
+            async for line in reader:
+                line = line.decode().strip()
+                if line:
+                    await results.put((line, asyncio.ensure_future(self.answer(line))))
+            await results.put(None)
+            await writing
+        except (ConnectionError, asyncio.CancelledError):
+            # The connection is dropped when the client goes away or the server is stopped.
+            pass
+        finally:
+            writing.cancel()
+            while not results.empty():
+                request = results.get_nowait()
+                if request is not None:
+                    request[1].cancel()
+            writer.close()
+
+    async def serve(self, path=None, host="127.0.0.1", port=0):
+        """
+        Method to accept connections until the server is cancelled.
+
+        Args:
+            path(str): Path of the Unix socket to listen on. Defaults to listening on a TCP socket instead.
+            host(str): Host of the TCP socket to listen on. Defaults to 127.0.0.1.
+            port(int): Port of the TCP socket to listen on. Defaults to any free port.
+
+        """
+        if path is not None:
+            server = await asyncio.start_unix_server(self.handle_connection, path)
+        else:
+            server = await asyncio.start_server(self.handle_connection, host, port)
+
+        try:
+            async with server:
+                for sock in server.sockets:
+                    print("Serving {} on {}".format(", ".join(sorted(self.graphs)), sock.getsockname()), flush=True)
+                await server.serve_forever()
+        finally:
+            if path is not None and os.path.exists(path):
+                os.remove(path)
+
+
+def parse_maze_names(values):
+    """
+    Method to get the names of mazes given as "name=path", or as a path named after its file.
+
+    Args:
+        values(list): Mazes to name.
+
+    Returns:
+        (mazes): Map of maze names to their paths.
+
+    """
+    mazes = {}
+    for value in values:
+        name, separator, file_path = value.partition("=")
+        if not separator:
+            file_path = value
+            name = os.path.splitext(os.path.basename(value))[0]
+
+        if name in mazes:
+            raise ValueError("Duplicate maze name {}.".format(name))
+        mazes[name] = file_path
+
+    return mazes
+
+
+def _init_worker(shared):
+    """
+    Method to attach a worker process to the shared graphs.
+
+    Args:
+        shared(dict): Map of maze names to the name of the shared memory block holding their cell array, their bounds
+            and their components or None.
+
+    """
+    # Interrupting the server stops the workers through the pool, rather than in the middle of a search.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    for name, (memory_name, bounds, components) in shared.items():
+        memory = shared_memory.SharedMemory(name=memory_name)
+        _shared_memory.append(memory)
+
+        bounds = Vector(*bounds)
+        size = bounds.x * bounds.y * bounds.z
+        cells = memory.buf.toreadonly()[:size * array('I').itemsize].cast('I')
+        _graphs[name] = GridGraph(bounds, cells)
+        _components[name] = components
+
+
+def _run_worker_query(name, query):
+    """
+    Method to answer a query in a worker process.
+
+    Args:
+        name(str): Name of the maze to answer the query against.
+        query(tuple): Query to answer, as an (algorithm, start, end) tuple.
+
+    Returns:
+        (result): Result line for the query, without the maze name.
+
+    """
+    return run_query(_graphs[name], query, components=_components[name], workers=POOL_SEARCH_WORKERS)
+
+
+def _search_worker_query(name, query):
+    """
+    Method to answer a query in a worker process, returning the result instead of its line so that it can be cached.
+
+    Args:
+        name(str): Name of the maze to answer the query against.
+        query(tuple): Query to answer, as an (algorithm, start, end) tuple.
+
+    Returns:
+        (success, path, cost): Whether a path was found, path from the start node to the end node in the graph and the
+            cost of each point in the path.
+
+    """
+    return search(_graphs[name], query, components=_components[name], workers=POOL_SEARCH_WORKERS)
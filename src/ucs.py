@@ -7,18 +7,25 @@ Author: shravan@usc.edu (5451873903)
 
 """
 
-import heapq
+from instrumentation import record_search
+from priority_queue import HeapQueue
+from search_state import get_search_state
+from utils import get_path
 
 
-def ucs(graph, start, end):
+def ucs(graph, start, end, state=None, queue_type=HeapQueue, components=None):
     """
     This is a function implementing the Uniform Cost Search algorithm to find paths in a graph, given a start and end
-    node.
+    node. When the components of the graph are given, queries without a path are rejected without searching, and
+    nodes which cannot reach the end node are never queued.
 
     Args:
         graph(Graph): Graph to perform the pathfinding on.
         start(Vector): Position to start the search at.
         end(Vector): Position to find a path to in the graph.
+        state(SearchState): State to use for the search. Defaults to the calling thread's state for the graph.
+        queue_type(type): Priority queue class to use for the search. Defaults to HeapQueue.
+        components(Components): Components of the graph to prune the search with. Defaults to None.
 
     Returns:
         (success, path, cost): Whether a path was found, path from the start node to the end node in the graph and the
@@ -26,43 +33,67 @@ def ucs(graph, start, end):
 
     """
     # Get the start and end nodes from the graph.
-    start_node = graph.get_node(start)
-    end_node = graph.get_node(end)
+    start_node = graph.get_index(start)
+    end_node = graph.get_index(end)
 
     if (start_node is None) or (end_node is None):
         return False, [], None
 
-    # Initialize the UCS priority queue.
-    ucs_queue = [start_node]
-    heapq.heapify(ucs_queue)
-    start_node.visited = True
+    node_components, end_component = None, 0
+    if components is not None:
+        if components.is_unreachable(start_node, end_node):
+            return False, [], None
+        if not components.is_symmetric():
+            node_components, end_component = components.components, components.components[end_node]
+
+    if state is None:
+        state = get_search_state(graph)
+
+    # Initialize the UCS priority queue. Nodes are queued with their cost as the priority.
+    ucs_queue = queue_type()
+    ucs_queue.push(0, start_node)
+    state.visit(start_node, 0, None)
+    expanded, pushed, popped, peak_frontier, lookups = 0, 1, 0, 1, 0
 
     # Searching the graph for the end node.
     while len(ucs_queue) != 0:
-        node = heapq.heappop(ucs_queue)
+        node_cost, node = ucs_queue.pop()
+        popped += 1
 
         if node == end_node:
             break
 
-        neighbours = graph.get_neighbours_with_costs(node)
-        for neighbour, cost in neighbours.items():
-            if not neighbour.visited:
-                # Cost of traversing each node in UCS is the cost of traversing to the neighbour + cost of getting
-                # to the parent.
-                neighbour.cost = cost + node.cost
-                heapq.heappush(ucs_queue, neighbour)
-                neighbour.parent = node
-                neighbour.visited = True
+        # Skip entries for nodes that were reached more cheaply after they were queued.
+        if node_cost > state.get_cost(node):
+            continue
+
+        successors = graph.get_successors(node)
+        expanded += 1
+        lookups += len(successors)
+
+        for neighbour, cost in successors:
+            # Cost of traversing each node in UCS is the cost of traversing to the neighbour + cost of getting to the
+            # parent.
+            neighbour_cost = cost + node_cost
+            if not state.is_visited(neighbour) or neighbour_cost < state.get_cost(neighbour):
+                # Nodes in components numbered below the end node's component cannot lead back to it.
+                if node_components is not None and node_components[neighbour] < end_component:
+                    continue
+
+                state.visit(neighbour, neighbour_cost, node)
+                ucs_queue.push(neighbour_cost, neighbour)
+                pushed += 1
+
+        # The queue holds every entry pushed and not popped yet, including outdated ones.
+        if pushed - popped > peak_frontier:
+            peak_frontier = pushed - popped
 
     # If the UCS queue is empty without finding the end node, then we can't reach it.
     else:
+        record_search("UCS", expanded, pushed, peak_frontier, lookups)
         return False, [], None
 
-    # Getting the path from the end node to the source by traversing the parents.
-    node = end_node
-    path = []
-    while node is not None:
-        path.insert(0, node)
-        node = node.parent
+    record_search("UCS", expanded, pushed, peak_frontier, lookups)
 
-    return True, path, end_node.cost
+    # Getting the path from the end node to the source by traversing the parents.
+    return True, get_path(graph, state, end_node), state.get_cost(end_node)
@@ -7,36 +7,276 @@ Author: shravan@usc.edu (5451873903)
 
 """
 
-from graph import Graph, Node
+from itertools import islice
+
+from compiled_maze import is_compiled_maze, load_compiled_maze
+from graph import ACTIONS, Graph, Node
+from grid_graph import PRESENT, GridGraph
+from instrumentation import phase
 from vector import Vector
 
 
-def generate_maze(file_contents):
+# Size of the chunks the input file is read in.
+CHUNK_SIZE = 1 << 22
+
+# Number of lines written to an output file at a time.
+WRITE_CHUNK_SIZE = 1 << 14
+
+# Map of action tokens in the input file to their bit in a cell's action mask, for both text and binary input.
+ACTION_BITS = dict([(str(action), 1 << action) for action in ACTIONS] +
+                   [(str(action).encode(), 1 << action) for action in ACTIONS])
+
+
+def generate_maze(file_contents, compact=True):
     """
     Method to get the parameters of the maze from the contents of the input file.
 
     Args:
         file_contents(list): List of lines from the input file.
+        compact(bool): Whether to build a compact grid graph or the reference node based graph. Defaults to True.
 
     Returns:
         (algorithm, start, end, graph): Returns the algorithm to use, the starting position in the graph, the ending
-            position and the graph of the maze.
+            position, or tuple of goal positions, and the graph of the maze.
 
     """
     algorithm = file_contents[0].split('\n')[0]
     bounds = Vector.from_str(file_contents[1].split('\n')[0])
     start = Vector.from_str(file_contents[2].split('\n')[0])
-    end = Vector.from_str(file_contents[3].split('\n')[0])
+    end = parse_end(file_contents[3].split('\n')[0])
     num_points = int(file_contents[4].split('\n')[0])
 
     start_idx = 5
-    nodes = []
-    for offset in range(num_points):
-        coords = file_contents[start_idx + offset].split('\n')[0].split(' ')
-        point = Vector(int(coords[0]), int(coords[1]), int(coords[2]))
-        actions = [int(coord) for coord in coords[3:]]
-        node = Node(point, actions)
-        nodes.append(node)
-
-    graph = Graph(nodes, bounds)
+    graph = GridGraph(bounds) if compact else Graph(bounds=bounds)
+    add_points(graph, file_contents[start_idx:start_idx + num_points])
+
     return algorithm, start, end, graph
+
+
+def load_maze(file_path, compact=True):
+    """
+    Method to get the parameters of the maze from an input file, which is either a text input file or a compiled maze.
+
+    Args:
+        file_path(str): Path of the input file.
+        compact(bool): Whether to build a compact grid graph or the reference node based graph. Compiled mazes are
+            always loaded as grid graphs. Defaults to True.
+
+    Returns:
+        (algorithm, start, end, graph): Returns the algorithm to use, the starting position in the graph, the ending
+            position and the graph of the maze.
+
+    """
+    if is_compiled_maze(file_path):
+        if not compact:
+            raise ValueError("Compiled mazes can only be loaded as grid graphs.")
+
+        # Compiled mazes are memory mapped as they are, so there is no graph to build.
+        with phase("parse"):
+            return load_compiled_maze(file_path)
+
+    return read_maze(file_path, compact)
+
+
+def read_maze(file_path, compact=True):
+    """
+    Method to get the parameters of the maze from an input file. The points are streamed from the file in large chunks
+    and written straight into the graph, so the memory used is bounded by the size of the graph and not by the size of
+    the file.
+
+    Args:
+        file_path(str): Path of the input file.
+        compact(bool): Whether to build a compact grid graph or the reference node based graph. Defaults to True.
+
+    Returns:
+        (algorithm, start, end, graph): Returns the algorithm to use, the starting position in the graph, the ending
+            position, or tuple of goal positions, and the graph of the maze.
+
+    """
+    with open(file_path, 'rb') as f:
+        with phase("parse"):
+            algorithm = f.readline().decode().strip()
+            bounds = Vector.from_str(f.readline().decode().strip())
+            start = Vector.from_str(f.readline().decode().strip())
+            end = parse_end(f.readline().decode().strip())
+            num_points = int(f.readline())
+
+        # The points are parsed as they are streamed into the graph, so their parsing is timed in the build phase.
+        with phase("build"):
+            graph = GridGraph(bounds) if compact else Graph(bounds=bounds)
+            add_points(graph, islice(read_lines(f), num_points))
+
+    return algorithm, start, end, graph
+
+
+def parse_end(line):
+    """
+    Method to get the end of the maze from its line in the input file. The line holds a single end position, or the
+    positions of several goals one after the other.
+
+    Args:
+        line(str): Line of the input file holding the end. Example: "10 10 10" or "10 10 10 20 5 0".
+
+    Returns:
+        (end): Position of the end node, or a tuple of the positions of the goal nodes if there are several.
+
+    """
+    coords = line.split()
+    if len(coords) == 3:
+        return Vector.from_str(line)
+
+    if len(coords) == 0 or len(coords) % 3 != 0:
+        raise ValueError("The end of the maze must be one or more positions, got: {}".format(line))
+
+    return tuple(Vector(int(coords[i]), int(coords[i + 1]), int(coords[i + 2])) for i in range(0, len(coords), 3))
+
+
+def read_lines(f, chunk_size=CHUNK_SIZE):
+    """
+    Method to read the lines of a binary file in large chunks.
+
+    Args:
+        f(file): Binary file to read the lines from.
+        chunk_size(int): Number of bytes to read at a time. Defaults to CHUNK_SIZE.
+
+    Returns:
+        (lines): Generator of the lines in the file, without their line endings.
+
+    """
+    tail = b''
+    while True:
+        chunk = f.read(chunk_size)
+        if not chunk:
+            break
+
+        lines = (tail + chunk).split(b'\n')
+        tail = lines.pop()
+        for line in lines:
+            yield line
+
+    if tail:
+        yield tail
+
+
+def add_points(graph, lines):
+    """
+    Method to add the points of a maze to a graph. For grid graphs, each point is written straight into the graph's
+    cell array without building any vectors or nodes. Points outside the bounds of the graph are rejected, as they would
+    otherwise be written into the cell of another point.
+
+    Args:
+        graph(Graph): Graph to add the points to.
+        lines(iterable): Point lines in the format "x y z action action ...", as either text or bytes.
+
+    """
+    if not isinstance(graph, GridGraph):
+        for line in lines:
+            coords = line.split()
+            point = Vector(int(coords[0]), int(coords[1]), int(coords[2]))
+            if not graph.is_valid(point):
+                raise ValueError("Point {} is outside the bounds {} of the maze.".format(point, graph.bounds))
+            graph.add_node(Node(point, [int(coord) for coord in coords[3:]]))
+        return
+
+    cells = graph.cells
+    size_x, size_y, size_z = graph.bounds.x, graph.bounds.y, graph.bounds.z
+    action_bits = ACTION_BITS
+
+    for line in lines:
+        coords = line.split()
+        x, y, z = int(coords[0]), int(coords[1]), int(coords[2])
+
+        mask = PRESENT
+        for token in coords[3:]:
+            mask |= action_bits[token]
+
+        # Only cells on the faces of the bounds can have actions leading out of the graph, and only cells off the
+        # interior can be outside the bounds.
+        if not (0 < x < size_x - 1 and 0 < y < size_y - 1 and 0 < z < size_z - 1):
+            if not (0 <= x < size_x and 0 <= y < size_y and 0 <= z < size_z):
+                raise ValueError("Point {} is outside the bounds {} of the maze.".format(Vector(x, y, z), graph.bounds))
+            mask &= graph.get_valid_mask(x, y, z)
+
+        cells[x + size_x * (y + size_y * z)] = mask
+
+
+def write_path(file_path, success, path, cost):
+    """
+    Method to write the path found by a pathfinding algorithm to an output file.
+
+    Args:
+        file_path(str): Path of the output file.
+        success(bool): Whether a path was found.
+        path(list): Path from the start node to the end node, with the cost of reaching each node set.
+        cost(int): Cost of the path.
+
+    """
+    with open(file_path, 'w') as f:
+        f.truncate(0)
+        if not success:
+            f.write("FAIL\n")
+            return
+
+        f.write("{}\n".format(cost))
+        f.write("{}\n".format(len(path)))
+
+        # Lines are joined into chunks before they are written, which is much cheaper than writing each line.
+        last_cost = 0
+        for chunk_start in range(0, len(path), WRITE_CHUNK_SIZE):
+            lines = []
+            for node in path[chunk_start:chunk_start + WRITE_CHUNK_SIZE]:
+                position = node.position
+                lines.append("{} {} {} {}\n".format(position.x, position.y, position.z, node.cost - last_cost))
+                last_cost = node.cost
+            f.write("".join(lines))
+
+
+def get_path(graph, state, end):
+    """
+    Method to get the path to a node from the parents recorded by a pathfinding algorithm.
+
+    Args:
+        graph(Graph): Graph the pathfinding was performed on.
+        state(SearchState): State of the search that reached the end node.
+        end(int): Index of the node to get the path to.
+
+    Returns:
+        (path): List of nodes from the start node to the end node, with the cost of reaching each node set.
+
+    """
+    path = []
+    index = end
+    with phase("reconstruct"):
+        while index is not None:
+            path.append(Node(graph.get_position(index), cost=state.get_cost(index)))
+            index = state.get_parent(index)
+
+    path.reverse()
+    return path
+
+
+def get_bidirectional_path(graph, forward_state, backward_state, meeting_node):
+    """
+    Method to get the path found by a bidirectional search, which joins the path from the start node to the meeting
+    node with the path from the meeting node to the end node.
+
+    Args:
+        graph(Graph): Graph the pathfinding was performed on.
+        forward_state(SearchState): State of the search from the start node.
+        backward_state(SearchState): State of the search from the end node.
+        meeting_node(int): Index of the node where the two searches met.
+
+    Returns:
+        (path): List of nodes from the start node to the end node, with the cost of reaching each node set.
+
+    """
+    path = get_path(graph, forward_state, meeting_node)
+    cost = path[-1].cost + backward_state.get_cost(meeting_node)
+
+    index = backward_state.get_parent(meeting_node)
+    with phase("reconstruct"):
+        while index is not None:
+            path.append(Node(graph.get_position(index), cost=cost - backward_state.get_cost(index)))
+            index = backward_state.get_parent(index)
+
+    return path
@@ -11,11 +11,19 @@ Author: shravan@usc.edu (5451873903)
 import math
 
 
+# Number of bits each co-ordinate takes in the packed key of a vector. Co-ordinates from -2 ** 20 to 2 ** 20 - 1 get
+# distinct keys, which covers the bounds of any maze and the positions just outside them.
+KEY_BITS = 21
+KEY_MASK = (1 << KEY_BITS) - 1
+
+
 class Vector(object):
     """
     Module that implements vectors in 3D space.
     """
 
+    __slots__ = ("x", "y", "z")
+
     def __init__(self, x=0, y=0, z=0):
         """
         Method to initialize a 3D vector.
@@ -55,13 +63,25 @@ class Vector(object):
 
     def __hash__(self):
         """
-        Method to get the hash of a vector.
+        Method to get the hash of a vector, which is its packed key.
 
         Returns:
             (hash): Returns the hash of the vector.
 
         """
-        return hash(str(self))
+        return (self.x & KEY_MASK) | (self.y & KEY_MASK) << KEY_BITS | (self.z & KEY_MASK) << (2 * KEY_BITS)
+
+    @property
+    def key(self):
+        """
+        Method to get the packed key of a vector, a single integer holding all three co-ordinates. Equal vectors have
+        equal keys, so the key can stand in for the vector in maps.
+
+        Returns:
+            (key): Packed key of the vector.
+
+        """
+        return (self.x & KEY_MASK) | (self.y & KEY_MASK) << KEY_BITS | (self.z & KEY_MASK) << (2 * KEY_BITS)
 
     @staticmethod
     def from_str(s):
@@ -92,3 +112,27 @@ def line_distance(p1, p2):
 
     """
     return math.sqrt(((p2.x - p1.x) ** 2) + ((p2.y - p1.y) ** 2) + ((p2.z - p1.z) ** 2))
+
+
+def grid_distance(p1, p2):
+    """
+    Returns the cost of the cheapest path between two points in a maze without walls, where axial moves cost 10 and
+    planar diagonal moves cost 14. This never overestimates the cost of a path between the points in any maze.
+
+    Args:
+        p1(Vector): Point to get the distance for.
+        p2(Vector): Point to get the distance for.
+
+    Returns:
+        (distance): Cost of the cheapest path between the two points.
+
+    """
+    c, b, a = sorted((abs(p2.x - p1.x), abs(p2.y - p1.y), abs(p2.z - p1.z)))
+
+    # Diagonal moves cover two axes at once, so they are used until the longest axis is the only one left, or until
+    # the axes are used up evenly.
+    if a >= b + c:
+        return 14 * (b + c) + 10 * (a - b - c)
+
+    total = a + b + c
+    return 14 * (total // 2) + 10 * (total % 2)
@@ -0,0 +1,89 @@
+"""
+Maze Solver - Landmark Tests
+
+Tests of landmark files, which must load for a maze whether it is held as a reference graph or as a grid graph, and
+must be rejected once the maze is edited.
+
+Usage: python -m unittest discover tests
+
+Author: shravan@usc.edu (5451873903)
+
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from a_star import a_star  # noqa: E402
+from landmarks import build_landmarks, load_landmarks, write_landmarks  # noqa: E402
+from utils import generate_maze  # noqa: E402
+from vector import Vector  # noqa: E402
+
+
+# Maze with actions leading out of its bounds, which a grid graph drops and a reference graph keeps.
+MAZE = """A*
+4 3 2
+0 0 0
+3 2 1
+10
+0 0 0 1 3 5 2 4 6
+1 0 0 1 2 3
+2 0 0 1 2 3
+3 0 0 1 3
+3 1 0 4 3 5
+3 2 0 4 5 1
+3 2 1 6 2 4
+0 1 0 4 3
+0 2 0 4 1
+1 2 0 2 1
+""".split("\n")
+
+
+class LandmarkFileTest(unittest.TestCase):
+    """
+    A class that tests writing landmark files for one kind of graph and loading them for the other.
+    """
+
+    def setUp(self):
+        """
+        Method to write the landmark file of the maze, built from its grid graph.
+        """
+        _, self.start, self.end, self.grid_graph = generate_maze(MAZE)
+        _, _, _, self.reference_graph = generate_maze(MAZE, compact=False)
+
+        handle, self.file_path = tempfile.mkstemp(suffix=".alt")
+        os.close(handle)
+        write_landmarks(self.file_path, build_landmarks(self.grid_graph, 4), self.grid_graph)
+
+    def tearDown(self):
+        """
+        Method to remove the landmark file.
+        """
+        os.remove(self.file_path)
+
+    def test_load_for_either_graph(self):
+        """
+        Method to check that the landmark file loads for both graphs of the maze, and gives the same path cost.
+        """
+        for graph in (self.grid_graph, self.reference_graph):
+            landmarks = load_landmarks(self.file_path, graph)
+            self.assertEqual(len(landmarks), 4)
+            self.assertEqual(a_star(graph, self.start, self.end, landmarks=landmarks)[2],
+                             a_star(graph, self.start, self.end)[2])
+
+    def test_reject_edited_maze(self):
+        """
+        Method to check that the landmark file is rejected for both graphs once the maze is edited.
+        """
+        self.grid_graph.remove_node(Vector(1, 0, 0))
+        self.reference_graph.remove_node(Vector(1, 0, 0))
+        for graph in (self.grid_graph, self.reference_graph):
+            with self.assertRaises(ValueError):
+                load_landmarks(self.file_path, graph)
+
+
+if __name__ == "__main__":
+    unittest.main()